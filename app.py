@@ -45,6 +45,19 @@ def save_game_state():
     game_states[player_id] = request.json
     return jsonify({'success': True, 'message': 'Game state disimpan'})
 
+@app.route('/api/game/state', methods=['PATCH'])
+def patch_game_state():
+    """Update sebagian state game player (hanya key yang berubah)"""
+    data = request.json
+    player_id = data.get('player_id', 'default')
+    changes = data.get('changes', {})
+    
+    if player_id not in game_states:
+        return jsonify({'success': False, 'message': 'Player tidak ditemukan'}), 404
+    
+    game_states[player_id].update(changes)
+    return jsonify({'success': True, 'updated': list(changes.keys())})
+
 @app.route('/api/game/buy-spice', methods=['POST'])
 def buy_spice():
     """Membeli spice di harbor"""
@@ -148,6 +161,7 @@ if __name__ == '__main__':
     print("API Endpoints:")
     print("  GET  /api/game/state")
     print("  POST /api/game/state")
+    print("  PATCH /api/game/state")
     print("  POST /api/game/buy-spice")
     print("  POST /api/game/buy-food")
     print("  POST /api/game/change-scene")
@@ -0,0 +1,188 @@
+"""
+Benchmark - Jalankan scene secara headless dan ukur throughput update/render
+Contoh: python bench.py --frames 600 --seed 42 --scene all
+"""
+import argparse
+import atexit
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict
+
+# Add current directory to path
+sys.path.append(os.path.dirname(__file__))
+
+# Bench menulis state / eksplorasi ke database sementara, bukan game_data.db milik repo
+_BENCH_DB_DIR = tempfile.mkdtemp(prefix="spice_trader_bench_")
+atexit.register(shutil.rmtree, _BENCH_DB_DIR, True)
+os.environ['SPICE_TRADER_DB'] = os.path.join(_BENCH_DB_DIR, "game_data.db")
+
+import pygame
+from game_engine.core import GameEngine
+from game_engine.input import ScriptedInput
+from game_engine.replay import ReplayInput
+from game_engine.profiler import profiler
+from utils.text_cache import fonts
+from utils import rng
+from scenes.ship.ship_scene import ShipScene
+from scenes.harbor.harbor_scene import HarborScene
+from utils.constants import SCREEN_WIDTH, SCREEN_HEIGHT, ARMADA_DEFAULT_SIZE, ISLANDS
+
+MOVE_PATTERN = [
+    (pygame.K_d,), (pygame.K_d, pygame.K_s), (pygame.K_s,), (pygame.K_a, pygame.K_s),
+    (pygame.K_a,), (pygame.K_a, pygame.K_w), (pygame.K_w,), (pygame.K_d, pygame.K_w)
+]
+
+
+def ship_script(inp: ScriptedInput, frame: int):
+    """Script input untuk ship scene: klik 'Mulai Game', bergerak, dan menembak terus"""
+    if frame == 0:
+        # Tombol "Mulai Game" di menu
+        inp.click((SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 75))
+        return
+    inp.hold_only(MOVE_PATTERN[(frame // 45) % len(MOVE_PATTERN)])
+    # Arahkan mouse berputar mengelilingi tengah layar
+    angle = frame * 0.05
+    inp.move_mouse((int(SCREEN_WIDTH // 2 + math.cos(angle) * 300),
+                    int(SCREEN_HEIGHT // 2 + math.sin(angle) * 300)))
+    if frame % 12 == 0:
+        inp.tap(pygame.K_z)
+
+
+def harbor_script(inp: ScriptedInput, frame: int):
+    """Script input untuk harbor scene: jalan berkeliling, buka keranjang dan interaksi NPC"""
+    inp.hold_only(MOVE_PATTERN[(frame // 60) % len(MOVE_PATTERN)])
+    if frame % 150 == 0:
+        inp.tap(pygame.K_i)
+    if frame % 40 == 0:
+        inp.tap(pygame.K_e)
+
+
+SCRIPTS = {
+    'ship': ship_script,
+    'harbor': harbor_script
+}
+
+
+def bench_scene(scene_name: str, frames: int, seed: int, trace_path: str = None,
+                armada: int = 0, tick_rate: int = 60, harbor: str = None) -> Dict[str, float]:
+    """Jalankan satu scene sebanyak frames tanpa FPS cap dan kembalikan hasil timing"""
+    rng.reseed(seed)
+    profiler.resize(frames)
+
+    engine = GameEngine(width=SCREEN_WIDTH, height=SCREEN_HEIGHT, headless=True, tick_rate=tick_rate)
+    engine.game_state['player_id'] = 'bench'  # Jangan timpa data player default di database
+    engine.register_scene("ship", ShipScene(armada_size=armada))
+    engine.register_scene("harbor", HarborScene())
+    engine.set_input(ScriptedInput(SCRIPTS[scene_name]))
+    engine.game_state['current_scene'] = scene_name
+    if harbor:
+        engine.game_state['current_harbor'] = harbor
+    engine.change_scene(scene_name)
+
+    if scene_name == "ship":
+        # Pertempuran dibuat tidak pernah selesai supaya seluruh run tetap di ship scene
+        engine.scenes["ship"].enemies_to_defeat = float('inf')
+
+    # Frame dijalankan lewat step_frame (accumulator + interpolasi) dengan frame time tepat satu tick,
+    # sehingga simulasi deterministik; waktu per fase diambil dari section profiler engine
+    dt = engine.timestep.step
+    profiler.enabled = True
+    profiler.clear()
+    clock = time.perf_counter
+
+    start = clock()
+    for _ in range(frames):
+        engine.step_frame(dt)
+    total = clock() - start
+
+    engine.loader.shutdown()
+    pygame.quit()
+    fonts.clear()  # Font tidak valid lagi setelah pygame.quit()
+
+    averages = profiler.section_averages()
+    phases = {
+        'events': averages.get('events', 0.0),
+        'update': averages.get('update', 0.0) + averages.get('state_flush', 0.0),
+        'render': averages.get('render', 0.0)
+    }
+    if trace_path:
+        profiler.export_chrome_trace(trace_path)
+        print(f"  [{scene_name}] trace -> {trace_path}")
+        for name, avg in sorted(averages.items(), key=lambda item: -item[1])[:8]:
+            print(f"    {name:<14} {avg:8.3f} ms")
+    profiler.enabled = False
+
+    result = {'frames': frames, 'total': total, 'fps': frames / total if total > 0 else 0.0}
+    result.update(phases)  # ms per frame
+    return result
+
+
+def bench_replay(path: str, trace_path: str = None) -> Dict[str, float]:
+    """Putar file replay secepat mungkin (frame time tetap dari rekaman)"""
+    replay = ReplayInput(path)
+    profiler.enabled = trace_path is not None
+    
+    engine = GameEngine(width=SCREEN_WIDTH, height=SCREEN_HEIGHT, headless=True)
+    engine.game_state.update(replay.meta.get('state', {}))
+    engine.register_scene("ship", ShipScene(armada_size=replay.meta.get('armada', 0)))
+    engine.register_scene("harbor", HarborScene())
+    engine.set_input(replay)
+    engine.change_scene(engine.game_state['current_scene'])
+    
+    start = time.perf_counter()
+    while engine.running:
+        engine.step_frame(0.0)
+    total = time.perf_counter() - start
+    
+    engine.loader.shutdown()
+    pygame.quit()
+    fonts.clear()
+    
+    if trace_path:
+        profiler.export_chrome_trace(trace_path)
+        print(f"  [replay] trace -> {trace_path}")
+        profiler.enabled = False
+    
+    return {'frames': replay.frame, 'total': total, 'fps': replay.frame / total if total > 0 else 0.0}
+
+
+def main():
+    """Main function untuk benchmark"""
+    parser = argparse.ArgumentParser(description="Headless benchmark untuk Spice Trader 1400")
+    parser.add_argument("--frames", type=int, default=600, help="Jumlah frame per scene")
+    parser.add_argument("--seed", type=int, default=1400, help="Seed RNG")
+    parser.add_argument("--scene", choices=["ship", "harbor", "all"], default="all")
+    parser.add_argument("--trace", default=None,
+                        help="Prefix file Chrome trace JSON, mis. 'trace' -> trace_ship.json")
+    parser.add_argument("--replay", metavar="FILE", default=None,
+                        help="Jalankan file replay (main.py --record) sebagai benchmark")
+    parser.add_argument("--armada", type=int, nargs="?", const=ARMADA_DEFAULT_SIZE, default=0, metavar="N",
+                        help="Ship scene dalam armada mode dengan N enemy ship")
+    parser.add_argument("--tick-rate", type=int, default=60,
+                        help="Tick simulasi per detik (tick rendah = langkah cannonball lebih panjang)")
+    parser.add_argument("--harbor", choices=[island['harbor'] for island in ISLANDS], default=None,
+                        help="Peta harbor untuk harbor scene (default: harbor pertama)")
+    args = parser.parse_args()
+    
+    if args.replay:
+        trace_path = f"{args.trace}_replay.json" if args.trace else None
+        result = bench_replay(args.replay, trace_path)
+        print(f"replay: {result['frames']} frames dalam {result['total']:.2f} s ({result['fps']:.1f} fps)")
+        return
+
+    scene_names = ["ship", "harbor"] if args.scene == "all" else [args.scene]
+
+    print(f"{'scene':<8} {'frames':>7} {'fps':>9} {'events ms':>10} {'update ms':>10} {'render ms':>10}")
+    for scene_name in scene_names:
+        trace_path = f"{args.trace}_{scene_name}.json" if args.trace else None
+        result = bench_scene(scene_name, args.frames, args.seed, trace_path, args.armada,
+                             args.tick_rate, args.harbor)
+        print(f"{scene_name:<8} {result['frames']:>7} {result['fps']:>9.1f} "
+              f"{result['events']:>10.3f} {result['update']:>10.3f} {result['render']:>10.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+AI Scheduler - Level-of-detail update AI: entity jauh / di luar layar berpikir lebih jarang
+
+Tier 0 (dekat / terlihat) berpikir setiap tick, tier 1 setiap 4 tick, tier 2 setiap 16 tick.
+Tiap agent punya phase sendiri sehingga agent dalam satu tier tersebar rata di antara tick.
+Di antara dua think, agent tetap bergerak (move) dengan keputusan terakhirnya.
+"""
+import math
+import numpy as np
+import pygame
+from typing import Iterable, Optional, Sequence, Tuple
+
+TIER_INTERVALS = (1, 4, 16)
+
+
+class AIAgent:
+    """Mixin untuk entity yang dijadwalkan AIScheduler (butuh rect, think(dt) dan move(dt))"""
+    __slots__ = ('ai_tier', 'ai_phase', 'ai_elapsed')
+
+    def think(self, dt: float):
+        """Keputusan AI (mahal); dt = waktu sejak think sebelumnya"""
+
+    def move(self, dt: float):
+        """Integrasi posisi (murah), dipanggil setiap tick"""
+
+
+class AIScheduler:
+    """Penjadwal tier AI; satu instance per kelompok agent (enemy, NPC, armada)"""
+
+    def __init__(self, near_distance: float, far_distance: float,
+                 intervals: Sequence[int] = TIER_INTERVALS):
+        self.near_distance = near_distance
+        self.far_distance = far_distance
+        self.intervals = tuple(intervals)
+        self.tick = 0
+        self.thinks = 0  # Jumlah think pada tick terakhir (untuk profiler/debug)
+        self._next_phase = 0
+        self._interval_array = np.array(self.intervals, dtype=np.int64)
+
+    def next_phase(self) -> int:
+        """Phase round-robin untuk agent baru"""
+        phase = self._next_phase
+        self._next_phase += 1
+        return phase
+
+    def register(self, agent: AIAgent):
+        """Daftarkan agent baru (atau hasil reuse pool); think pertama terjadi pada tick berikutnya"""
+        agent.ai_tier = 0
+        agent.ai_phase = self.next_phase()
+        agent.ai_elapsed = 0.0
+
+    def tier_for(self, rect: pygame.Rect, focus: Tuple[float, float], view: Optional[pygame.Rect] = None) -> int:
+        """Tier berdasarkan visibilitas di view dan jarak ke focus"""
+        if view is not None and view.colliderect(rect):
+            return 0
+        distance = math.hypot(rect.centerx - focus[0], rect.centery - focus[1])
+        if distance < self.near_distance:
+            return 0
+        if distance < self.far_distance:
+            return 1
+        return 2
+
+    def update(self, agents: Iterable[AIAgent], dt: float, focus: Tuple[float, float],
+               view: Optional[pygame.Rect] = None):
+        """Think untuk agent yang jatuh tempo, move untuk semua agent"""
+        intervals = self.intervals
+        tick = self.tick
+        thinks = 0
+        for agent in agents:
+            agent.ai_elapsed += dt
+            if (tick + agent.ai_phase) % intervals[agent.ai_tier] == 0:
+                agent.think(agent.ai_elapsed)
+                agent.ai_elapsed = 0.0
+                # Tier dievaluasi ulang hanya saat agent berpikir supaya biaya per tick tetap rendah
+                agent.ai_tier = self.tier_for(agent.rect, focus, view)
+                thinks += 1
+            agent.move(dt)
+        self.tick = tick + 1
+        self.thinks = thinks
+
+    def due(self, distance: np.ndarray, phases: np.ndarray, visible: Optional[np.ndarray] = None) -> np.ndarray:
+        """Versi array: mask agent yang berpikir tick ini (tier dari jarak, lalu maju satu tick)"""
+        tiers = np.where(distance < self.near_distance, 0, np.where(distance < self.far_distance, 1, 2))
+        if visible is not None:
+            tiers[visible] = 0
+        mask = (self.tick + phases) % self._interval_array[tiers] == 0
+        self.tick += 1
+        self.thinks = int(np.count_nonzero(mask))
+        return mask
@@ -3,27 +3,60 @@ Game Engine Core - Sistem utama untuk menjalankan game
 """
 import pygame
 import sys
+import os
 from typing import Optional, Dict, Any
+from game_engine.timestep import FixedTimestep
+from game_engine.input import InputSource
+from game_engine.profiler import profiler, ProfilerOverlay
+from game_engine.scene_loader import SceneLoader
+from game_engine.state_store import StateStore
+from utils.database import db, StatePersister
+from utils.constants import ISLANDS
+from utils.text_cache import fonts, text_cache
 
 class GameEngine:
     """Engine utama untuk menjalankan game"""
     
-    def __init__(self, width: int = 1280, height: int = 720, title: str = "Spice Trader 1400"):
+    def __init__(self, width: int = 1280, height: int = 720, title: str = "Spice Trader 1400",
+                 fixed_timestep: bool = True, tick_rate: int = 60, max_catchup_steps: int = 5,
+                 headless: bool = False, max_fps: int = 120):
+        self.headless = headless
+        if headless:
+            # Tanpa display (CI / benchmark): SDL dummy driver dan render ke Surface offscreen
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
         pygame.init()
         self.width = width
         self.height = height
-        self.screen = pygame.display.set_mode((width, height))
-        pygame.display.set_caption(title)
+        if headless:
+            # Display 1x1 tetap dibuat supaya convert()/convert_alpha() punya pixel format
+            pygame.display.set_mode((1, 1))
+            self.screen = pygame.Surface((width, height))
+        else:
+            self.screen = pygame.display.set_mode((width, height))
+            pygame.display.set_caption(title)
         self.clock = pygame.time.Clock()
         self.running = True
         self.fps = 60
+        # Batas FPS render saat fixed timestep (0 = tanpa batas, untuk benchmark); tanpa fixed timestep loop dibatasi fps
+        self.max_fps = max_fps
+        
+        # Fixed timestep: simulasi berjalan pada tick_rate, render bebas dengan interpolasi
+        self.fixed_timestep = fixed_timestep
+        self.timestep = FixedTimestep(tick_rate, max_catchup_steps)
+        
+        # Sumber input (bisa diganti dengan ScriptedInput untuk benchmark)
+        self.input = InputSource()
         
         # Scene management
         self.current_scene: Optional[Any] = None
         self.scenes: Dict[str, Any] = {}
+        # Preload scene di worker thread; pending_scene menunggu prepare selesai
+        self.loader = SceneLoader()
+        self.pending_scene: Optional[str] = None
         
-        # Game state
-        self.game_state = {
+        # Game state (dibagi dengan semua scene, perubahan dikirim ke subscriber tiap tick)
+        self.game_state = StateStore({
             'player_id': 'default',
             'current_scene': 'ship',
             'health': 100,
@@ -32,85 +65,174 @@ class GameEngine:
             'inventory': {'spices': {}},
             'ship_position': {'x': 0, 'y': 0},
             'harbor_position': {'x': 0, 'y': 0},
+            'current_harbor': ISLANDS[0]['harbor'],
             'story_progress': 0,
             'visited_islands': []
-        }
+        })
+        self.persister = StatePersister(db, self.game_state)
+        # Sinkronisasi ke Flask API (opsional, lihat set_api_client)
+        self.api_sync = None
+        
+        # HUD engine di-bake ulang hanya saat key yang ditampilkan berubah
+        self._hud_surface: Optional[pygame.Surface] = None
+        self.game_state.subscribe(('health', 'max_health', 'coins', 'current_scene'), self._invalidate_hud)
         
         # Fonts
         self.fonts = {}
         self._load_fonts()
         
+        # Profiler overlay (F3 toggle, F4 export Chrome trace)
+        self.profiler_overlay = ProfilerOverlay(profiler, 10, 100)
+        self.trace_path = "profile_trace.json"
+        
     def _load_fonts(self):
-        """Load fonts untuk game"""
-        try:
-            self.fonts['default'] = pygame.font.Font(None, 24)
-            self.fonts['title'] = pygame.font.Font(None, 48)
-            self.fonts['small'] = pygame.font.Font(None, 18)
-        except:
-            # Fallback ke system font
-            self.fonts['default'] = pygame.font.SysFont('arial', 24)
-            self.fonts['title'] = pygame.font.SysFont('arial', 48)
-            self.fonts['small'] = pygame.font.SysFont('arial', 18)
+        """Load fonts untuk game (dari font registry bersama)"""
+        self.fonts['default'] = fonts.get(24)
+        self.fonts['title'] = fonts.get(48)
+        self.fonts['small'] = fonts.get(18)
     
     def register_scene(self, name: str, scene: Any):
         """Mendaftarkan scene ke engine"""
         self.scenes[name] = scene
+        scene.input = self.input
+    
+    def set_input(self, input_source: InputSource):
+        """Mengganti sumber input untuk engine dan semua scene"""
+        self.input = input_source
+        for scene in self.scenes.values():
+            scene.input = input_source
+        
+    def set_api_client(self, client, min_interval: float = 2.0):
+        """Aktifkan sinkronisasi state ke Flask API: key yang berubah dikirim via PATCH"""
+        # Di-import di sini supaya requests hanya dibutuhkan saat API dipakai
+        from utils.api_client import APISync
+        self.api_sync = APISync(client, self.game_state, min_interval)
+    
+    def preload_scene(self, scene_name: str) -> bool:
+        """Mulai menyiapkan scene di background sebelum dipakai"""
+        if scene_name not in self.scenes:
+            return False
+        return self.loader.preload(self.scenes[scene_name], self.game_state)
         
     def change_scene(self, scene_name: str):
         """Mengubah scene yang aktif"""
-        if scene_name in self.scenes:
-            self.current_scene = self.scenes[scene_name]
-            self.current_scene.setup(self.game_state)
+        if scene_name not in self.scenes:
+            return False
+        self.loader.poll()
+        if self.loader.is_loading(scene_name) and self.input.deterministic:
+            # Record / replay: jumlah frame beku tidak boleh bergantung pada kecepatan loader thread
+            self.loader.wait(scene_name)
+        if self.loader.is_loading(scene_name):
+            # Prepare belum selesai: tunggu sambil menampilkan overlay loading
+            self.pending_scene = scene_name
             self.game_state['current_scene'] = scene_name
             return True
-        return False
+        self.current_scene = self.scenes[scene_name]
+        self.current_scene.setup(self.game_state)
+        self.game_state['current_scene'] = scene_name
+        return True
     
     def handle_events(self):
         """Handle semua event dari pygame"""
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                self.running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
+        with profiler.section("events"):
+            for event in self.input.poll_events():
+                if event.type == pygame.QUIT:
                     self.running = False
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        self.running = False
+                    elif event.key == pygame.K_F3:
+                        self.toggle_profiler()
+                    elif event.key == pygame.K_F4:
+                        self.export_trace()
+                    elif self.current_scene:
+                        self.current_scene.handle_event(event)
                 elif self.current_scene:
                     self.current_scene.handle_event(event)
-            elif self.current_scene:
-                self.current_scene.handle_event(event)
+    
+    def toggle_profiler(self):
+        """Nyalakan / matikan profiler beserta overlay-nya"""
+        profiler.toggle()
+        self.profiler_overlay.visible = profiler.enabled
+    
+    def export_trace(self):
+        """Export data profiler ke Chrome trace JSON"""
+        if not profiler.enabled:
+            return
+        count = profiler.export_chrome_trace(self.trace_path)
+        print(f"Profiler trace ({count} events) disimpan ke {self.trace_path}")
     
     def update(self, dt: float):
         """Update game logic"""
         # Simpan scene name sebelum update
         previous_scene = self.game_state.get('current_scene', 'ship')
         
+        self.loader.poll()
+        if self.pending_scene:
+            # Scene lama dibekukan sampai scene tujuan selesai disiapkan
+            if not self.loader.is_loading(self.pending_scene):
+                scene_name, self.pending_scene = self.pending_scene, None
+                self.change_scene(scene_name)
+            return
+        
         if self.current_scene:
-            self.current_scene.update(dt)
-            # Update game state dari scene
-            updated_state = self.current_scene.get_state()
-            if updated_state:
-                self.game_state.update(updated_state)
+            with profiler.section("update"):
+                self.current_scene.update(dt)
+            # Scene minta scene berikutnya disiapkan lebih awal
+            if self.current_scene.preload_request:
+                self.preload_scene(self.current_scene.preload_request)
+                self.current_scene.preload_request = None
         
         # Check jika scene berubah dan auto-switch
         current_scene_name = self.game_state.get('current_scene', 'ship')
         if previous_scene != current_scene_name and current_scene_name in self.scenes:
             print(f"Scene berubah dari '{previous_scene}' ke '{current_scene_name}'")
             self.change_scene(current_scene_name)
+        
+        # Kirim perubahan state ke subscriber (HUD, database, API)
+        with profiler.section("state_flush"):
+            self.game_state.flush()
+            self.persister.update(dt)
+            if self.api_sync:
+                self.api_sync.update(dt)
     
-    def render(self):
+    def render(self, alpha: float = 1.0):
         """Render semua objek ke screen"""
-        # Clear screen dengan background
-        self.screen.fill((30, 60, 90))  # Dark blue ocean color
-        
-        if self.current_scene:
-            self.current_scene.render(self.screen)
-        
-        # Render HUD
-        self._render_hud()
+        with profiler.section("render"):
+            # Clear screen dengan background
+            self.screen.fill((30, 60, 90))  # Dark blue ocean color
+            
+            if self.current_scene:
+                # Alpha interpolasi antara tick simulasi sebelumnya dan sekarang
+                self.current_scene.render_alpha = alpha
+                self.current_scene.render(self.screen)
+            
+            # Render HUD
+            with profiler.section("engine_hud"):
+                self._render_hud()
+            
+            if self.pending_scene:
+                self._render_loading_overlay()
+            
+            self.profiler_overlay.render(self.screen)
         
-        pygame.display.flip()
+        if not self.headless:
+            with profiler.section("flip"):
+                pygame.display.flip()
+    
+    def _invalidate_hud(self, changed_keys):
+        """Subscriber StateStore: HUD perlu di-bake ulang"""
+        self._hud_surface = None
     
     def _render_hud(self):
         """Render HUD (Health, Coins, dll)"""
+        if self._hud_surface is None:
+            self._hud_surface = pygame.Surface((220, 95), pygame.SRCALPHA)
+            self._bake_hud(self._hud_surface)
+        self.screen.blit(self._hud_surface, (0, 0))
+    
+    def _bake_hud(self, surface: pygame.Surface):
+        """Gambar HUD ke surface cache"""
         # Health bar
         bar_width = 200
         bar_height = 20
@@ -118,42 +240,74 @@ class GameEngine:
         bar_y = 10
         
         # Background
-        pygame.draw.rect(self.screen, (50, 50, 50), (bar_x, bar_y, bar_width, bar_height))
+        pygame.draw.rect(surface, (50, 50, 50), (bar_x, bar_y, bar_width, bar_height))
         # Health fill
         health_percent = self.game_state['health'] / self.game_state['max_health']
         health_width = int(bar_width * health_percent)
         health_color = (255, 0, 0) if health_percent < 0.3 else (0, 255, 0) if health_percent > 0.6 else (255, 255, 0)
-        pygame.draw.rect(self.screen, health_color, (bar_x, bar_y, health_width, bar_height))
+        pygame.draw.rect(surface, health_color, (bar_x, bar_y, health_width, bar_height))
         # Border
-        pygame.draw.rect(self.screen, (255, 255, 255), (bar_x, bar_y, bar_width, bar_height), 2)
+        pygame.draw.rect(surface, (255, 255, 255), (bar_x, bar_y, bar_width, bar_height), 2)
         
         # Health text
-        health_text = self.fonts['small'].render(f"HP: {self.game_state['health']}/{self.game_state['max_health']}", True, (255, 255, 255))
-        self.screen.blit(health_text, (bar_x + 5, bar_y + 2))
+        health_text = text_cache.render(f"HP: {self.game_state['health']}/{self.game_state['max_health']}", 18, (255, 255, 255))
+        surface.blit(health_text, (bar_x + 5, bar_y + 2))
         
         # Coins display
-        coins_text = self.fonts['default'].render(f"Koin: {self.game_state['coins']}", True, (255, 215, 0))
-        self.screen.blit(coins_text, (bar_x, bar_y + 30))
+        coins_text = text_cache.render(f"Koin: {self.game_state['coins']}", 24, (255, 215, 0))
+        surface.blit(coins_text, (bar_x, bar_y + 30))
         
         # Scene name
-        scene_text = self.fonts['small'].render(f"Scene: {self.game_state['current_scene']}", True, (255, 255, 255))
-        self.screen.blit(scene_text, (bar_x, bar_y + 60))
+        scene_text = text_cache.render(f"Scene: {self.game_state['current_scene']}", 18, (255, 255, 255))
+        surface.blit(scene_text, (bar_x, bar_y + 60))
     
-    def run(self):
+    def _render_loading_overlay(self):
+        """Overlay ringan selama scene tujuan masih disiapkan"""
+        panel = pygame.Rect(self.width - 170, self.height - 60, 160, 50)
+        pygame.draw.rect(self.screen, (0, 0, 0), panel)
+        pygame.draw.rect(self.screen, (100, 150, 200), panel, 2)
+        text = text_cache.render("Memuat...", 24, (255, 255, 255))
+        self.screen.blit(text, text.get_rect(center=panel.center))
+    
+    def step_frame(self, frame_time: float):
+        """Jalankan satu frame: events, update simulasi, lalu render"""
+        profiler.begin_frame()
+        frame_time = self.input.frame_time(frame_time)
+        self.handle_events()
+        
+        if self.fixed_timestep:
+            # Jalankan simulasi dengan step tetap, maksimal max_catchup_steps per frame
+            for _ in range(self.timestep.advance(frame_time)):
+                self.update(self.timestep.step)
+            self.render(self.timestep.alpha)
+        else:
+            self.update(frame_time)
+            self.render()
+        profiler.end_frame()
+    
+    def run(self, exit_on_quit: bool = True):
         """Main game loop"""
         while self.running:
-            dt = self.clock.tick(self.fps) / 1000.0  # Delta time in seconds
-            
-            self.handle_events()
-            self.update(dt)
-            self.render()
+            # Dengan fixed timestep render tidak terikat tick rate, jadi hanya dibatasi max_fps
+            frame_cap = self.max_fps if self.fixed_timestep else self.fps
+            frame_time = self.clock.tick(frame_cap) / 1000.0  # Delta time in seconds
+            self.step_frame(frame_time)
         
+        self.loader.shutdown()
+        self.input.close()
+        for scene in self.scenes.values():
+            scene.shutdown()
+        if self.persister.dirty:
+            self.persister.save_now()
+        if self.api_sync:
+            self.api_sync.shutdown()
         pygame.quit()
-        sys.exit()
+        if exit_on_quit:
+            sys.exit()
     
     def get_game_state(self) -> Dict[str, Any]:
         """Mendapatkan game state saat ini"""
-        return self.game_state.copy()
+        return self.game_state.snapshot()
     
     def set_game_state(self, state: Dict[str, Any]):
         """Mengatur game state"""
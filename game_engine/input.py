@@ -0,0 +1,108 @@
+"""
+Input Source - Abstraksi input supaya engine bisa dijalankan dengan input scripted
+"""
+import pygame
+from typing import Callable, Iterable, List, Optional, Tuple
+
+
+class KeyState:
+    """Pengganti ScancodeWrapper untuk sekumpulan tombol yang sedang ditekan"""
+
+    def __init__(self, keys: Iterable[int] = ()):
+        self.keys = set(keys)
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self.keys
+
+
+class InputSource:
+    """Sumber input default - langsung dari pygame"""
+
+    # True jika jumlah frame harus bisa direproduksi (record / replay): pergantian scene
+    # menunggu preload selesai, bukan membekukan frame selama waktu loader thread
+    deterministic = False
+
+    def poll_events(self) -> List[pygame.event.Event]:
+        """Ambil semua event untuk frame ini"""
+        return pygame.event.get()
+
+    def get_pressed(self):
+        """Snapshot tombol keyboard yang sedang ditekan"""
+        return pygame.key.get_pressed()
+
+    def get_mouse_pos(self) -> Tuple[int, int]:
+        """Posisi mouse saat ini"""
+        return pygame.mouse.get_pos()
+
+    def frame_time(self, measured: float) -> float:
+        """Frame time yang dipakai engine (replay mengembalikan nilai rekaman)"""
+        return measured
+
+    def close(self):
+        """Dipanggil saat game selesai (mis. menutup file rekaman)"""
+        pass
+
+
+class ScriptedInput(InputSource):
+    """Input scripted untuk benchmark dan testing tanpa display"""
+
+    def __init__(self, script: Optional[Callable[["ScriptedInput", int], None]] = None):
+        self.script = script
+        self.frame = 0
+        self.held = KeyState()
+        self.mouse_pos = (0, 0)
+        self.pending: List[pygame.event.Event] = []
+        # Event yang baru dikirim pada frame berikutnya (mis. MOUSEBUTTONUP setelah klik)
+        self.next_frame: List[pygame.event.Event] = []
+
+    def press(self, key: int):
+        """Tekan dan tahan tombol"""
+        if key not in self.held.keys:
+            self.held.keys.add(key)
+            self.pending.append(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0))
+
+    def release(self, key: int):
+        """Lepas tombol"""
+        if key in self.held.keys:
+            self.held.keys.discard(key)
+            self.pending.append(pygame.event.Event(pygame.KEYUP, key=key, mod=0, unicode="", scancode=0))
+
+    def tap(self, key: int):
+        """Tekan lalu lepas tombol dalam frame yang sama"""
+        self.press(key)
+        self.release(key)
+
+    def hold_only(self, keys: Iterable[int]):
+        """Set tombol yang ditahan menjadi tepat keys"""
+        keys = set(keys)
+        for key in list(self.held.keys - keys):
+            self.release(key)
+        for key in keys - self.held.keys:
+            self.press(key)
+
+    def move_mouse(self, pos: Tuple[int, int]):
+        """Gerakkan mouse ke posisi tertentu"""
+        rel = (pos[0] - self.mouse_pos[0], pos[1] - self.mouse_pos[1])
+        self.mouse_pos = pos
+        self.pending.append(pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=rel, buttons=(0, 0, 0)))
+
+    def click(self, pos: Tuple[int, int], button: int = 1):
+        """Klik mouse di posisi tertentu"""
+        self.move_mouse(pos)
+        self.pending.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=button))
+        # Button dilepas frame berikutnya supaya scene sempat memproses klik di update
+        self.next_frame.append(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=pos, button=button))
+
+    def poll_events(self) -> List[pygame.event.Event]:
+        """Jalankan script untuk frame ini lalu kembalikan event yang terkumpul"""
+        if self.script:
+            self.script(self, self.frame)
+        self.frame += 1
+        events, self.pending, self.next_frame = self.pending, self.next_frame, []
+        return events
+
+    def get_pressed(self) -> KeyState:
+        return self.held
+
+    def get_mouse_pos(self) -> Tuple[int, int]:
+        return self.mouse_pos
@@ -0,0 +1,195 @@
+"""
+Frame Profiler - Timing per fase per frame dengan ring buffer dan export Chrome trace
+"""
+import json
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+import pygame
+from utils.text_cache import fonts
+
+# (name, start, duration, depth) dalam detik
+SectionRecord = Tuple[str, float, float, int]
+
+OVERLAY_WIDTH = 300
+OVERLAY_LINE_HEIGHT = 16
+OVERLAY_FONT_SIZE = 18
+
+
+class _Section:
+    """Context manager untuk satu section yang sedang diukur"""
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler: "FrameProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.profiler._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        profiler = self.profiler
+        profiler._depth -= 1
+        profiler._sections.append((self.name, self.start, time.perf_counter() - self.start, profiler._depth))
+        return False
+
+
+class _NullSection:
+    """Section kosong saat profiler dimatikan"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+class FrameProfiler:
+    """Profiler per frame dengan ring buffer berukuran tetap"""
+
+    def __init__(self, capacity: int = 600):
+        self.enabled = False
+        self.capacity = capacity
+        # Ring buffer: (frame_start, frame_duration, sections)
+        self.frames: Deque[Tuple[float, float, List[SectionRecord]]] = deque(maxlen=capacity)
+        self._sections: List[SectionRecord] = []
+        self._frame_start: Optional[float] = None
+        self._depth = 0
+        self._origin = time.perf_counter()
+
+    def section(self, name: str):
+        """Ukur durasi blok kode: with profiler.section("ocean"): ..."""
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self, name)
+
+    def begin_frame(self):
+        """Tandai awal frame"""
+        if not self.enabled:
+            return
+        self._frame_start = time.perf_counter()
+        self._sections = []
+        self._depth = 0
+
+    def end_frame(self):
+        """Tandai akhir frame dan simpan ke ring buffer"""
+        if not self.enabled or self._frame_start is None:
+            return
+        duration = time.perf_counter() - self._frame_start
+        self.frames.append((self._frame_start, duration, self._sections))
+        self._frame_start = None
+        self._sections = []
+
+    def toggle(self):
+        """Nyalakan / matikan profiler"""
+        self.enabled = not self.enabled
+        self._frame_start = None
+        if not self.enabled:
+            self.frames.clear()
+
+    def clear(self):
+        """Hapus semua data di buffer"""
+        self.frames.clear()
+
+    def resize(self, capacity: int):
+        """Ganti kapasitas ring buffer (data lama dibuang)"""
+        self.capacity = capacity
+        self.frames = deque(maxlen=capacity)
+
+    def frame_percentiles(self, percentiles=(50, 95, 99)) -> Dict[int, float]:
+        """Persentil frame time (ms) dari buffer"""
+        durations = sorted(duration for _, duration, _ in self.frames)
+        if not durations:
+            return {p: 0.0 for p in percentiles}
+        last = len(durations) - 1
+        return {p: durations[min(last, int(round(p / 100.0 * last)))] * 1000.0 for p in percentiles}
+
+    def section_averages(self) -> Dict[str, float]:
+        """Rata-rata waktu (ms) per frame untuk tiap section"""
+        totals: Dict[str, float] = {}
+        for _, _, sections in self.frames:
+            for name, _, duration, _ in sections:
+                totals[name] = totals.get(name, 0.0) + duration
+        count = max(1, len(self.frames))
+        return {name: total / count * 1000.0 for name, total in totals.items()}
+
+    def export_chrome_trace(self, path: str) -> int:
+        """Export buffer ke format Chrome trace JSON (chrome://tracing / Perfetto)"""
+        events = []
+        for index, (frame_start, duration, sections) in enumerate(self.frames):
+            events.append({
+                'name': 'frame', 'cat': 'frame', 'ph': 'X', 'pid': 1, 'tid': 1,
+                'ts': (frame_start - self._origin) * 1e6, 'dur': duration * 1e6,
+                'args': {'index': index}
+            })
+            for name, start, section_duration, depth in sections:
+                events.append({
+                    'name': name, 'cat': 'section', 'ph': 'X', 'pid': 1, 'tid': 1,
+                    'ts': (start - self._origin) * 1e6, 'dur': section_duration * 1e6,
+                    'args': {'depth': depth}
+                })
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        return len(events)
+
+
+class ProfilerOverlay:
+    """Overlay on-screen untuk statistik profiler"""
+
+    def __init__(self, profiler: FrameProfiler, x: int = 10, y: int = 100, refresh_frames: int = 30):
+        self.profiler = profiler
+        self.x = x
+        self.y = y
+        self.visible = False
+        self.refresh_frames = refresh_frames
+        self._frame_counter = 0
+        self._lines: List[str] = []
+        # Panel di-bake saat statistik di-refresh; frame lain cukup satu blit. Panel ini sendiri cache-nya:
+        # angka yang berubah tiap refresh tidak dimasukkan ke text_cache supaya label game tidak ter-evict
+        self._panel: Optional[pygame.Surface] = None
+        self.font = fonts.get(OVERLAY_FONT_SIZE)
+
+    def _refresh(self):
+        """Hitung ulang statistik (tidak tiap frame supaya overlay tetap murah)"""
+        p = self.profiler.frame_percentiles()
+        self._lines = [
+            f"Frame ms  p50 {p[50]:.2f}  p95 {p[95]:.2f}  p99 {p[99]:.2f}",
+            f"Frames di buffer: {len(self.profiler.frames)}/{self.profiler.capacity}"
+        ]
+        averages = sorted(self.profiler.section_averages().items(), key=lambda item: -item[1])
+        for name, avg in averages[:10]:
+            self._lines.append(f"{name:<14} {avg:6.2f} ms")
+        self._bake_panel()
+
+    def _bake_panel(self):
+        """Gambar ulang panel ke surface yang dipakai ulang (dibuat baru hanya jika jumlah baris berubah)"""
+        height = 10 + OVERLAY_LINE_HEIGHT * len(self._lines)
+        if self._panel is None or self._panel.get_height() != height:
+            self._panel = pygame.Surface((OVERLAY_WIDTH, height), pygame.SRCALPHA)
+        panel = self._panel
+        panel.fill((0, 0, 0, 190))
+        pygame.draw.rect(panel, (100, 150, 200), panel.get_rect(), 1)
+        for i, line in enumerate(self._lines):
+            text = self.font.render(line, True, (200, 255, 200))
+            panel.blit(text, (6, 5 + i * OVERLAY_LINE_HEIGHT))
+
+    def render(self, screen: pygame.Surface):
+        """Render overlay"""
+        if not self.visible:
+            return
+        if self._frame_counter % self.refresh_frames == 0:
+            self._refresh()
+        self._frame_counter += 1
+        screen.blit(self._panel, (self.x, self.y))
+
+
+# Global profiler instance
+profiler = FrameProfiler()
@@ -0,0 +1,58 @@
+"""
+Render Queue - Draw command (layer + y-sort) dikumpulkan per frame, di-cull terhadap kamera, lalu di-blit
+sekaligus dengan Surface.blits
+
+Entity tidak menggambar langsung ke screen: entity submit sprite yang sudah di-bake beserta posisi
+world-nya. Biaya flush sebanding jumlah command yang terlihat, bukan jumlah entity di dunia.
+"""
+import pygame
+from typing import List, Optional, Tuple
+
+# Layer umum; di dalam satu layer command diurutkan berdasarkan sort_y (kaki entity) lalu urutan submit
+LAYER_GROUND = 0
+LAYER_WORLD = 1
+LAYER_LABELS = 2
+
+Command = Tuple[int, float, int, pygame.Surface, int, int]
+
+
+class RenderQueue:
+    """Antrian draw command satu frame (koordinat world)"""
+
+    def __init__(self):
+        self.commands: List[Command] = []
+        self.drawn = 0  # Jumlah command yang lolos culling pada flush terakhir
+        self.culled = 0
+
+    def __len__(self) -> int:
+        return len(self.commands)
+
+    def clear(self):
+        """Buang semua command"""
+        self.commands.clear()
+
+    def submit(self, surface: pygame.Surface, x: int, y: int, layer: int = LAYER_WORLD,
+               sort_y: Optional[float] = None):
+        """Tambah sprite di posisi world (x, y) = top-left; sort_y default = sisi bawah sprite"""
+        if sort_y is None:
+            sort_y = y + surface.get_height()
+        self.commands.append((layer, sort_y, len(self.commands), surface, x, y))
+
+    def flush(self, screen: pygame.Surface, camera_x: int, camera_y: int,
+              view: Optional[pygame.Rect] = None) -> int:
+        """Cull command di luar view (default: ukuran screen di posisi kamera), urutkan, blit, lalu clear"""
+        if view is None:
+            view = pygame.Rect(camera_x, camera_y, screen.get_width(), screen.get_height())
+        left, top, right, bottom = view.left, view.top, view.right, view.bottom
+        visible = [command for command in self.commands
+                   if command[4] < right and command[5] < bottom
+                   and command[4] + command[3].get_width() > left
+                   and command[5] + command[3].get_height() > top]
+        self.culled = len(self.commands) - len(visible)
+        self.drawn = len(visible)
+        # Tuple (layer, sort_y, urutan submit) unik sehingga surface tidak pernah ikut dibandingkan
+        visible.sort()
+        screen.blits([(surface, (x - camera_x, y - camera_y)) for _, _, _, surface, x, y in visible],
+                     doreturn=False)
+        self.commands.clear()
+        return self.drawn
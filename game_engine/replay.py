@@ -0,0 +1,331 @@
+"""
+Replay - Rekam input per frame ke file biner terkompresi dan putar ulang secara deterministik
+
+Format file: MAGIC + zlib(payload). Payload = header JSON (seed RNG, meta) lalu record per frame:
+flags, frame_time (delta mikrodetik), tombol yang berubah (XOR delta bitset), delta mouse, event.
+Semua integer disimpan sebagai varint (zigzag untuk nilai bertanda).
+"""
+import json
+import zlib
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+import pygame
+from game_engine.input import InputSource, KeyState
+from utils import rng
+
+MAGIC = b"SPT1400R"
+FORMAT_VERSION = 1
+
+# Flag per frame
+_KEYS_CHANGED = 1
+_MOUSE_MOVED = 2
+_HAS_EVENTS = 4
+_TIME_CHANGED = 8
+_END_OF_STREAM = 0xFF
+
+# Kode event yang direkam (MOUSEMOTION dibuat ulang dari delta posisi mouse)
+_EVENT_CODES = {
+    pygame.KEYDOWN: 1,
+    pygame.KEYUP: 2,
+    pygame.MOUSEBUTTONDOWN: 3,
+    pygame.MOUSEBUTTONUP: 4,
+    pygame.QUIT: 5
+}
+_EVENT_TYPES = {code: event_type for event_type, code in _EVENT_CODES.items()}
+
+# Keycode SDL dengan bit ini (arrow, F-key, ...) dipetakan ke index >= 1024 pada bitset
+_KEYCODE_SCANCODE_MASK = 1 << 30
+
+
+def _write_varint(out: bytearray, value: int):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+
+def _key_to_index(key: int) -> int:
+    if key & _KEYCODE_SCANCODE_MASK:
+        return 1024 + (key & 0x3FF)
+    return key
+
+
+def _index_to_key(index: int) -> int:
+    if index >= 1024:
+        return _KEYCODE_SCANCODE_MASK | (index - 1024)
+    return index
+
+
+def _pressed_bitset(pressed) -> Tuple[str, int]:
+    """Snapshot get_pressed() sebagai bitset (scancode untuk pygame, keycode untuk KeyState)"""
+    if isinstance(pressed, KeyState):
+        mask = 0
+        for key in pressed.keys:
+            mask |= 1 << _key_to_index(key)
+        return 'keycode', mask
+    mask = 0
+    for index, down in enumerate(pressed):
+        if down:
+            mask |= 1 << index
+    return 'scancode', mask
+
+
+class InputRecorder(InputSource):
+    """Bungkus InputSource lain dan rekam semua input per frame ke file"""
+
+    deterministic = True
+
+    def __init__(self, source: InputSource, path: str, meta: Optional[Dict[str, Any]] = None):
+        self.source = source
+        self.path = path
+        self.frames = 0
+        self._file: Optional[BinaryIO] = open(path, 'wb')
+        self._compressor = zlib.compressobj(9)
+        self._mask = 0
+        self._mouse = (0, 0)
+        self._time_us = 0
+        self._frame_time = 0.0
+        self._pressed = None
+
+        # Header: seed RNG dicatat sebelum ada stream yang dipakai
+        key_space, _ = _pressed_bitset(source.get_pressed())
+        header = {'version': FORMAT_VERSION, 'seeds': rng.get_seeds(), 'key_space': key_space,
+                  'meta': meta or {}}
+        encoded = json.dumps(header).encode('utf-8')
+        out = bytearray()
+        _write_varint(out, len(encoded))
+        out += encoded
+        self._file.write(MAGIC)
+        self._file.write(self._compressor.compress(bytes(out)))
+
+    def frame_time(self, measured: float) -> float:
+        # Dikuantisasi ke mikrodetik supaya run rekaman dan replay memakai nilai yang identik
+        self._frame_time = round(measured * 1e6) / 1e6
+        return self._frame_time
+
+    def poll_events(self) -> List[pygame.event.Event]:
+        """Ambil event dari source lalu tulis record frame ini"""
+        events = self.source.poll_events()
+        self._pressed = self.source.get_pressed()
+        mouse = self.source.get_mouse_pos()
+        _, mask = _pressed_bitset(self._pressed)
+
+        out = bytearray()
+        flags = 0
+        changed = mask ^ self._mask
+        if changed:
+            flags |= _KEYS_CHANGED
+        if mouse != self._mouse:
+            flags |= _MOUSE_MOVED
+        recorded = [event for event in events if event.type in _EVENT_CODES]
+        if recorded:
+            flags |= _HAS_EVENTS
+        time_us = int(round(self._frame_time * 1e6))
+        if time_us != self._time_us:
+            flags |= _TIME_CHANGED
+        _write_varint(out, flags)
+
+        if flags & _TIME_CHANGED:
+            _write_varint(out, _zigzag(time_us - self._time_us))
+            self._time_us = time_us
+        if flags & _KEYS_CHANGED:
+            # Delta XOR: hanya index tombol yang berubah, delta-encoded berurutan
+            toggled = []
+            index = 0
+            while changed:
+                if changed & 1:
+                    toggled.append(index)
+                changed >>= 1
+                index += 1
+            _write_varint(out, len(toggled))
+            previous = 0
+            for index in toggled:
+                _write_varint(out, index - previous)
+                previous = index
+            self._mask = mask
+        if flags & _MOUSE_MOVED:
+            _write_varint(out, _zigzag(mouse[0] - self._mouse[0]))
+            _write_varint(out, _zigzag(mouse[1] - self._mouse[1]))
+            self._mouse = mouse
+        if flags & _HAS_EVENTS:
+            _write_varint(out, len(recorded))
+            for event in recorded:
+                out.append(_EVENT_CODES[event.type])
+                if event.type in (pygame.KEYDOWN, pygame.KEYUP):
+                    _write_varint(out, _key_to_index(event.key))
+                    _write_varint(out, getattr(event, 'mod', 0))
+                elif event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+                    _write_varint(out, event.button)
+
+        self._file.write(self._compressor.compress(bytes(out)))
+        self.frames += 1
+        return events
+
+    def get_pressed(self):
+        return self._pressed if self._pressed is not None else self.source.get_pressed()
+
+    def get_mouse_pos(self) -> Tuple[int, int]:
+        return self.source.get_mouse_pos()
+
+    def close(self):
+        """Tutup file rekaman"""
+        if self._file is None:
+            return
+        # Flags 0xFF menandai akhir stream
+        out = bytearray()
+        _write_varint(out, _END_OF_STREAM)
+        self._file.write(self._compressor.compress(bytes(out)))
+        self._file.write(self._compressor.flush())
+        self._file.close()
+        self._file = None
+
+
+class ReplayInput(InputSource):
+    """Putar ulang file rekaman InputRecorder"""
+
+    deterministic = True
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            raw = f.read()
+        if not raw.startswith(MAGIC):
+            raise ValueError(f"Bukan file replay: {path}")
+        # decompressobj supaya rekaman yang terpotong (game crash) tetap bisa diputar
+        self.data = zlib.decompressobj().decompress(raw[len(MAGIC):])
+
+        header_len, pos = _read_varint(self.data, 0)
+        self.header = json.loads(self.data[pos:pos + header_len].decode('utf-8'))
+        if self.header.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Versi replay tidak didukung: {self.header.get('version')}")
+        self.meta: Dict[str, Any] = self.header.get('meta', {})
+        self._pos = pos + header_len
+        self.frame = 0
+        self.finished = False
+
+        self.key_space = self.header.get('key_space', 'scancode')
+        self._mask = 0
+        self._pressed = self._build_pressed()
+        self._mouse = (0, 0)
+        self._time_us = 0
+        self._events: List[pygame.event.Event] = []
+        self._ready = False
+
+        # Seed RNG dipasang sebelum scene dibuat supaya hasil identik
+        rng.set_seeds(self.header.get('seeds', {}))
+
+    def _build_pressed(self):
+        indices = []
+        mask = self._mask
+        index = 0
+        while mask:
+            if mask & 1:
+                indices.append(index)
+            mask >>= 1
+            index += 1
+        if self.key_space == 'keycode':
+            return KeyState(_index_to_key(index) for index in indices)
+        states = [False] * 512
+        for index in indices:
+            if index < len(states):
+                states[index] = True
+        return pygame.key.ScancodeWrapper(states)
+
+    def _advance(self):
+        """Decode record frame berikutnya"""
+        self._ready = True
+        if self.finished:
+            self._events = []
+            return
+        try:
+            events = self._decode_frame()
+        except IndexError:
+            # Rekaman terpotong di tengah record
+            events = None
+        if events is None:
+            self.finished = True
+            events = [pygame.event.Event(pygame.QUIT)]
+        self._events = events
+
+    def _decode_frame(self) -> Optional[List[pygame.event.Event]]:
+        """Decode satu record; None jika sudah akhir stream"""
+        data = self.data
+        if self._pos >= len(data):
+            return None
+        flags, pos = _read_varint(data, self._pos)
+        if flags == _END_OF_STREAM:
+            return None
+
+        events: List[pygame.event.Event] = []
+        if flags & _TIME_CHANGED:
+            delta, pos = _read_varint(data, pos)
+            self._time_us += _unzigzag(delta)
+        if flags & _KEYS_CHANGED:
+            count, pos = _read_varint(data, pos)
+            index = 0
+            for _ in range(count):
+                delta, pos = _read_varint(data, pos)
+                index += delta
+                self._mask ^= 1 << index
+            self._pressed = self._build_pressed()
+        if flags & _MOUSE_MOVED:
+            dx, pos = _read_varint(data, pos)
+            dy, pos = _read_varint(data, pos)
+            rel = (_unzigzag(dx), _unzigzag(dy))
+            self._mouse = (self._mouse[0] + rel[0], self._mouse[1] + rel[1])
+            events.append(pygame.event.Event(pygame.MOUSEMOTION, pos=self._mouse, rel=rel, buttons=(0, 0, 0)))
+        if flags & _HAS_EVENTS:
+            count, pos = _read_varint(data, pos)
+            for _ in range(count):
+                event_type = _EVENT_TYPES[data[pos]]
+                pos += 1
+                if event_type in (pygame.KEYDOWN, pygame.KEYUP):
+                    key, pos = _read_varint(data, pos)
+                    mod, pos = _read_varint(data, pos)
+                    events.append(pygame.event.Event(event_type, key=_index_to_key(key), mod=mod,
+                                                     unicode="", scancode=0))
+                elif event_type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+                    button, pos = _read_varint(data, pos)
+                    events.append(pygame.event.Event(event_type, pos=self._mouse, button=button))
+                else:
+                    events.append(pygame.event.Event(event_type))
+        self._pos = pos
+        return events
+
+    def frame_time(self, measured: float) -> float:
+        """Frame time hasil rekaman (bukan waktu nyata) supaya jumlah tick identik"""
+        if not self._ready:
+            self._advance()
+        return self._time_us / 1e6
+
+    def poll_events(self) -> List[pygame.event.Event]:
+        if not self._ready:
+            self._advance()
+        self._ready = False
+        self.frame += 1
+        return self._events
+
+    def get_pressed(self):
+        return self._pressed
+
+    def get_mouse_pos(self) -> Tuple[int, int]:
+        return self._mouse
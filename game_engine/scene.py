@@ -4,19 +4,40 @@ Base Scene Class - Base class untuk semua scene
 import pygame
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
+from game_engine.input import InputSource
+from game_engine.state_store import StateStore
 
 class Scene(ABC):
     """Base class untuk semua scene dalam game"""
     
     def __init__(self, name: str):
         self.name = name
-        self.state: Optional[Dict[str, Any]] = None
+        # Game state bersama (StateStore milik engine), bukan copy
+        self.state: Optional[StateStore] = None
+        # Alpha interpolasi render (diset oleh engine sebelum render)
+        self.render_alpha = 1.0
+        # Sumber input (diset oleh engine saat register_scene)
+        self.input = InputSource()
+        # Hasil prepare() yang belum dipakai setup (diisi oleh SceneLoader)
+        self.prepared: Any = None
+        # Nama scene yang sebaiknya mulai di-preload engine (mis. menjelang pindah scene)
+        self.preload_request: Optional[str] = None
         
+    def prepare(self, game_state: Dict[str, Any]) -> Any:
+        """Siapkan resource berat sebelum setup (bisa dijalankan di worker thread)"""
+        return None
+    
+    def take_prepared(self, game_state: Dict[str, Any]) -> Any:
+        """Ambil hasil prepare; jalankan prepare secara sinkron jika belum di-preload"""
+        prepared, self.prepared = self.prepared, None
+        if prepared is None:
+            prepared = self.prepare(game_state)
+        return prepared
+    
     @abstractmethod
-    def setup(self, game_state: Dict[str, Any]):
+    def setup(self, game_state: StateStore):
         """Setup scene dengan game state"""
-        self.state = game_state.copy()
-        pass
+        self.state = game_state
     
     @abstractmethod
     def handle_event(self, event: pygame.event.Event):
@@ -33,6 +54,10 @@ class Scene(ABC):
         """Render scene ke screen"""
         pass
     
+    def shutdown(self):
+        """Dipanggil engine saat game ditutup (mis. simpan data yang belum tersimpan)"""
+        pass
+    
     def get_state(self) -> Optional[Dict[str, Any]]:
         """Mendapatkan state dari scene"""
         return self.state
@@ -0,0 +1,55 @@
+"""
+Scene Loader - Menyiapkan scene berikutnya di worker thread sementara scene aktif tetap berjalan
+"""
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Dict
+
+from game_engine.state_store import StateStore
+
+
+class SceneLoader:
+    """Loader yang menjalankan Scene.prepare() di background thread"""
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scene-loader")
+        self.pending: Dict[str, Future] = {}
+        self.scenes: Dict[str, Any] = {}
+
+    def preload(self, scene: Any, game_state: StateStore) -> bool:
+        """Mulai prepare scene di background (no-op jika sudah siap / sedang dimuat)"""
+        if scene.name in self.pending or scene.prepared is not None:
+            return False
+        # Deep copy state supaya worker tidak ikut membaca container (mis. inventory) yang diubah main thread
+        snapshot = game_state.snapshot()
+        self.scenes[scene.name] = scene
+        self.pending[scene.name] = self._executor.submit(scene.prepare, snapshot)
+        return True
+
+    def poll(self):
+        """Pindahkan hasil prepare yang sudah selesai ke scene (dipanggil dari main thread)"""
+        for name in [name for name, future in self.pending.items() if future.done()]:
+            future = self.pending.pop(name)
+            scene = self.scenes.pop(name)
+            error = future.exception()
+            if error is not None:
+                # Scene akan di-prepare ulang secara sinkron saat setup
+                print(f"Gagal preload scene '{name}': {error}")
+                continue
+            scene.prepared = future.result()
+
+    def wait(self, name: str):
+        """Blok sampai prepare scene selesai lalu pindahkan hasilnya ke scene"""
+        future = self.pending.get(name)
+        if future is not None:
+            wait([future])
+        self.poll()
+
+    def is_loading(self, name: str) -> bool:
+        """Apakah scene masih disiapkan di background"""
+        return name in self.pending
+
+    def shutdown(self):
+        """Hentikan worker thread"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.pending.clear()
+        self.scenes.clear()
@@ -0,0 +1,91 @@
+"""
+State Store - Game state dengan versi per key, dirty tracking dan subscription perubahan
+"""
+import copy
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Callback subscriber menerima set key yang berubah sejak flush sebelumnya
+ChangeCallback = Callable[[Set[str]], None]
+
+
+class StateStore(MutableMapping):
+    """Game state bersama untuk engine dan semua scene (pengganti dict yang di-copy/merge)"""
+
+    def __init__(self, initial: Optional[Dict[str, Any]] = None):
+        self._data: Dict[str, Any] = {}
+        self._versions: Dict[str, int] = {}
+        self._dirty: Set[str] = set()
+        self._subscribers: List[Tuple[Optional[frozenset], ChangeCallback]] = []
+        self.version = 0
+        if initial:
+            self.update(initial)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __setitem__(self, key: str, value: Any):
+        self.set(key, value)
+
+    def __delitem__(self, key: str):
+        del self._data[key]
+        self.touch(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"StateStore(version={self.version}, {self._data!r})"
+
+    def set(self, key: str, value: Any) -> bool:
+        """Set value; return True jika value benar-benar berubah"""
+        if key in self._data and self._data[key] == value:
+            return False
+        # Container di-copy supaya store tidak berbagi referensi dengan pemanggil
+        if isinstance(value, (dict, list, set)):
+            value = copy.deepcopy(value)
+        self._data[key] = value
+        self.touch(key)
+        return True
+
+    def touch(self, key: str):
+        """Tandai key berubah (mis. setelah mutasi in-place pada dict/list nested)"""
+        self.version += 1
+        self._versions[key] = self.version
+        self._dirty.add(key)
+
+    def version_of(self, key: str) -> int:
+        """Versi terakhir key (0 jika belum pernah di-set)"""
+        return self._versions.get(key, 0)
+
+    def changed_since(self, version: int) -> Set[str]:
+        """Key yang berubah setelah versi tertentu"""
+        return {key for key, key_version in self._versions.items() if key_version > version}
+
+    def subscribe(self, keys: Optional[Iterable[str]], callback: ChangeCallback) -> Callable[[], None]:
+        """Daftarkan callback untuk key tertentu (None = semua key). Return fungsi unsubscribe"""
+        entry = (frozenset(keys) if keys is not None else None, callback)
+        self._subscribers.append(entry)
+
+        def unsubscribe():
+            if entry in self._subscribers:
+                self._subscribers.remove(entry)
+        return unsubscribe
+
+    def flush(self) -> Set[str]:
+        """Kirim key yang berubah ke subscriber (dipanggil engine sekali per tick)"""
+        if not self._dirty:
+            return set()
+        changed, self._dirty = self._dirty, set()
+        for keys, callback in list(self._subscribers):
+            relevant = changed if keys is None else changed & keys
+            if relevant:
+                callback(relevant)
+        return changed
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Deep copy seluruh state sebagai dict biasa"""
+        return copy.deepcopy(self._data)
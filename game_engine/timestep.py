@@ -0,0 +1,40 @@
+"""
+Fixed Timestep - Accumulator untuk simulasi dengan tick rate tetap
+"""
+
+
+class FixedTimestep:
+    """Accumulator untuk menjalankan simulasi dengan langkah waktu tetap"""
+
+    def __init__(self, tick_rate: int = 60, max_catchup_steps: int = 5):
+        self.tick_rate = tick_rate
+        self.step = 1.0 / tick_rate
+        self.max_catchup_steps = max_catchup_steps
+        self.accumulator = 0.0
+
+    def advance(self, frame_time: float) -> int:
+        """Tambahkan waktu frame dan kembalikan jumlah langkah simulasi yang harus dijalankan"""
+        self.accumulator += frame_time
+        steps = int(self.accumulator // self.step)
+
+        if steps > self.max_catchup_steps:
+            # Terlalu tertinggal (hitch) - buang sisa waktu supaya tidak spiral of death
+            steps = self.max_catchup_steps
+            self.accumulator = self.step * steps + (self.accumulator % self.step)
+
+        self.accumulator -= steps * self.step
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """Faktor interpolasi render antara state simulasi sebelumnya dan sekarang"""
+        return self.accumulator / self.step
+
+    def reset(self):
+        """Reset accumulator"""
+        self.accumulator = 0.0
+
+
+def lerp(previous: float, current: float, alpha: float) -> float:
+    """Interpolasi linear antara dua nilai"""
+    return previous + (current - previous) * alpha
@@ -1,6 +1,7 @@
 """
 Main Game File - Jalankan game Spice Trader 1400
 """
+import argparse
 import sys
 import os
 
@@ -8,12 +9,28 @@ import os
 sys.path.append(os.path.dirname(__file__))
 
 from game_engine.core import GameEngine
+from game_engine.replay import InputRecorder, ReplayInput
 from scenes.ship.ship_scene import ShipScene
 from scenes.harbor.harbor_scene import HarborScene
-from utils.constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from utils.constants import SCREEN_WIDTH, SCREEN_HEIGHT, ARMADA_DEFAULT_SIZE
 
 def main():
     """Main function untuk menjalankan game"""
+    parser = argparse.ArgumentParser(description="Spice Trader 1400 - Prototype Demo")
+    parser.add_argument("--record", metavar="FILE", help="Rekam input ke file replay")
+    parser.add_argument("--replay", metavar="FILE", help="Putar ulang file replay")
+    parser.add_argument("--armada", type=int, nargs="?", const=ARMADA_DEFAULT_SIZE, default=0, metavar="N",
+                        help=f"Armada mode dengan N enemy ship (default {ARMADA_DEFAULT_SIZE})")
+    parser.add_argument("--max-fps", type=int, default=120, metavar="N",
+                        help="Batas FPS render (default 120, 0 = tanpa batas; simulasi tetap 60 tick/detik)")
+    parser.add_argument("--api", metavar="URL", nargs="?", const="http://localhost:5000", default=None,
+                        help="Sinkronkan game state ke Flask API (default http://localhost:5000)")
+    args = parser.parse_args()
+    
+    # Replay dibuka lebih awal karena ukuran armada ikut tercatat di meta
+    replay = ReplayInput(args.replay) if args.replay else None
+    armada_size = replay.meta.get('armada', 0) if replay else args.armada
+    
     print("=" * 50)
     print("Spice Trader 1400 - Prototype Demo")
     print("=" * 50)
@@ -26,16 +43,33 @@ def main():
     engine = GameEngine(
         width=SCREEN_WIDTH,
         height=SCREEN_HEIGHT,
-        title="Spice Trader 1400 - Prototype Demo"
+        title="Spice Trader 1400 - Prototype Demo",
+        max_fps=args.max_fps
     )
     
     # Register scenes
-    ship_scene = ShipScene()
+    ship_scene = ShipScene(armada_size=armada_size)
     harbor_scene = HarborScene()
     
     engine.register_scene("ship", ship_scene)
     engine.register_scene("harbor", harbor_scene)
     
+    # Replay / record dipasang sebelum scene di-setup supaya seed RNG ikut tercatat
+    if replay:
+        engine.game_state.update(replay.meta.get('state', {}))
+        engine.set_input(replay)
+        print(f"Memutar replay: {args.replay}")
+    elif args.record:
+        meta = {'state': {key: engine.game_state[key] for key in ('player_id', 'current_scene')},
+                'armada': armada_size}
+        engine.set_input(InputRecorder(engine.input, args.record, meta))
+        print(f"Merekam input ke: {args.record}")
+    
+    if args.api:
+        from utils.api_client import APIClient
+        engine.set_api_client(APIClient(args.api))
+        print(f"Sinkronisasi state ke API: {args.api}")
+    
     # Start dengan ship scene
     initial_scene = engine.game_state.get('current_scene', 'ship')
     engine.change_scene(initial_scene)
@@ -43,7 +77,7 @@ def main():
     print(f"Memulai game dengan scene: {initial_scene}")
     print("Kontrol:")
     print("  - Ship Scene: WASD untuk bergerak, Z untuk menembak cannonball")
-    print("  - Harbor Scene: WASD untuk bergerak, E untuk berinteraksi")
+    print("  - Harbor Scene: WASD untuk bergerak, E untuk berinteraksi, B untuk berlayar")
     print("  - ESC untuk keluar")
     print()
     
@@ -6,31 +6,61 @@ import pygame
 import math
 import sys
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from game_engine.scene import Scene
+from game_engine.timestep import lerp
+from game_engine.profiler import profiler
+from game_engine.render_queue import RenderQueue, LAYER_LABELS
 from utils.constants import *
 from utils.ui_button import Button, ButtonManager
 from utils.database import db
 from utils.icons import IconRenderer
 from utils.inventory_display import InventoryCart
+from utils.dialog_panel import DialogPanel
 from utils.ocean_effects import OceanRenderer
 from utils.minimap import Minimap
+from utils.grid_index import GridIndex
+from utils.world_chunks import ChunkedBackground
+from utils.harbor_map import ChunkData, ChunkKey, ChunkStreamer, HarborMap, harbor_map_path
+from utils.fog_of_war import ExplorationMap
+from utils.text_cache import text_cache
+from utils.surfaces import colorkey_surface
+
+# Jarak maksimum player ke NPC untuk interaksi
+NPC_INTERACTION_RANGE = 50
+# Sel spatial index NPC/building, dan margin culling (index menyimpan titik tengah, sprite + label lebih besar)
+HARBOR_INDEX_CELL_SIZE = 128
+RENDER_CULL_MARGIN = 96
+# Padding sprite building supaya outline atap tidak terpotong
+BUILDING_SPRITE_PADDING = 2
+# Radius area yang terbuka di sekitar player (fog of war) dan interval simpan bitmap eksplorasi ke database
+EXPLORATION_REVEAL_RADIUS = 320
+EXPLORATION_SAVE_INTERVAL = 5.0
 
 class Player:
     """Player character untuk harbor exploration"""
-    def __init__(self, x: float, y: float):
+    def __init__(self, x: float, y: float, world_width: int = HARBOR_WORLD_WIDTH,
+                 world_height: int = HARBOR_WORLD_HEIGHT):
         self.x = x
         self.y = y
+        self.world_width = world_width
+        self.world_height = world_height
         self.width = 32
         self.height = 32
         self.speed = 200
         self.rect = pygame.Rect(x, y, self.width, self.height)
+        # Posisi tick sebelumnya untuk render interpolation
+        self.prev_x = x
+        self.prev_y = y
+        self.sprite: Optional[pygame.Surface] = None
         
     def update(self, dt: float, keys: pygame.key.ScancodeWrapper):
         """Update player position"""
+        self.prev_x = self.x
+        self.prev_y = self.y
         dx, dy = 0, 0
         
         if keys[pygame.K_w] or keys[pygame.K_UP]:
@@ -46,45 +76,50 @@ class Player:
         self.y += dy
         
         # Boundary check (allow movement in larger area)
-        self.x = max(0, min(SCREEN_WIDTH * 2 - self.width, self.x))
-        self.y = max(0, min(SCREEN_HEIGHT * 2 - self.height, self.y))
+        self.x = max(0, min(self.world_width - self.width, self.x))
+        self.y = max(0, min(self.world_height - self.height, self.y))
         
         self.rect.x = int(self.x)
         self.rect.y = int(self.y)
     
-    def render(self, screen: pygame.Surface, camera_x: int, camera_y: int):
-        """Render player dengan camera offset"""
-        screen_x = self.rect.x - camera_x
-        screen_y = self.rect.y - camera_y
-        
+    @staticmethod
+    def _bake_sprite(width: int, height: int) -> pygame.Surface:
+        """Bake badan player (tanpa label)"""
+        sprite = pygame.Surface((width, height), pygame.SRCALPHA)
+        center_x = width // 2
+        center_y = height // 2
         # Draw player sebagai character dengan detail lebih baik
         # Body (circle)
-        center_x = screen_x + self.width // 2
-        center_y = screen_y + self.height // 2
-        pygame.draw.circle(screen, (100, 200, 255), (center_x, center_y), self.width // 2)
-        pygame.draw.circle(screen, (150, 220, 255), (center_x, center_y), self.width // 2 - 2)
-        pygame.draw.circle(screen, (255, 255, 255), (center_x, center_y), self.width // 2, 2)
+        pygame.draw.circle(sprite, (100, 200, 255), (center_x, center_y), width // 2)
+        pygame.draw.circle(sprite, (150, 220, 255), (center_x, center_y), width // 2 - 2)
+        pygame.draw.circle(sprite, (255, 255, 255), (center_x, center_y), width // 2, 2)
         
         # Head
-        head_y = center_y - self.height // 3
-        pygame.draw.circle(screen, (255, 220, 177), (center_x, head_y), 6)
+        head_y = center_y - height // 3
+        pygame.draw.circle(sprite, (255, 220, 177), (center_x, head_y), 6)
         
         # Simple body indicator
-        pygame.draw.rect(screen, (50, 150, 200), 
-                        (center_x - 4, center_y - 2, 8, 10))
-        
-        # Draw player label dengan background
-        font = pygame.font.Font(None, 14)
-        text = font.render("PLAYER", True, (255, 255, 255))
-        text_rect = text.get_rect(center=(center_x, screen_y - 12))
-        bg_rect = pygame.Rect(text_rect.x - 4, text_rect.y - 2, text_rect.width + 8, text_rect.height + 4)
-        overlay = pygame.Surface((bg_rect.width, bg_rect.height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))
-        screen.blit(overlay, bg_rect)
-        screen.blit(text, text_rect)
+        pygame.draw.rect(sprite, (50, 150, 200), (center_x - 4, center_y - 2, 8, 10))
+        return colorkey_surface(sprite)
+    
+    def submit(self, queue: RenderQueue, alpha: float = 1.0):
+        """Submit sprite player dan label ke render queue (koordinat world)"""
+        if self.sprite is None:
+            self.sprite = self._bake_sprite(self.width, self.height)
+        world_x = int(lerp(self.prev_x, self.x, alpha))
+        world_y = int(lerp(self.prev_y, self.y, alpha))
+        queue.submit(self.sprite, world_x, world_y)
+        
+        # Label dengan background
+        label = text_cache.render_label("PLAYER", 14, (255, 255, 255), (0, 0, 0, 150))
+        label_rect = label.get_rect(center=(world_x + self.width // 2, world_y - 12))
+        queue.submit(label, label_rect.x, label_rect.y, LAYER_LABELS)
 
 class NPC:
     """NPC untuk interaction"""
+    # Sprite per (tipe, ukuran) dan indicator, dipakai bersama semua NPC
+    _sprites: Dict[Any, pygame.Surface] = {}
+    
     def __init__(self, x: float, y: float, name: str, npc_type: str = "merchant"):
         self.x = x
         self.y = y
@@ -93,7 +128,7 @@ class NPC:
         self.name = name
         self.npc_type = npc_type  # "merchant", "restaurant", "story"
         self.rect = pygame.Rect(x, y, self.width, self.height)
-        self.interaction_range = 50
+        self.interaction_range = NPC_INTERACTION_RANGE
         self.dialog_active = False
         
     def can_interact(self, player: Player) -> bool:
@@ -103,16 +138,19 @@ class NPC:
         distance = math.sqrt(dx*dx + dy*dy)
         return distance <= self.interaction_range
     
-    def render(self, screen: pygame.Surface, camera_x: int, camera_y: int):
-        """Render NPC dengan camera offset"""
-        screen_x = self.rect.x - camera_x
-        screen_y = self.rect.y - camera_y
+    @classmethod
+    def sprite(cls, npc_type: str, width: int, height: int) -> pygame.Surface:
+        """Sprite badan + icon per tipe NPC (di-bake sekali)"""
+        key = (npc_type, width, height)
+        sprite = cls._sprites.get(key)
+        if sprite is not None:
+            return sprite
         
         # Color berdasarkan type
-        if self.npc_type == "merchant":
+        if npc_type == "merchant":
             color = (255, 200, 100)
             icon = "🛒"
-        elif self.npc_type == "restaurant":
+        elif npc_type == "restaurant":
             color = (255, 100, 100)
             icon = "🍜"
         else:
@@ -120,39 +158,52 @@ class NPC:
             icon = "📖"
         
         # NPC body (circle dengan detail)
-        center_x = screen_x + self.width // 2
-        center_y = screen_y + self.height // 2
-        pygame.draw.circle(screen, color, (center_x, center_y), self.width // 2)
-        pygame.draw.circle(screen, tuple(min(255, c + 30) for c in color), (center_x, center_y), self.width // 2 - 2)
-        pygame.draw.circle(screen, (255, 255, 255), (center_x, center_y), self.width // 2, 2)
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        center = (width // 2, height // 2)
+        pygame.draw.circle(surface, color, center, width // 2)
+        pygame.draw.circle(surface, tuple(min(255, c + 30) for c in color), center, width // 2 - 2)
+        pygame.draw.circle(surface, (255, 255, 255), center, width // 2, 2)
         
         # Icon indicator
-        icon_font = pygame.font.Font(None, 20)
-        icon_text = icon_font.render(icon, True, (255, 255, 255))
-        icon_rect = icon_text.get_rect(center=(center_x, center_y))
-        screen.blit(icon_text, icon_rect)
+        icon_text = text_cache.render(icon, 20, (255, 255, 255))
+        surface.blit(icon_text, icon_text.get_rect(center=center))
+        sprite = cls._sprites[key] = colorkey_surface(surface)
+        return sprite
+    
+    @classmethod
+    def indicator_sprite(cls) -> pygame.Surface:
+        """Indicator "E" untuk interaction (di-bake sekali)"""
+        sprite = cls._sprites.get('indicator')
+        if sprite is None:
+            surface = pygame.Surface((20, 20), pygame.SRCALPHA)
+            pygame.draw.ellipse(surface, (255, 255, 0), surface.get_rect())
+            pygame.draw.ellipse(surface, (255, 255, 255), surface.get_rect(), 2)
+            indicator = text_cache.render("E", 14, (0, 0, 0))
+            surface.blit(indicator, indicator.get_rect(center=(10, 10)))
+            sprite = cls._sprites['indicator'] = colorkey_surface(surface)
+        return sprite
+    
+    def submit(self, queue: RenderQueue):
+        """Submit sprite NPC, nama dan indicator interaction ke render queue (koordinat world)"""
+        world_x = self.rect.x
+        world_y = self.rect.y
+        queue.submit(self.sprite(self.npc_type, self.width, self.height), world_x, world_y)
+        center_x = world_x + self.width // 2
         
         # Draw name dengan background
-        font = pygame.font.Font(None, 14)
-        text = font.render(self.name, True, (255, 255, 255))
-        text_rect = text.get_rect(center=(center_x, screen_y - 15))
-        bg_rect = pygame.Rect(text_rect.x - 4, text_rect.y - 2, text_rect.width + 8, text_rect.height + 4)
-        overlay = pygame.Surface((bg_rect.width, bg_rect.height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        screen.blit(overlay, bg_rect)
-        screen.blit(text, text_rect)
-        
-        # Draw interaction indicator dengan animasi
+        label = text_cache.render_label(self.name, 14, (255, 255, 255), (0, 0, 0, 180))
+        label_rect = label.get_rect(center=(center_x, world_y - 15))
+        queue.submit(label, label_rect.x, label_rect.y, LAYER_LABELS)
+        
+        # Draw interaction indicator
         if self.dialog_active:
-            indicator_bg = pygame.Rect(screen_x + self.width // 2 - 10, screen_y + self.height + 5, 20, 20)
-            pygame.draw.ellipse(screen, (255, 255, 0, 200), indicator_bg)
-            pygame.draw.ellipse(screen, (255, 255, 255), indicator_bg, 2)
-            indicator = font.render("E", True, (0, 0, 0))
-            indicator_rect = indicator.get_rect(center=(center_x, screen_y + self.height + 15))
-            screen.blit(indicator, indicator_rect)
+            queue.submit(self.indicator_sprite(), center_x - 10, world_y + self.height + 5, LAYER_LABELS)
 
 class Building:
     """Building di harbor"""
+    # Sprite per (tipe, ukuran), dipakai bersama semua building
+    _sprites: Dict[Any, pygame.Surface] = {}
+    
     def __init__(self, x: float, y: float, width: int, height: int, building_type: str):
         self.x = x
         self.y = y
@@ -161,17 +212,20 @@ class Building:
         self.building_type = building_type
         self.rect = pygame.Rect(x, y, width, height)
         
-    def render(self, screen: pygame.Surface, camera_x: int, camera_y: int):
-        """Render building dengan camera offset"""
-        screen_x = self.rect.x - camera_x
-        screen_y = self.rect.y - camera_y
+    @classmethod
+    def sprite(cls, building_type: str, width: int, height: int) -> pygame.Surface:
+        """Sprite building (badan + atap, tanpa label) per (tipe, ukuran); origin = (x - pad, y - atap - pad)"""
+        key = (building_type, width, height)
+        sprite = cls._sprites.get(key)
+        if sprite is not None:
+            return sprite
         
         # Color berdasarkan type dengan gradient
-        if self.building_type == "shop":
+        if building_type == "shop":
             base_color = (100, 150, 200)
             roof_color = (80, 120, 160)
             window_color = (255, 255, 200)
-        elif self.building_type == "restaurant":
+        elif building_type == "restaurant":
             base_color = (200, 100, 100)
             roof_color = (160, 80, 80)
             window_color = (255, 200, 200)
@@ -180,51 +234,55 @@ class Building:
             roof_color = (120, 120, 120)
             window_color = (200, 200, 200)
         
-        building_rect = pygame.Rect(screen_x, screen_y, self.width, self.height)
+        pad = BUILDING_SPRITE_PADDING
+        roof_height = height // 4
+        surface = pygame.Surface((width + pad * 2, height + roof_height + pad * 2), pygame.SRCALPHA)
+        x = pad
+        y = pad + roof_height
+        building_rect = pygame.Rect(x, y, width, height)
         
         # Building base
-        pygame.draw.rect(screen, base_color, building_rect)
-        pygame.draw.rect(screen, tuple(max(0, c - 20) for c in base_color), 
-                        (screen_x, screen_y, self.width, self.height // 2))
+        pygame.draw.rect(surface, base_color, building_rect)
+        pygame.draw.rect(surface, tuple(max(0, c - 20) for c in base_color), (x, y, width, height // 2))
         
         # Roof (triangle)
         roof_points = [
-            (screen_x, screen_y),
-            (screen_x + self.width // 2, screen_y - self.height // 4),
-            (screen_x + self.width, screen_y)
+            (x, y),
+            (x + width // 2, y - roof_height),
+            (x + width, y)
         ]
-        pygame.draw.polygon(screen, roof_color, roof_points)
-        pygame.draw.polygon(screen, tuple(max(0, c - 30) for c in roof_color), roof_points, 2)
+        pygame.draw.polygon(surface, roof_color, roof_points)
+        pygame.draw.polygon(surface, tuple(max(0, c - 30) for c in roof_color), roof_points, 2)
         
         # Windows
         window_size = 12
-        window1_rect = pygame.Rect(screen_x + self.width // 4 - window_size // 2, 
-                                  screen_y + self.height // 3, window_size, window_size)
-        window2_rect = pygame.Rect(screen_x + 3 * self.width // 4 - window_size // 2,
-                                  screen_y + self.height // 3, window_size, window_size)
-        pygame.draw.rect(screen, window_color, window1_rect)
-        pygame.draw.rect(screen, window_color, window2_rect)
-        pygame.draw.rect(screen, (0, 0, 0), window1_rect, 2)
-        pygame.draw.rect(screen, (0, 0, 0), window2_rect, 2)
+        window1_rect = pygame.Rect(x + width // 4 - window_size // 2, y + height // 3, window_size, window_size)
+        window2_rect = pygame.Rect(x + 3 * width // 4 - window_size // 2, y + height // 3, window_size, window_size)
+        pygame.draw.rect(surface, window_color, window1_rect)
+        pygame.draw.rect(surface, window_color, window2_rect)
+        pygame.draw.rect(surface, (0, 0, 0), window1_rect, 2)
+        pygame.draw.rect(surface, (0, 0, 0), window2_rect, 2)
         
         # Door
-        door_rect = pygame.Rect(screen_x + self.width // 2 - 8, 
-                               screen_y + self.height - 20, 16, 20)
-        pygame.draw.rect(screen, (101, 67, 33), door_rect)
-        pygame.draw.rect(screen, (0, 0, 0), door_rect, 2)
+        door_rect = pygame.Rect(x + width // 2 - 8, y + height - 20, 16, 20)
+        pygame.draw.rect(surface, (101, 67, 33), door_rect)
+        pygame.draw.rect(surface, (0, 0, 0), door_rect, 2)
         
         # Border
-        pygame.draw.rect(screen, (255, 255, 255), building_rect, 2)
+        pygame.draw.rect(surface, (255, 255, 255), building_rect, 2)
+        sprite = cls._sprites[key] = colorkey_surface(surface)
+        return sprite
+    
+    def submit(self, queue: RenderQueue):
+        """Submit sprite building dan label ke render queue; y-sort berdasarkan sisi bawah building"""
+        sprite = self.sprite(self.building_type, self.width, self.height)
+        pad = BUILDING_SPRITE_PADDING
+        queue.submit(sprite, self.rect.x - pad, self.rect.y - self.height // 4 - pad, sort_y=self.rect.bottom)
         
         # Draw label dengan background
-        font = pygame.font.Font(None, 14)
-        text = font.render(self.building_type.upper(), True, (255, 255, 255))
-        text_rect = text.get_rect(center=(screen_x + self.width // 2, screen_y + self.height + 15))
-        bg_rect = pygame.Rect(text_rect.x - 4, text_rect.y - 2, text_rect.width + 8, text_rect.height + 4)
-        overlay = pygame.Surface((bg_rect.width, bg_rect.height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        screen.blit(overlay, bg_rect)
-        screen.blit(text, text_rect)
+        label = text_cache.render_label(self.building_type.upper(), 14, (255, 255, 255), (0, 0, 0, 180))
+        label_rect = label.get_rect(center=(self.rect.x + self.width // 2, self.rect.y + self.height + 15))
+        queue.submit(label, label_rect.x, label_rect.y, LAYER_LABELS)
 
 class HarborScene(Scene):
     """Scene untuk gameplay di pelabuhan"""
@@ -236,12 +294,12 @@ class HarborScene(Scene):
         self.buildings: List[Building] = []
         self.camera_x = 0
         self.camera_y = 0
+        self.prev_camera_x = 0
+        self.prev_camera_y = 0
         self.current_npc: Optional[NPC] = None
         self.show_dialog = False
         self.show_shop = False
         self.show_restaurant = False
-        self.font = pygame.font.Font(None, 24)
-        self.small_font = pygame.font.Font(None, 18)
         self.button_manager = ButtonManager()
         self.mouse_pos = (0, 0)
         self.mouse_clicked = False
@@ -251,6 +309,64 @@ class HarborScene(Scene):
         self.show_inventory = False
         self.harbor_effects = None  # Untuk efek visual harbor
         self.minimap = Minimap(SCREEN_WIDTH - 220, SCREEN_HEIGHT - 170, 200, 150)
+        self.world_width = HARBOR_WORLD_WIDTH
+        self.world_height = HARBOR_WORLD_HEIGHT
+        self.background: Optional[ChunkedBackground] = None
+        # Peta harbor aktif (data/harbors/*.map); NPC dan building di-stream per chunk di sekitar kamera
+        self.harbor_name: Optional[str] = None
+        self.harbor_map: Optional[HarborMap] = None
+        self.streamer: Optional[ChunkStreamer] = None
+        self._chunk_entities: Dict[ChunkKey, Tuple[List[NPC], List[Building]]] = {}
+        # Bitmap eksplorasi harbor aktif (fog of war minimap), disimpan per player di database
+        self.exploration: Optional[ExplorationMap] = None
+        self._exploration_owner: Optional[str] = None
+        self._exploration_timer = 0.0
+        self.set_sail = False
+        # Panel HUD di-bake ulang hanya saat koin / NPC terdekat berubah
+        self._hud_panel: Optional[pygame.Surface] = None
+        self._hud_key = None
+        # Index titik tengah NPC dan building: interaksi, culling render dan marker minimap
+        self.spatial_index = GridIndex(HARBOR_INDEX_CELL_SIZE)
+        self._interacting: List[NPC] = []
+        self.render_queue = RenderQueue()
+        # Panel dialog retained-mode (shop / restaurant / story), dibuat saat pertama dibuka
+        self._panels: Dict[str, DialogPanel] = {}
+        
+    def prepare(self, game_state: Dict[str, Any]) -> Dict[str, Any]:
+        """Load data database, buka peta harbor dan bake background awal (bisa di worker thread)"""
+        player_id = game_state.get('player_id', 'default')
+        harbor = game_state.get('current_harbor', ISLANDS[0]['harbor'])
+        prepared = {
+            'player_id': player_id,
+            'harbor': harbor,
+            'inventory': db.get_inventory_spices(player_id),
+            'tried_foods': db.get_tried_foods(player_id),
+            'harbor_map': self.harbor_map,
+            'background': self.background
+        }
+        
+        # Peta dan background dipakai ulang jika kembali ke harbor yang sama
+        if harbor != self.harbor_name or self.harbor_map is None:
+            harbor_map = HarborMap(harbor_map_path(harbor))
+            # Background statis di-bake per chunk (lazy), chunk di sekitar spawn langsung di sini
+            background = ChunkedBackground(harbor_map.world_width, harbor_map.world_height,
+                                           self._paint_background, HARBOR_CHUNK_SIZE)
+            background.prebake(self._camera_view(harbor_map.spawn_x, harbor_map.spawn_y,
+                                                 harbor_map.world_width, harbor_map.world_height))
+            prepared['harbor_map'] = harbor_map
+            prepared['background'] = background
+        
+        # Bitmap eksplorasi di memori selalu paling baru; database hanya dibaca untuk harbor / player lain
+        if harbor == self.harbor_name and player_id == self._exploration_owner and self.exploration:
+            prepared['exploration'] = self.exploration
+        else:
+            harbor_map = prepared['harbor_map']
+            exploration = ExplorationMap(harbor_map.world_width, harbor_map.world_height)
+            saved = db.get_exploration(player_id, harbor)
+            if saved:
+                exploration.load(saved['data'], saved['cols'], saved['rows'], saved['cell_size'])
+            prepared['exploration'] = exploration
+        return prepared
         
     def setup(self, game_state: Dict[str, Any]):
         """Setup harbor scene"""
@@ -259,49 +375,75 @@ class HarborScene(Scene):
         # Get player_id from state
         self.player_id = game_state.get('player_id', 'default')
         
+        prepared = self.take_prepared(game_state)
+        if (prepared['player_id'] != self.player_id or
+                prepared['harbor'] != game_state.get('current_harbor', ISLANDS[0]['harbor'])):
+            # Data di-preload untuk player / harbor lain
+            if prepared['harbor_map'] is not self.harbor_map:
+                prepared['harbor_map'].close()
+                prepared['background'].shutdown()
+            prepared = self.prepare(game_state)
+        if prepared['exploration'] is not self.exploration:
+            # Simpan eksplorasi harbor sebelumnya sebelum harbor_name berganti
+            self._save_exploration()
+            self.exploration = prepared['exploration']
+            self._exploration_owner = self.player_id
+            self.minimap.set_fog(self.exploration)
+        self._exploration_timer = 0.0
+        self.set_sail = False
+        self._enter_harbor(prepared['harbor'], prepared['harbor_map'], prepared['background'])
+        
+        # Tandai pulau harbor ini sudah dikunjungi (menentukan tujuan berlayar berikutnya)
+        if self.state:
+            visited = self.state.get('visited_islands', [])
+            for island in ISLANDS:
+                if island['harbor'] == self.harbor_name and island['name'] not in visited:
+                    self.state['visited_islands'] = visited + [island['name']]
+        
         # Load inventory from database
         if self.state:
-            db_inventory = db.get_inventory_spices(self.player_id)
+            db_inventory = prepared['inventory']
             if db_inventory:
                 if 'inventory' not in self.state:
                     self.state['inventory'] = {'spices': {}}
                 self.state['inventory']['spices'].update(db_inventory)
+                self.state.touch('inventory')
             
-            db_foods = db.get_tried_foods(self.player_id)
+            db_foods = prepared['tried_foods']
             if db_foods:
                 self.state['tried_foods'] = db_foods
         
-        # Initialize player
-        self.player = Player(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+        # Initialize player di titik spawn peta
+        harbor_map = self.harbor_map
+        self.player = Player(harbor_map.spawn_x, harbor_map.spawn_y, self.world_width, self.world_height)
         
         # Initialize harbor effects (optional ocean view in background)
         # self.harbor_effects = OceanRenderer(SCREEN_WIDTH, SCREEN_HEIGHT)
         
-        # Initialize NPCs
-        self.npcs = [
-            NPC(200, 200, "Pedagang Rempah", "merchant"),
-            NPC(500, 300, "Warung Makan", "restaurant"),
-            NPC(800, 400, "Elderman", "story"),
-            NPC(300, 600, "Pedagang Rempah 2", "merchant"),
-            NPC(600, 500, "Restoran Tradisional", "restaurant")
-        ]
-        
-        # Initialize buildings
-        self.buildings = [
-            Building(150, 150, 80, 80, "shop"),
-            Building(450, 250, 80, 80, "restaurant"),
-            Building(750, 350, 80, 80, "shop"),
-            Building(250, 550, 80, 80, "restaurant"),
-            Building(550, 450, 80, 80, "shop")
-        ]
-        
-        # Reset camera
-        self.camera_x = 0
-        self.camera_y = 0
+        # Reset camera ke sekitar spawn
+        view = self._camera_view(self.player.rect.centerx, self.player.rect.centery,
+                                 self.world_width, self.world_height)
+        self.camera_x = view.x
+        self.camera_y = view.y
+        self.prev_camera_x = view.x
+        self.prev_camera_y = view.y
+        
+        # NPC dan building di-stream dari peta: hanya chunk di sekitar kamera yang dimuat
+        self.spatial_index.clear()
+        self._interacting = []
+        self._chunk_entities = {}
+        self.npcs = []
+        self.buildings = []
+        self.streamer = ChunkStreamer(harbor_map, HARBOR_STREAM_LOAD_MARGIN, HARBOR_STREAM_EVICT_MARGIN,
+                                      self._load_chunk, self._evict_chunk)
+        self._stream_chunks(view)
+        self._explore()
         self.current_npc = None
         self.show_dialog = False
         self.show_shop = False
         self.show_restaurant = False
+        for panel in self._panels.values():
+            panel.invalidate()
         
     def handle_event(self, event: pygame.event.Event):
         """Handle events"""
@@ -322,6 +464,9 @@ class HarborScene(Scene):
                 # Toggle inventory cart
                 self.show_inventory = not self.show_inventory
                 self.inventory_cart.visible = self.show_inventory
+            elif event.key == pygame.K_b and not (self.show_dialog or self.show_shop or self.show_restaurant):
+                # Berlayar lagi: ship scene, kemenangan berikutnya menuju pulau lain
+                self.set_sail = True
             elif event.key == pygame.K_e:
                 # Interact with NPC
                 if self.current_npc:
@@ -343,131 +488,260 @@ class HarborScene(Scene):
         self.button_manager.update(dt, self.mouse_pos, self.mouse_clicked)
         self.mouse_clicked = False  # Reset setelah update
         
-        keys = pygame.key.get_pressed()
+        if self.set_sail:
+            self.set_sail = False
+            if self.state:
+                self.state['current_scene'] = 'ship'
+                return  # Engine mendeteksi perubahan current_scene setelah update
+        
+        keys = self.input.get_pressed()
         
         # Update player
         if self.player:
-            self.player.update(dt, keys)
+            with profiler.section("player"):
+                self.player.update(dt, keys)
             
             # Update camera to follow player
+            self.prev_camera_x = self.camera_x
+            self.prev_camera_y = self.camera_y
             self.camera_x = self.player.rect.centerx - SCREEN_WIDTH // 2
             self.camera_y = self.player.rect.centery - SCREEN_HEIGHT // 2
             
             # Clamp camera
-            self.camera_x = max(0, min(SCREEN_WIDTH * 2 - SCREEN_WIDTH, self.camera_x))
-            self.camera_y = max(0, min(SCREEN_HEIGHT * 2 - SCREEN_HEIGHT, self.camera_y))
+            self.camera_x = max(0, min(self.world_width - SCREEN_WIDTH, self.camera_x))
+            self.camera_y = max(0, min(self.world_height - SCREEN_HEIGHT, self.camera_y))
+            
+            with profiler.section("streaming"):
+                self._stream_chunks(pygame.Rect(self.camera_x, self.camera_y, SCREEN_WIDTH, SCREEN_HEIGHT))
             
-            # Update state
+            with profiler.section("exploration"):
+                self._explore()
+                self._exploration_timer += dt
+                if self._exploration_timer >= EXPLORATION_SAVE_INTERVAL:
+                    self._save_exploration()
+            
+            # Update state (disimpan ke database oleh StatePersister saat berubah)
             if self.state:
                 self.state['harbor_position'] = {'x': self.player.x, 'y': self.player.y}
-                # Save game state to database periodically
-                db.save_game_state(self.player_id, self.state)
         
-        # Check NPC interactions
-        self.current_npc = None
-        for npc in self.npcs:
-            if npc.can_interact(self.player):
-                self.current_npc = npc
-                npc.dialog_active = True
-            else:
+        # Check NPC interactions: hanya NPC di sekitar player (terdekat menjadi current_npc)
+        with profiler.section("npcs"):
+            for npc in self._interacting:
                 npc.dialog_active = False
+            center_x, center_y = self.player.rect.center
+            candidates = self.spatial_index.query_radius(center_x, center_y, NPC_INTERACTION_RANGE, 'npc')
+            self._interacting = [npc for npc in candidates if npc.can_interact(self.player)]
+            for npc in self._interacting:
+                npc.dialog_active = True
+            self.current_npc = self._interacting[0] if self._interacting else None
+    
+    @staticmethod
+    def _camera_view(center_x: float, center_y: float, world_width: int, world_height: int) -> pygame.Rect:
+        """Viewport kamera (rect world) yang berpusat di titik, dijepit ke batas world"""
+        x = max(0, min(world_width - SCREEN_WIDTH, int(center_x) - SCREEN_WIDTH // 2))
+        y = max(0, min(world_height - SCREEN_HEIGHT, int(center_y) - SCREEN_HEIGHT // 2))
+        return pygame.Rect(x, y, SCREEN_WIDTH, SCREEN_HEIGHT)
+    
+    def _enter_harbor(self, harbor: str, harbor_map: HarborMap, background: ChunkedBackground):
+        """Aktifkan peta harbor; peta dan background harbor sebelumnya ditutup jika berbeda"""
+        changed = harbor_map is not self.harbor_map
+        if changed:
+            if self.harbor_map is not None:
+                self.harbor_map.close()
+            if self.background is not None:
+                self.background.shutdown()
+        self.harbor_name = harbor
+        self.harbor_map = harbor_map
+        self.background = background
+        self.world_width = harbor_map.world_width
+        self.world_height = harbor_map.world_height
+        if changed:
+            # Layer statis minimap memuat semua building di peta, bukan hanya chunk yang sedang dimuat
+            self.minimap.set_world(self.world_width, self.world_height, harbor_map.buildings(), SCREEN_HEIGHT // 2)
+    
+    def _stream_chunks(self, view: pygame.Rect):
+        """Muat chunk peta di sekitar view dan buang yang jauh (termasuk chunk background)"""
+        # Chunk background di sekitar view mulai di-bake sebelum terlihat (tanpa placeholder saat scroll)
+        margin = HARBOR_STREAM_LOAD_MARGIN
+        self.background.prefetch(view.inflate(margin * 2, margin * 2))
+        if not self.streamer.update(view.left, view.top, view.right, view.bottom):
+            return
+        # Urutan list mengikuti urutan chunk dimuat supaya update AI tetap deterministik
+        self.npcs = [npc for npcs, _ in self._chunk_entities.values() for npc in npcs]
+        self.buildings = [building for _, buildings in self._chunk_entities.values() for building in buildings]
+        margin = HARBOR_STREAM_EVICT_MARGIN
+        self.background.evict_outside(view.inflate(margin * 2, margin * 2))
+    
+    def _explore(self):
+        """Buka fog di sekitar player; mask minimap hanya di-update di sel yang baru terbuka"""
+        center_x, center_y = self.player.rect.center
+        cols, rows = self.exploration.reveal(center_x, center_y, EXPLORATION_REVEAL_RADIUS)
+        if len(cols):
+            self.minimap.reveal_cells(cols, rows)
+    
+    def _save_exploration(self):
+        """Simpan bitmap eksplorasi ke database jika ada sel baru sejak simpan terakhir"""
+        self._exploration_timer = 0.0
+        exploration = self.exploration
+        if exploration is None or not exploration.dirty:
+            return
+        db.save_exploration(self._exploration_owner, self.harbor_name, exploration.cell_size,
+                            exploration.cols, exploration.rows, exploration.to_bytes())
+        exploration.dirty = False
+    
+    def shutdown(self):
+        """Simpan eksplorasi yang belum tersimpan saat game ditutup"""
+        self._save_exploration()
+    
+    def _load_chunk(self, key: ChunkKey, chunk: ChunkData):
+        """Buat NPC dan building dari record chunk, daftarkan ke spatial index"""
+        npcs = [NPC(spawn.x, spawn.y, spawn.name, spawn.npc_type) for spawn in chunk.npcs]
+        for npc in npcs:
+            self.spatial_index.insert(npc, npc.rect.centerx, npc.rect.centery, 'npc', npc.npc_type)
+        buildings = [Building(spawn.x, spawn.y, spawn.width, spawn.height, spawn.building_type)
+                     for spawn in chunk.buildings]
+        for building in buildings:
+            self.spatial_index.insert(building, building.rect.centerx, building.rect.centery,
+                                      'building', building.building_type)
+        self._chunk_entities[key] = (npcs, buildings)
+    
+    def _evict_chunk(self, key: ChunkKey):
+        """Hapus NPC dan building chunk dari spatial index (chunk jauh di luar view, tidak sedang interaksi)"""
+        npcs, buildings = self._chunk_entities.pop(key)
+        for entity in npcs + buildings:
+            self.spatial_index.remove(entity)
     
     def render(self, screen: pygame.Surface):
         """Render scene"""
-        # Draw harbor background dengan gradient yang lebih menarik
+        # Camera diinterpolasi sama seperti player supaya tidak jitter
+        alpha = self.render_alpha
+        camera_x = int(lerp(self.prev_camera_x, self.camera_x, alpha))
+        camera_y = int(lerp(self.prev_camera_y, self.camera_y, alpha))
+        
+        # Draw harbor background
+        with profiler.section("background"):
+            self._render_background(screen, camera_x, camera_y)
+        
+        # Decorative elements (clouds, sun)
+        if self.harbor_effects:
+            self.harbor_effects.render(screen)
+        
+        # Entity submit sprite ke render queue (layer + y-sort); kandidat diambil dari spatial index
+        # di sekitar view, lalu queue meng-cull per sprite dan mem-blit semuanya sekaligus
+        queue = self.render_queue
+        view = pygame.Rect(camera_x, camera_y, SCREEN_WIDTH, SCREEN_HEIGHT)
+        nearby = view.inflate(RENDER_CULL_MARGIN * 2, RENDER_CULL_MARGIN * 2)
+        with profiler.section("entities"):
+            for building in self.spatial_index.query_rect(nearby, 'building'):
+                building.submit(queue)
+            for npc in self.spatial_index.query_rect(nearby, 'npc'):
+                npc.submit(queue)
+            if self.player:
+                self.player.submit(queue, alpha)
+            queue.flush(screen, camera_x, camera_y, view)
+        
+        with profiler.section("hud"):
+            self._render_hud(screen)
+        
+        # Draw minimap
+        if self.player:
+            with profiler.section("minimap"):
+                # Record [x, y, tipe] di index di-update di tempat saat NPC bergerak; versi layer index
+                # membuat minimap melewati plot marker selama tidak ada NPC yang bergerak
+                self.minimap.render(
+                    screen,
+                    (self.player.x, self.player.y),
+                    self.spatial_index.records('npc'),
+                    camera_x, camera_y,
+                    self.world_width, self.world_height,
+                    self.spatial_index.version('npc')
+                )
+        
+        # Draw dialogs
+        with profiler.section("dialogs"):
+            if self.show_shop:
+                self._render_shop_dialog(screen)
+                self.button_manager.render(screen)
+            elif self.show_restaurant:
+                self._render_restaurant_dialog(screen)
+                self.button_manager.render(screen)
+            elif self.show_dialog:
+                self._render_story_dialog(screen)
+                self.button_manager.render(screen)
+    
+    def _render_background(self, screen: pygame.Surface, camera_x: int, camera_y: int):
+        """Render background harbor (hanya chunk yang terlihat kamera)"""
+        self.background.render(screen, camera_x, camera_y)
+    
+    def _paint_background(self, surface: pygame.Surface, area: pygame.Rect):
+        """Gambar langit, ground dan grid untuk area world ke surface chunk"""
+        horizon = SCREEN_HEIGHT // 2
+        ox, oy = area.x, area.y
+        surface.fill(COLOR_OCEAN_BLUE)
+        
         # Sky gradient
-        for y in range(SCREEN_HEIGHT // 2):
-            ratio = y / (SCREEN_HEIGHT // 2)
+        for y in range(max(area.top, 0), min(area.bottom, horizon)):
+            ratio = y / horizon
             r = int(135 + (100 - 135) * ratio)
             g = int(206 + (150 - 206) * ratio)
             b = int(235 + (200 - 235) * ratio)
-            pygame.draw.line(screen, (r, g, b), (0, y), (SCREEN_WIDTH, y))
+            pygame.draw.line(surface, (r, g, b), (0, y - oy), (area.width, y - oy))
         
-        # Ground dengan texture
-        ground_rect = pygame.Rect(0, SCREEN_HEIGHT // 2, SCREEN_WIDTH * 2, SCREEN_HEIGHT * 2)
-        # Base color
-        for y in range(SCREEN_HEIGHT // 2, SCREEN_HEIGHT * 2, 2):
-            ratio = (y - SCREEN_HEIGHT // 2) / (SCREEN_HEIGHT * 1.5)
+        # Ground dengan texture (garis tiap 2 pixel)
+        first_y = max(area.top, horizon)
+        first_y += (first_y - horizon) % 2
+        for y in range(first_y, area.bottom, 2):
+            ratio = min((y - horizon) / (SCREEN_HEIGHT * 1.5), 1.0)
             r = int(139 + (100 - 139) * ratio)
             g = int(115 + (80 - 115) * ratio)
             b = int(85 + (60 - 85) * ratio)
-            pygame.draw.line(screen, (r, g, b), (0, y), (SCREEN_WIDTH * 2, y))
+            pygame.draw.line(surface, (r, g, b), (0, y - oy), (area.width, y - oy))
         
-        # Draw grid pattern untuk semi-open world effect (subtle)
-        for x in range(0, SCREEN_WIDTH * 2, 100):
+        # Grid pattern untuk semi-open world effect (subtle)
+        if area.bottom <= horizon:
+            return
+        grid_top = max(area.top, horizon)
+        for x in range(area.left + (-area.left) % 100, area.right, 100):
             color = (110, 90, 65) if (x // 100) % 2 == 0 else (120, 100, 75)
-            pygame.draw.line(screen, color, 
-                           (x - self.camera_x, SCREEN_HEIGHT // 2), 
-                           (x - self.camera_x, SCREEN_HEIGHT * 2), 1)
-        for y in range(SCREEN_HEIGHT // 2, SCREEN_HEIGHT * 2, 100):
-            color = (110, 90, 65) if ((y - SCREEN_HEIGHT // 2) // 100) % 2 == 0 else (120, 100, 75)
-            pygame.draw.line(screen, color, 
-                           (0, y - self.camera_y), 
-                           (SCREEN_WIDTH * 2, y - self.camera_y), 1)
-        
-        # Decorative elements (clouds, sun)
-        if self.harbor_effects:
-            self.harbor_effects.render(screen)
-        
-        # Draw buildings
-        for building in self.buildings:
-            building.render(screen, self.camera_x, self.camera_y)
-        
-        # Draw NPCs
-        for npc in self.npcs:
-            npc.render(screen, self.camera_x, self.camera_y)
-        
-        # Draw player
-        if self.player:
-            self.player.render(screen, self.camera_x, self.camera_y)
+            pygame.draw.line(surface, color, (x - ox, grid_top - oy), (x - ox, area.height), 1)
+        for y in range(grid_top + (horizon - grid_top) % 100, area.bottom, 100):
+            color = (110, 90, 65) if ((y - horizon) // 100) % 2 == 0 else (120, 100, 75)
+            pygame.draw.line(surface, color, (0, y - oy), (area.width, y - oy), 1)
+    
+    def _render_hud(self, screen: pygame.Surface):
+        """Render HUD panel harbor"""
+        hud_key = (self.state.version_of('coins') if self.state else 0,
+                   self.current_npc.name if self.current_npc else None)
+        if self._hud_panel is None or hud_key != self._hud_key:
+            self._hud_key = hud_key
+            self._hud_panel = self._bake_hud_panel()
+        screen.blit(self._hud_panel, (10, 10))
         
-        # HUD Panel
-        hud_panel = pygame.Rect(10, 10, 250, 100)
-        overlay = pygame.Surface((hud_panel.width, hud_panel.height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 180))
-        screen.blit(overlay, hud_panel)
-        pygame.draw.rect(screen, (100, 150, 200), hud_panel, 2)
+        # Draw inventory cart
+        if self.show_inventory:
+            self.inventory_cart.render(screen, self.state)
+    
+    def _bake_hud_panel(self) -> pygame.Surface:
+        """Gambar panel HUD (koin dan hint) ke surface cache"""
+        panel = pygame.Surface((250, 100), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        pygame.draw.rect(panel, (100, 150, 200), panel.get_rect(), 2)
         
         # Coins display
         coins = self.state.get('coins', 0) if self.state else 0
-        IconRenderer.draw_coin_icon(screen, 20, 20, 24)
-        coins_text = self.font.render(f"Koin: {coins}", True, (255, 215, 0))
-        screen.blit(coins_text, (50, 20))
+        IconRenderer.draw_coin_icon(panel, 10, 10, 24)
+        coins_text = text_cache.render(f"Koin: {coins}", 24, (255, 215, 0))
+        panel.blit(coins_text, (40, 10))
         
         # Inventory button hint
-        inv_hint = self.small_font.render("Tekan I untuk keranjang", True, (200, 200, 200))
-        screen.blit(inv_hint, (20, 50))
+        inv_hint = text_cache.render("Tekan I untuk keranjang, B berlayar", 18, (200, 200, 200))
+        panel.blit(inv_hint, (10, 40))
         
         # Interaction hint
         if self.current_npc:
-            hint_text = self.small_font.render(f"Tekan E: {self.current_npc.name}", True, (255, 255, 0))
-            screen.blit(hint_text, (20, 75))
-        
-        # Draw inventory cart
-        if self.show_inventory:
-            self.inventory_cart.render(screen, self.state)
-        
-        # Draw minimap
-        if self.player:
-            npc_positions = [(npc.x, npc.y, npc.npc_type) for npc in self.npcs]
-            self.minimap.render(
-                screen,
-                (self.player.x, self.player.y),
-                npc_positions,
-                self.camera_x, self.camera_y,
-                SCREEN_WIDTH * 2, SCREEN_HEIGHT * 2
-            )
-        
-        # Draw dialogs
-        if self.show_shop:
-            self._render_shop_dialog(screen)
-            self.button_manager.render(screen)
-        elif self.show_restaurant:
-            self._render_restaurant_dialog(screen)
-            self.button_manager.render(screen)
-        elif self.show_dialog:
-            self._render_story_dialog(screen)
-            self.button_manager.render(screen)
+            hint_text = text_cache.render(f"Tekan E: {self.current_npc.name}", 18, (255, 255, 0))
+            panel.blit(hint_text, (10, 65))
+        return panel
     
     def _close_dialog(self):
         """Close semua dialog"""
@@ -515,6 +789,7 @@ class HarborScene(Scene):
                             if s_name not in self.state['inventory']['spices']:
                                 self.state['inventory']['spices'][s_name] = 0
                             self.state['inventory']['spices'][s_name] += 1
+                            self.state.touch('inventory')
                             
                             # Save to database
                             db.save_inventory_spice(self.player_id, s_name, self.state['inventory']['spices'][s_name])
@@ -535,103 +810,140 @@ class HarborScene(Scene):
             self.button_manager.add_button(buy_button)
     
     def _render_shop_dialog(self, screen: pygame.Surface):
-        """Render shop dialog untuk membeli rempah"""
+        """Render shop dialog untuk membeli rempah (panel ter-cache)"""
+        self._dialog_panel('shop').render(screen, self.state)
+    
+    def _dialog_panel(self, name: str) -> DialogPanel:
+        """Panel dialog retained-mode; dibuat saat dialog pertama kali dibuka"""
+        panel = self._panels.get(name)
+        if panel is None:
+            builders = {
+                'shop': self._build_shop_panel,
+                'restaurant': self._build_restaurant_panel,
+                'story': self._build_story_panel
+            }
+            panel = self._panels[name] = builders[name]()
+        return panel
+    
+    def _build_shop_panel(self) -> DialogPanel:
+        """Panel toko: baris rempah statis, kolom dimiliki, inventory dan koin sebagai region"""
         dialog_width = 700
         dialog_height = 500
-        dialog_x = (SCREEN_WIDTH - dialog_width) // 2
-        dialog_y = (SCREEN_HEIGHT - dialog_height) // 2
+        panel = DialogPanel((SCREEN_WIDTH - dialog_width) // 2, (SCREEN_HEIGHT - dialog_height) // 2,
+                            dialog_width, dialog_height, self._paint_shop_base)
+        rows_height = len(SPICES) * 50
+        inv_y = 90 + rows_height + 10
+        panel.add_region('owned', (400, 90, 160, rows_height), self._paint_shop_owned, ('inventory',))
+        panel.add_region('inventory', (20, inv_y + 22, dialog_width - 40, 24), self._paint_shop_inventory,
+                         ('inventory',))
+        panel.add_region('coins', (48, dialog_height - 45, 300, 30), self._paint_panel_coins, ('coins',))
+        return panel
+    
+    def _owned_spices(self) -> Dict[str, int]:
+        """Jumlah rempah yang dimiliki player"""
+        if self.state and 'inventory' in self.state and 'spices' in self.state['inventory']:
+            return self.state['inventory']['spices']
+        return {}
+    
+    def _paint_shop_base(self, surface: pygame.Surface):
+        """Bagian statis shop dialog (koordinat lokal panel)"""
+        dialog_width, dialog_height = surface.get_size()
         
         # Dialog background dengan gradient effect
-        dialog_rect = pygame.Rect(dialog_x, dialog_y, dialog_width, dialog_height)
-        pygame.draw.rect(screen, (25, 25, 35), dialog_rect)
-        pygame.draw.rect(screen, (80, 80, 100), dialog_rect, 4)
+        dialog_rect = surface.get_rect()
+        pygame.draw.rect(surface, (25, 25, 35), dialog_rect)
+        pygame.draw.rect(surface, (80, 80, 100), dialog_rect, 4)
         
         # Title bar dengan background
-        title_bg = pygame.Rect(dialog_x, dialog_y, dialog_width, 60)
-        pygame.draw.rect(screen, (50, 50, 70), title_bg)
-        pygame.draw.rect(screen, (100, 100, 120), title_bg, 2)
+        title_bg = pygame.Rect(0, 0, dialog_width, 60)
+        pygame.draw.rect(surface, (50, 50, 70), title_bg)
+        pygame.draw.rect(surface, (100, 100, 120), title_bg, 2)
         
         # Title text
-        title = pygame.font.Font(None, 28).render("🛒 Toko Rempah", True, (255, 255, 100))
-        screen.blit(title, (dialog_x + 25, dialog_y + 18))
-        
-        # Spice list dengan spacing lebih baik
-        y_offset = 90
-        coins = self.state.get('coins', 0) if self.state else 0
+        title = text_cache.render("🛒 Toko Rempah", 28, (255, 255, 100))
+        surface.blit(title, (25, 18))
         
         # Header
-        header_y = dialog_y + 70
-        header_bg = pygame.Rect(dialog_x + 15, header_y, dialog_width - 30, 25)
-        pygame.draw.rect(screen, (40, 40, 60), header_bg)
-        header_text = self.small_font.render("Rempah", True, (255, 255, 200))
-        screen.blit(header_text, (dialog_x + 60, header_y + 4))
-        price_text = self.small_font.render("Harga", True, (255, 255, 200))
-        screen.blit(price_text, (dialog_x + 250, header_y + 4))
-        owned_text = self.small_font.render("Dimiliki", True, (255, 255, 200))
-        screen.blit(owned_text, (dialog_x + 400, header_y + 4))
-        
-        for i, (spice_id, spice_info) in enumerate(SPICES.items()):
-            spice_name = spice_info['name']
-            spice_price = spice_info['price']
-            
-            # Check owned quantity
-            owned_qty = 0
-            if self.state and 'inventory' in self.state and 'spices' in self.state['inventory']:
-                owned_qty = self.state['inventory']['spices'].get(spice_name, 0)
-            
-            item_y = dialog_y + y_offset + i * 50
+        header_y = 70
+        header_bg = pygame.Rect(15, header_y, dialog_width - 30, 25)
+        pygame.draw.rect(surface, (40, 40, 60), header_bg)
+        header_text = text_cache.render("Rempah", 18, (255, 255, 200))
+        surface.blit(header_text, (60, header_y + 4))
+        price_text = text_cache.render("Harga", 18, (255, 255, 200))
+        surface.blit(price_text, (250, header_y + 4))
+        owned_text = text_cache.render("Dimiliki", 18, (255, 255, 200))
+        surface.blit(owned_text, (400, header_y + 4))
+        
+        # Spice list dengan spacing lebih baik (jumlah dimiliki digambar oleh region 'owned')
+        y_offset = 90
+        for i, spice_info in enumerate(SPICES.values()):
+            item_y = y_offset + i * 50
             
             # Item background dengan spacing lebih baik
-            item_bg = pygame.Rect(dialog_x + 15, item_y - 5, dialog_width - 30, 45)
+            item_bg = pygame.Rect(15, item_y - 5, dialog_width - 30, 45)
             bg_color = (35, 35, 45) if i % 2 == 0 else (30, 30, 40)
-            pygame.draw.rect(screen, bg_color, item_bg)
-            pygame.draw.rect(screen, (60, 60, 80), item_bg, 1)
+            pygame.draw.rect(surface, bg_color, item_bg)
+            pygame.draw.rect(surface, (60, 60, 80), item_bg, 1)
             
             # Icon spice
-            IconRenderer.draw_spice_icon(screen, dialog_x + 25, item_y + 8, 28)
+            IconRenderer.draw_spice_icon(surface, 25, item_y + 8, 28)
             
             # Spice name
-            name_text = self.font.render(spice_name, True, (255, 255, 255))
-            screen.blit(name_text, (dialog_x + 60, item_y + 5))
+            name_text = text_cache.render(spice_info['name'], 24, (255, 255, 255))
+            surface.blit(name_text, (60, item_y + 5))
             
             # Price dengan coin icon
-            IconRenderer.draw_coin_icon(screen, dialog_x + 250, item_y + 8, 20)
-            price_text = self.small_font.render(f"{spice_price}", True, (255, 215, 0))
-            screen.blit(price_text, (dialog_x + 275, item_y + 8))
-            
-            # Owned quantity
-            owned_text = self.small_font.render(f"x{owned_qty}", True, (100, 255, 100))
-            screen.blit(owned_text, (dialog_x + 400, item_y + 8))
+            IconRenderer.draw_coin_icon(surface, 250, item_y + 8, 20)
+            price_text = text_cache.render(f"{spice_info['price']}", 18, (255, 215, 0))
+            surface.blit(price_text, (275, item_y + 8))
         
         # Inventory section
-        inv_y = dialog_y + y_offset + len(SPICES) * 50 + 10
-        inv_bg = pygame.Rect(dialog_x + 15, inv_y, dialog_width - 30, 80)
-        pygame.draw.rect(screen, (40, 40, 60), inv_bg)
-        pygame.draw.rect(screen, (80, 80, 100), inv_bg, 2)
+        inv_y = y_offset + len(SPICES) * 50 + 10
+        inv_bg = pygame.Rect(15, inv_y, dialog_width - 30, 80)
+        pygame.draw.rect(surface, (40, 40, 60), inv_bg)
+        pygame.draw.rect(surface, (80, 80, 100), inv_bg, 2)
         
-        inv_title = self.small_font.render("📦 Inventory Anda:", True, (255, 255, 200))
-        screen.blit(inv_title, (dialog_x + 25, inv_y + 5))
-        
-        # Display owned spices
-        inv_items_y = inv_y + 25
-        if self.state and 'inventory' in self.state and 'spices' in self.state['inventory']:
-            owned_items = [(name, qty) for name, qty in self.state['inventory']['spices'].items() if qty > 0]
-            if owned_items:
-                for idx, (name, qty) in enumerate(owned_items[:4]):  # Max 4 items
-                    item_text = self.small_font.render(f"{name} x{qty}", True, (200, 255, 200))
-                    screen.blit(item_text, (dialog_x + 25 + idx * 150, inv_items_y))
-            else:
-                no_items = self.small_font.render("Belum ada rempah", True, (150, 150, 150))
-                screen.blit(no_items, (dialog_x + 25, inv_items_y))
+        inv_title = text_cache.render("📦 Inventory Anda:", 18, (255, 255, 200))
+        surface.blit(inv_title, (25, inv_y + 5))
         
         # Coins display dengan background
-        coins_bg = pygame.Rect(dialog_x, dialog_y + dialog_height - 50, dialog_width, 40)
-        pygame.draw.rect(screen, (40, 40, 60), coins_bg)
-        pygame.draw.rect(screen, (80, 80, 100), coins_bg, 2)
-        
-        IconRenderer.draw_coin_icon(screen, dialog_x + 20, dialog_y + dialog_height - 40, 24)
-        coins_text = self.font.render(f"Koin: {coins}", True, (255, 215, 0))
-        screen.blit(coins_text, (dialog_x + 50, dialog_y + dialog_height - 40))
+        self._paint_coins_bar(surface, (40, 40, 60), (80, 80, 100))
+    
+    def _paint_shop_owned(self, surface: pygame.Surface):
+        """Region kolom jumlah rempah yang dimiliki"""
+        owned = self._owned_spices()
+        for i, spice_info in enumerate(SPICES.values()):
+            owned_text = text_cache.render(f"x{owned.get(spice_info['name'], 0)}", 18, (100, 255, 100))
+            surface.blit(owned_text, (400, 90 + i * 50 + 8))
+    
+    def _paint_shop_inventory(self, surface: pygame.Surface):
+        """Region daftar rempah di inventory"""
+        if not (self.state and 'inventory' in self.state and 'spices' in self.state['inventory']):
+            return
+        inv_items_y = 90 + len(SPICES) * 50 + 10 + 25
+        owned_items = [(name, qty) for name, qty in self._owned_spices().items() if qty > 0]
+        if owned_items:
+            for idx, (name, qty) in enumerate(owned_items[:4]):  # Max 4 items
+                item_text = text_cache.render(f"{name} x{qty}", 18, (200, 255, 200))
+                surface.blit(item_text, (25 + idx * 150, inv_items_y))
+        else:
+            no_items = text_cache.render("Belum ada rempah", 18, (150, 150, 150))
+            surface.blit(no_items, (25, inv_items_y))
+    
+    @staticmethod
+    def _paint_coins_bar(surface: pygame.Surface, color: Tuple[int, int, int], border: Tuple[int, int, int]):
+        """Background bar koin di bawah dialog (teks koin digambar oleh region 'coins')"""
+        dialog_width, dialog_height = surface.get_size()
+        coins_bg = pygame.Rect(0, dialog_height - 50, dialog_width, 40)
+        pygame.draw.rect(surface, color, coins_bg)
+        pygame.draw.rect(surface, border, coins_bg, 2)
+        IconRenderer.draw_coin_icon(surface, 20, dialog_height - 40, 24)
+    
+    def _paint_panel_coins(self, surface: pygame.Surface):
+        """Region jumlah koin"""
+        coins = self.state.get('coins', 0) if self.state else 0
+        coins_text = text_cache.render(f"Koin: {coins}", 24, (255, 215, 0))
+        surface.blit(coins_text, (50, surface.get_height() - 40))
     
     def _setup_restaurant_buttons(self):
         """Setup buttons untuk restaurant dialog"""
@@ -671,6 +983,7 @@ class HarborScene(Scene):
                                 self.state['tried_foods'] = []
                             if f_name not in self.state['tried_foods']:
                                 self.state['tried_foods'].append(f_name)
+                                self.state.touch('tried_foods')
                             
                             # Save to database
                             db.add_tried_food(self.player_id, f_name, f_region)
@@ -692,106 +1005,118 @@ class HarborScene(Scene):
             self.button_manager.add_button(buy_button)
     
     def _render_restaurant_dialog(self, screen: pygame.Surface):
-        """Render restaurant dialog untuk mencoba makanan khas"""
+        """Render restaurant dialog untuk mencoba makanan khas (panel ter-cache)"""
+        self._dialog_panel('restaurant').render(screen, self.state)
+    
+    def _build_restaurant_panel(self) -> DialogPanel:
+        """Panel restoran: baris makanan statis, nama (tanda sudah dicoba), daftar dicoba dan koin sebagai region"""
         dialog_width = 700
         dialog_height = 500
-        dialog_x = (SCREEN_WIDTH - dialog_width) // 2
-        dialog_y = (SCREEN_HEIGHT - dialog_height) // 2
+        panel = DialogPanel((SCREEN_WIDTH - dialog_width) // 2, (SCREEN_HEIGHT - dialog_height) // 2,
+                            dialog_width, dialog_height, self._paint_restaurant_base)
+        rows_height = len(FOODS) * 55
+        tried_y = 90 + rows_height + 10
+        panel.add_region('names', (60, 90, 185, 22 + (len(FOODS) - 1) * 55), self._paint_restaurant_names,
+                         ('tried_foods',))
+        panel.add_region('tried', (20, tried_y + 22, dialog_width - 40, 24), self._paint_restaurant_tried,
+                         ('tried_foods',))
+        panel.add_region('coins', (48, dialog_height - 45, 300, 30), self._paint_panel_coins, ('coins',))
+        return panel
+    
+    def _tried_foods(self) -> List[str]:
+        """Makanan yang sudah dicoba player"""
+        if self.state and 'tried_foods' in self.state:
+            return self.state['tried_foods']
+        return []
+    
+    def _paint_restaurant_base(self, surface: pygame.Surface):
+        """Bagian statis restaurant dialog (koordinat lokal panel)"""
+        dialog_width, dialog_height = surface.get_size()
         
         # Dialog background dengan gradient effect
-        dialog_rect = pygame.Rect(dialog_x, dialog_y, dialog_width, dialog_height)
-        pygame.draw.rect(screen, (35, 25, 25), dialog_rect)
-        pygame.draw.rect(screen, (100, 80, 80), dialog_rect, 4)
+        dialog_rect = surface.get_rect()
+        pygame.draw.rect(surface, (35, 25, 25), dialog_rect)
+        pygame.draw.rect(surface, (100, 80, 80), dialog_rect, 4)
         
         # Title bar
-        title_bg = pygame.Rect(dialog_x, dialog_y, dialog_width, 60)
-        pygame.draw.rect(screen, (70, 50, 50), title_bg)
-        pygame.draw.rect(screen, (120, 90, 90), title_bg, 2)
+        title_bg = pygame.Rect(0, 0, dialog_width, 60)
+        pygame.draw.rect(surface, (70, 50, 50), title_bg)
+        pygame.draw.rect(surface, (120, 90, 90), title_bg, 2)
         
-        title = pygame.font.Font(None, 28).render("🍜 Restoran - Makanan Khas Daerah", True, (255, 255, 100))
-        screen.blit(title, (dialog_x + 25, dialog_y + 18))
+        title = text_cache.render("🍜 Restoran - Makanan Khas Daerah", 28, (255, 255, 100))
+        surface.blit(title, (25, 18))
         
         # Header
-        header_y = dialog_y + 70
-        header_bg = pygame.Rect(dialog_x + 15, header_y, dialog_width - 30, 25)
-        pygame.draw.rect(screen, (50, 40, 40), header_bg)
-        header_text = self.small_font.render("Makanan", True, (255, 255, 200))
-        screen.blit(header_text, (dialog_x + 60, header_y + 4))
-        region_text = self.small_font.render("Daerah", True, (255, 255, 200))
-        screen.blit(region_text, (dialog_x + 250, header_y + 4))
-        price_text = self.small_font.render("Harga", True, (255, 255, 200))
-        screen.blit(price_text, (dialog_x + 400, header_y + 4))
-        
-        # Food list dengan spacing lebih baik
+        header_y = 70
+        header_bg = pygame.Rect(15, header_y, dialog_width - 30, 25)
+        pygame.draw.rect(surface, (50, 40, 40), header_bg)
+        header_text = text_cache.render("Makanan", 18, (255, 255, 200))
+        surface.blit(header_text, (60, header_y + 4))
+        region_text = text_cache.render("Daerah", 18, (255, 255, 200))
+        surface.blit(region_text, (250, header_y + 4))
+        price_text = text_cache.render("Harga", 18, (255, 255, 200))
+        surface.blit(price_text, (400, header_y + 4))
+        
+        # Food list dengan spacing lebih baik (nama makanan digambar oleh region 'names')
         y_offset = 90
-        coins = self.state.get('coins', 0) if self.state else 0
-        
-        for i, (food_id, food_info) in enumerate(FOODS.items()):
-            food_name = food_info['name']
-            food_price = food_info['price']
-            food_region = food_info['region']
-            food_desc = food_info['description']
-            
-            # Check if tried
-            tried = False
-            if self.state and 'tried_foods' in self.state:
-                tried = food_name in self.state['tried_foods']
-            
-            item_y = dialog_y + y_offset + i * 55
+        for i, food_info in enumerate(FOODS.values()):
+            item_y = y_offset + i * 55
             
             # Item background dengan spacing lebih baik
-            item_bg = pygame.Rect(dialog_x + 15, item_y - 5, dialog_width - 30, 50)
+            item_bg = pygame.Rect(15, item_y - 5, dialog_width - 30, 50)
             bg_color = (45, 35, 35) if i % 2 == 0 else (40, 30, 30)
-            pygame.draw.rect(screen, bg_color, item_bg)
-            pygame.draw.rect(screen, (80, 60, 60), item_bg, 1)
+            pygame.draw.rect(surface, bg_color, item_bg)
+            pygame.draw.rect(surface, (80, 60, 60), item_bg, 1)
             
             # Food icon
-            IconRenderer.draw_food_icon(screen, dialog_x + 25, item_y + 8, 32)
-            
-            # Food name dengan checkmark jika sudah dicoba
-            name_prefix = "✓ " if tried else ""
-            name_text = self.font.render(f"{name_prefix}{food_name}", True, (255, 255, 255) if not tried else (150, 255, 150))
-            screen.blit(name_text, (dialog_x + 65, item_y + 5))
+            IconRenderer.draw_food_icon(surface, 25, item_y + 8, 32)
             
             # Region
-            region_text = self.small_font.render(food_region, True, (200, 200, 255))
-            screen.blit(region_text, (dialog_x + 250, item_y + 8))
+            region_text = text_cache.render(food_info['region'], 18, (200, 200, 255))
+            surface.blit(region_text, (250, item_y + 8))
             
             # Price dengan coin icon
-            IconRenderer.draw_coin_icon(screen, dialog_x + 400, item_y + 10, 20)
-            price_text = self.small_font.render(f"{food_price}", True, (255, 215, 0))
-            screen.blit(price_text, (dialog_x + 425, item_y + 10))
+            IconRenderer.draw_coin_icon(surface, 400, item_y + 10, 20)
+            price_text = text_cache.render(f"{food_info['price']}", 18, (255, 215, 0))
+            surface.blit(price_text, (425, item_y + 10))
             
             # Description
-            desc_text = self.small_font.render(food_desc, True, (200, 200, 200))
-            screen.blit(desc_text, (dialog_x + 65, item_y + 25))
+            desc_text = text_cache.render(food_info['description'], 18, (200, 200, 200))
+            surface.blit(desc_text, (65, item_y + 25))
         
         # Tried foods section
-        tried_y = dialog_y + y_offset + len(FOODS) * 55 + 10
-        tried_bg = pygame.Rect(dialog_x + 15, tried_y, dialog_width - 30, 80)
-        pygame.draw.rect(screen, (50, 40, 40), tried_bg)
-        pygame.draw.rect(screen, (100, 80, 80), tried_bg, 2)
-        
-        tried_title = self.small_font.render("✓ Makanan yang Sudah Dicoba:", True, (255, 255, 200))
-        screen.blit(tried_title, (dialog_x + 25, tried_y + 5))
-        
-        tried_items_y = tried_y + 25
-        if self.state and 'tried_foods' in self.state and self.state['tried_foods']:
-            for idx, food_name in enumerate(self.state['tried_foods'][:4]):  # Max 4 items
-                food_text = self.small_font.render(f"✓ {food_name}", True, (150, 255, 150))
-                screen.blit(food_text, (dialog_x + 25 + idx * 150, tried_items_y))
-        else:
-            no_items = self.small_font.render("Belum ada makanan yang dicoba", True, (150, 150, 150))
-            screen.blit(no_items, (dialog_x + 25, tried_items_y))
+        tried_y = y_offset + len(FOODS) * 55 + 10
+        tried_bg = pygame.Rect(15, tried_y, dialog_width - 30, 80)
+        pygame.draw.rect(surface, (50, 40, 40), tried_bg)
+        pygame.draw.rect(surface, (100, 80, 80), tried_bg, 2)
         
-        # Coins display
-        coins_bg = pygame.Rect(dialog_x, dialog_y + dialog_height - 50, dialog_width, 40)
-        pygame.draw.rect(screen, (50, 40, 40), coins_bg)
-        pygame.draw.rect(screen, (100, 80, 80), coins_bg, 2)
+        tried_title = text_cache.render("✓ Makanan yang Sudah Dicoba:", 18, (255, 255, 200))
+        surface.blit(tried_title, (25, tried_y + 5))
         
-        IconRenderer.draw_coin_icon(screen, dialog_x + 20, dialog_y + dialog_height - 40, 24)
-        coins_text = self.font.render(f"Koin: {coins}", True, (255, 215, 0))
-        screen.blit(coins_text, (dialog_x + 50, dialog_y + dialog_height - 40))
+        # Coins display
+        self._paint_coins_bar(surface, (50, 40, 40), (100, 80, 80))
+    
+    def _paint_restaurant_names(self, surface: pygame.Surface):
+        """Region nama makanan, dengan checkmark jika sudah dicoba"""
+        tried_foods = self._tried_foods()
+        for i, food_info in enumerate(FOODS.values()):
+            food_name = food_info['name']
+            tried = food_name in tried_foods
+            name_prefix = "✓ " if tried else ""
+            name_text = text_cache.render(f"{name_prefix}{food_name}", 24, (255, 255, 255) if not tried else (150, 255, 150))
+            surface.blit(name_text, (65, 90 + i * 55 + 5))
+    
+    def _paint_restaurant_tried(self, surface: pygame.Surface):
+        """Region daftar makanan yang sudah dicoba"""
+        tried_items_y = 90 + len(FOODS) * 55 + 10 + 25
+        tried_foods = self._tried_foods()
+        if tried_foods:
+            for idx, food_name in enumerate(tried_foods[:4]):  # Max 4 items
+                food_text = text_cache.render(f"✓ {food_name}", 18, (150, 255, 150))
+                surface.blit(food_text, (25 + idx * 150, tried_items_y))
+        else:
+            no_items = text_cache.render("Belum ada makanan yang dicoba", 18, (150, 150, 150))
+            surface.blit(no_items, (25, tried_items_y))
     
     def _setup_story_buttons(self):
         """Setup buttons untuk story dialog"""
@@ -811,29 +1136,37 @@ class HarborScene(Scene):
         self.button_manager.add_button(close_button)
     
     def _render_story_dialog(self, screen: pygame.Surface):
-        """Render story dialog"""
+        """Render story dialog (panel ter-cache)"""
+        self._dialog_panel('story').render(screen, self.state)
+    
+    def _build_story_panel(self) -> DialogPanel:
+        """Panel cerita: seluruhnya statis"""
         dialog_width = 650
         dialog_height = 400
-        dialog_x = (SCREEN_WIDTH - dialog_width) // 2
-        dialog_y = (SCREEN_HEIGHT - dialog_height) // 2
+        return DialogPanel((SCREEN_WIDTH - dialog_width) // 2, (SCREEN_HEIGHT - dialog_height) // 2,
+                           dialog_width, dialog_height, self._paint_story_base)
+    
+    def _paint_story_base(self, surface: pygame.Surface):
+        """Gambar story dialog (koordinat lokal panel)"""
+        dialog_width, dialog_height = surface.get_size()
         
         # Dialog background dengan gradient
-        dialog_rect = pygame.Rect(dialog_x, dialog_y, dialog_width, dialog_height)
-        pygame.draw.rect(screen, (25, 25, 45), dialog_rect)
-        pygame.draw.rect(screen, (90, 90, 140), dialog_rect, 4)
+        dialog_rect = surface.get_rect()
+        pygame.draw.rect(surface, (25, 25, 45), dialog_rect)
+        pygame.draw.rect(surface, (90, 90, 140), dialog_rect, 4)
         
         # Title bar
-        title_bg = pygame.Rect(dialog_x, dialog_y, dialog_width, 60)
-        pygame.draw.rect(screen, (55, 55, 75), title_bg)
-        pygame.draw.rect(screen, (100, 100, 150), title_bg, 2)
+        title_bg = pygame.Rect(0, 0, dialog_width, 60)
+        pygame.draw.rect(surface, (55, 55, 75), title_bg)
+        pygame.draw.rect(surface, (100, 100, 150), title_bg, 2)
         
-        title = pygame.font.Font(None, 28).render("📖 Cerita - Pedagang Tahun 1400 M", True, (255, 255, 100))
-        screen.blit(title, (dialog_x + 25, dialog_y + 18))
+        title = text_cache.render("📖 Cerita - Pedagang Tahun 1400 M", 28, (255, 255, 100))
+        surface.blit(title, (25, 18))
         
         # Story text dengan background
-        story_bg = pygame.Rect(dialog_x + 15, dialog_y + 70, dialog_width - 30, dialog_height - 120)
-        pygame.draw.rect(screen, (35, 35, 55), story_bg)
-        pygame.draw.rect(screen, (70, 70, 100), story_bg, 2)
+        story_bg = pygame.Rect(15, 70, dialog_width - 30, dialog_height - 120)
+        pygame.draw.rect(surface, (35, 35, 55), story_bg)
+        pygame.draw.rect(surface, (70, 70, 100), story_bg, 2)
         
         story_lines = [
             "Selamat datang di Pelabuhan!",
@@ -852,8 +1185,8 @@ class HarborScene(Scene):
         y_offset = 90
         for i, line in enumerate(story_lines):
             if line:
-                text = self.small_font.render(line, True, (255, 255, 255))
-                screen.blit(text, (dialog_x + 35, dialog_y + y_offset + i * 22))
+                text = text_cache.render(line, 18, (255, 255, 255))
+                surface.blit(text, (35, y_offset + i * 22))
     
     def get_state(self) -> Dict[str, Any]:
         """Get current state"""
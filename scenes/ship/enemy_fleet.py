@@ -0,0 +1,194 @@
+"""
+Enemy Fleet - Simulasi armada enemy ship dengan array NumPy (seek ke player + separation antar kapal)
+"""
+import pygame
+import numpy as np
+from typing import Tuple
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from game_engine.ai_scheduler import AIScheduler
+from utils.constants import *
+from utils.ship_icons import ShipIconRenderer
+
+
+class EnemyFleet:
+    """Armada enemy ship; posisi, health dan heading disimpan sebagai array, bukan objek per kapal"""
+
+    def __init__(self, capacity: int, width: int = 60, height: int = 45, speed: float = ENEMY_SPEED,
+                 separation_radius: float = ARMADA_SEPARATION_RADIUS,
+                 separation_weight: float = ARMADA_SEPARATION_WEIGHT):
+        self.capacity = capacity
+        self.width = width
+        self.height = height
+        self.speed = speed
+        self.separation_radius = separation_radius
+        self.separation_weight = separation_weight
+        self.count = 0
+        # Posisi top-left (sama seperti EnemyShip.x/y) dan posisi tick sebelumnya untuk interpolation
+        self.pos = np.zeros((capacity, 2), dtype=np.float64)
+        self.prev = np.zeros((capacity, 2), dtype=np.float64)
+        self.angle = np.zeros(capacity, dtype=np.float64)
+        self.health = np.zeros(capacity, dtype=np.float64)
+        # Kecepatan hasil think terakhir; kapal jauh berpikir tiap 4/16 tick dan tetap bergerak di antaranya
+        self.velocity = np.zeros((capacity, 2), dtype=np.float64)
+        self.phase = np.zeros(capacity, dtype=np.int64)
+        self.scheduler = AIScheduler(ARMADA_AI_NEAR_DISTANCE, ARMADA_AI_FAR_DISTANCE)
+        self.max_health = ENEMY_HEALTH
+        self._half = np.array([width / 2, height / 2])
+
+    def __len__(self) -> int:
+        return self.count
+
+    def clear(self):
+        """Hapus semua kapal"""
+        self.count = 0
+
+    def spawn(self, x: float, y: float) -> int:
+        """Tambah kapal di (x, y); return index atau -1 jika armada penuh"""
+        if self.count >= self.capacity:
+            return -1
+        index = self.count
+        self.pos[index] = (x, y)
+        self.prev[index] = (x, y)
+        self.angle[index] = 0.0
+        self.health[index] = self.max_health
+        self.velocity[index] = 0.0
+        self.phase[index] = self.scheduler.next_phase()
+        self.count += 1
+        return index
+
+    def center(self, index: int) -> Tuple[int, int]:
+        """Titik tengah rect kapal (untuk efek partikel)"""
+        x, y = self.pos[index]
+        return int(x) + self.width // 2, int(y) + self.height // 2
+
+    def update(self, dt: float, target: Tuple[float, float]):
+        """Seek ke target ditambah separation untuk kapal yang jatuh tempo, lalu gerakkan semua kapal"""
+        n = self.count
+        if n == 0:
+            return
+        pos = self.pos[:n]
+        self.prev[:n] = pos
+        centers = pos + self._half
+
+        # Seek: arah ke target (unit vector)
+        seek = np.asarray(target, dtype=np.float64) - centers
+        distance = np.hypot(seek[:, 0], seek[:, 1])
+
+        # LOD: tier dari jarak ke target; kapal baru (belum punya arah) langsung berpikir
+        due = self.scheduler.due(distance, self.phase[:n])
+        due |= ~self.velocity[:n].any(axis=1)
+        rows = np.flatnonzero(due)
+        if len(rows):
+            self._think(centers, seek, distance, rows)
+
+        pos += self.velocity[:n] * dt
+
+    def _think(self, centers: np.ndarray, seek: np.ndarray, distance: np.ndarray, rows: np.ndarray):
+        """Hitung kecepatan dan heading baru untuk kapal pada rows"""
+        steer = seek[rows]
+        np.divide(steer, distance[rows, None], out=steer, where=distance[rows, None] > 0)
+        if len(centers) > 1 and self.separation_weight > 0:
+            steer += self._separation(centers, rows) * self.separation_weight
+
+        # Kecepatan selalu self.speed ke arah steer
+        magnitude = np.hypot(steer[:, 0], steer[:, 1])
+        moving = magnitude > 1e-9
+        velocity = np.zeros_like(steer)
+        np.divide(steer, magnitude[:, None], out=velocity, where=moving[:, None])
+        self.velocity[rows] = velocity * self.speed
+        self.angle[rows] = np.where(moving, np.degrees(np.arctan2(velocity[:, 1], velocity[:, 0])),
+                                    self.angle[rows])
+
+    def _separation(self, centers: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Dorongan menjauh dari kapal lain dalam separation_radius (grid sel seukuran radius)"""
+        n = len(rows)
+        radius = self.separation_radius
+        # Sel grid seukuran radius: tetangga pasti ada di 3x3 sel sekitar (grid diberi padding 1 sel)
+        cell = np.floor(centers / radius).astype(np.int64)
+        cell -= cell.min(axis=0) - 1
+        grid_w, grid_h = cell.max(axis=0) + 2
+        key = cell[:, 1] * grid_w + cell[:, 0]
+        order = np.argsort(key, kind='stable')
+        counts = np.bincount(key, minlength=grid_w * grid_h)
+        starts = np.cumsum(counts) - counts
+
+        # Pasangan kandidat (i, j) untuk kapal pada rows dan 9 sel tetangga sekaligus
+        neighbor_offsets = np.array([dy * grid_w + dx for dy in (-1, 0, 1) for dx in (-1, 0, 1)])
+        neighbor_keys = (key[rows, None] + neighbor_offsets[None, :]).ravel()
+        pair_counts = counts[neighbor_keys]
+        total = int(pair_counts.sum())
+        first = np.cumsum(pair_counts) - pair_counts
+        within = np.arange(total) - np.repeat(first, pair_counts)
+        i = np.repeat(np.repeat(np.arange(n), 9), pair_counts)
+        j = order[np.repeat(starts[neighbor_keys], pair_counts) + within]
+
+        offset = centers[rows[i]] - centers[j]
+        distance = np.hypot(offset[:, 0], offset[:, 1])
+        # Bobot linear: 1 saat berhimpit, 0 di tepi radius; diri sendiri (distance 0) diabaikan
+        near = (distance < radius) & (distance > 0)
+        i, offset, distance = i[near], offset[near], distance[near]
+        weight = (radius - distance) / (radius * distance)
+        push = np.empty((n, 2))
+        push[:, 0] = np.bincount(i, weights=offset[:, 0] * weight, minlength=n)
+        push[:, 1] = np.bincount(i, weights=offset[:, 1] * weight, minlength=n)
+        return push
+
+    def _rects(self) -> np.ndarray:
+        """Rect integer (x, y) kapal seperti pygame.Rect pada EnemyShip"""
+        return self.pos[:self.count].astype(np.int64)
+
+    def overlaps(self, rect: pygame.Rect) -> np.ndarray:
+        """Mask kapal yang rect-nya overlap dengan rect (semantik colliderect)"""
+        xy = self._rects()
+        return ((xy[:, 0] < rect.right) & (rect.left < xy[:, 0] + self.width) &
+                (xy[:, 1] < rect.bottom) & (rect.top < xy[:, 1] + self.height))
+
+    def rect_array(self) -> np.ndarray:
+        """Array (count, 4) berisi rect (x, y, w, h) semua kapal"""
+        rects = np.empty((self.count, 4))
+        rects[:, :2] = self._rects()
+        rects[:, 2] = self.width
+        rects[:, 3] = self.height
+        return rects
+
+    def remove_dead(self) -> int:
+        """Compact kapal dengan health <= 0 (urutan kapal hidup tetap); return jumlah yang dihapus"""
+        n = self.count
+        alive = self.health[:n] > 0
+        alive_count = int(np.count_nonzero(alive))
+        if alive_count == n:
+            return 0
+        for array in (self.pos, self.prev, self.angle, self.health, self.velocity, self.phase):
+            array[:alive_count] = array[:n][alive]
+        self.count = alive_count
+        return n - alive_count
+
+    def render(self, screen: pygame.Surface, alpha: float = 1.0):
+        """Render semua kapal beserta health bar"""
+        n = self.count
+        if n == 0:
+            return
+        draw = (self.prev[:n] + (self.pos[:n] - self.prev[:n]) * alpha).astype(np.int64).tolist()
+        health = (self.health[:n] / self.max_health).tolist()
+        angles = self.angle[:n].tolist()
+        bar_width = 50
+        bar_height = 6
+        for (draw_x, draw_y), angle, health_percent in zip(draw, angles, health):
+            ShipIconRenderer.draw_enemy_ship(screen, draw_x, draw_y, self.width, self.height, angle)
+
+            # Health bar sama seperti EnemyShip.render
+            bar_x = draw_x + (self.width - bar_width) // 2
+            bar_y = draw_y - 12
+            pygame.draw.rect(screen, (30, 30, 30), (bar_x - 1, bar_y - 1, bar_width + 2, bar_height + 2))
+            pygame.draw.rect(screen, (50, 50, 50), (bar_x, bar_y, bar_width, bar_height))
+            if health_percent > 0.6:
+                health_color = (0, 255, 0)
+            elif health_percent > 0.3:
+                health_color = (255, 255, 0)
+            else:
+                health_color = (255, 0, 0)
+            pygame.draw.rect(screen, health_color, (bar_x, bar_y, int(bar_width * health_percent), bar_height))
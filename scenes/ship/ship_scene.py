@@ -3,8 +3,9 @@ Ship Scene - Scene untuk gameplay di kapal merchant
 Style: Warship game
 """
 import pygame
-import random
 import math
+import numpy as np
+from operator import itemgetter
 from typing import List, Dict, Any
 import sys
 import os
@@ -12,11 +13,23 @@ import os
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from game_engine.scene import Scene
+from game_engine.timestep import lerp
+from game_engine.profiler import profiler
+from game_engine.ai_scheduler import AIAgent, AIScheduler
 from utils.constants import *
 from utils.ocean_effects import OceanRenderer
 from utils.particle_system import ParticleSystem
 from utils.ship_icons import ShipIconRenderer
 from utils.ui_button import Button, ButtonManager
+from utils.text_cache import text_cache
+from utils.rng import stream
+from utils.spatial_hash import SpatialHash
+from utils.collision import swept_circle_rect, swept_circle_rects
+from utils.pool import ObjectPool, ActiveSet
+from scenes.ship.enemy_fleet import EnemyFleet
+
+# Stream RNG sendiri supaya bisa direproduksi saat replay
+_rng = stream('enemy_spawn')
 
 class Ship:
     """Kelas untuk player ship"""
@@ -30,9 +43,14 @@ class Ship:
         self.max_health = 100
         self.angle = 0  # Angle in degrees
         self.rect = pygame.Rect(x, y, self.width, self.height)
+        # Posisi tick sebelumnya untuk render interpolation
+        self.prev_x = x
+        self.prev_y = y
         
     def update(self, dt: float, keys: pygame.key.ScancodeWrapper):
         """Update ship position berdasarkan input"""
+        self.prev_x = self.x
+        self.prev_y = self.y
         dx, dy = 0, 0
         
         if keys[pygame.K_w] or keys[pygame.K_UP]:
@@ -58,44 +76,52 @@ class Ship:
         if dx != 0 or dy != 0:
             self.angle = math.degrees(math.atan2(dy, dx))
     
-    def render(self, screen: pygame.Surface):
+    def render(self, screen: pygame.Surface, alpha: float = 1.0):
         """Render ship ke screen"""
+        draw_x = int(lerp(self.prev_x, self.x, alpha))
+        draw_y = int(lerp(self.prev_y, self.y, alpha))
+        
         # Draw merchant ship dengan icon yang lebih baik
         ShipIconRenderer.draw_merchant_ship(
             screen, 
-            int(self.rect.x), 
-            int(self.rect.y),
+            draw_x, 
+            draw_y,
             self.width, 
             self.height,
             self.angle
         )
         
         # Draw ship label dengan background
-        center_x = self.rect.centerx
-        center_y = self.rect.centery
-        font = pygame.font.Font(None, 16)
-        text = font.render("MERCHANT", True, (255, 255, 255))
-        text_rect = text.get_rect(center=(center_x, self.rect.y - 15))
-        # Background untuk text
-        bg_rect = pygame.Rect(text_rect.x - 5, text_rect.y - 2, text_rect.width + 10, text_rect.height + 4)
-        overlay = pygame.Surface((bg_rect.width, bg_rect.height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))
-        screen.blit(overlay, bg_rect)
-        screen.blit(text, text_rect)
+        center_x = draw_x + self.width // 2
+        label = text_cache.render_label("MERCHANT", 16, (255, 255, 255), (0, 0, 0, 150), pad_x=5)
+        screen.blit(label, label.get_rect(center=(center_x, draw_y - 15)))
 
-class EnemyShip:
-    """Kelas untuk enemy ship"""
-    def __init__(self, x: float, y: float):
-        self.x = x
-        self.y = y
+class EnemyShip(AIAgent):
+    """Kelas untuk enemy ship (di-pool, lihat ShipScene.enemy_pool)"""
+    __slots__ = ('x', 'y', 'width', 'height', 'speed', 'health', 'max_health', 'angle', 'rect',
+                 'target', 'prev_x', 'prev_y', 'vx', 'vy')
+
+    def __init__(self, x: float = 0.0, y: float = 0.0):
         self.width = 60
         self.height = 45
         self.speed = ENEMY_SPEED
+        self.rect = pygame.Rect(x, y, self.width, self.height)
+        self.reset(x, y)
+
+    def reset(self, x: float, y: float):
+        """Inisialisasi ulang saat diambil dari pool (Rect dipakai ulang)"""
+        self.x = x
+        self.y = y
         self.health = ENEMY_HEALTH
         self.max_health = ENEMY_HEALTH
         self.angle = 0
-        self.rect = pygame.Rect(x, y, self.width, self.height)
+        self.rect.x = int(x)
+        self.rect.y = int(y)
         self.target = None  # Target player ship
+        self.prev_x = x
+        self.prev_y = y
+        self.vx = 0.0
+        self.vy = 0.0
         
     def set_target(self, target: Ship):
         """Set target untuk enemy"""
@@ -103,6 +129,12 @@ class EnemyShip:
     
     def update(self, dt: float):
         """Update enemy position dengan AI sederhana"""
+        self.think(dt)
+        self.move(dt)
+    
+    def think(self, dt: float):
+        """AI sederhana: arahkan kecepatan ke target (dijadwalkan AIScheduler)"""
+        self.vx = self.vy = 0.0
         if self.target:
             # Move towards target
             dx = self.target.rect.centerx - self.rect.centerx
@@ -110,22 +142,30 @@ class EnemyShip:
             distance = math.sqrt(dx*dx + dy*dy)
             
             if distance > 0:
-                dx = (dx / distance) * self.speed * dt
-                dy = (dy / distance) * self.speed * dt
-                self.x += dx
-                self.y += dy
+                self.vx = dx / distance * self.speed
+                self.vy = dy / distance * self.speed
                 self.angle = math.degrees(math.atan2(dy, dx))
-                
-                self.rect.x = int(self.x)
-                self.rect.y = int(self.y)
     
-    def render(self, screen: pygame.Surface):
+    def move(self, dt: float):
+        """Gerak dengan kecepatan hasil think terakhir (setiap tick)"""
+        self.prev_x = self.x
+        self.prev_y = self.y
+        if self.vx or self.vy:
+            self.x += self.vx * dt
+            self.y += self.vy * dt
+            self.rect.x = int(self.x)
+            self.rect.y = int(self.y)
+    
+    def render(self, screen: pygame.Surface, alpha: float = 1.0):
         """Render enemy ship"""
+        draw_x = int(lerp(self.prev_x, self.x, alpha))
+        draw_y = int(lerp(self.prev_y, self.y, alpha))
+        
         # Draw enemy ship dengan icon yang lebih baik
         ShipIconRenderer.draw_enemy_ship(
             screen,
-            int(self.rect.x),
-            int(self.rect.y),
+            draw_x,
+            draw_y,
             self.width,
             self.height,
             self.angle
@@ -134,8 +174,8 @@ class EnemyShip:
         # Health bar above ship dengan style yang lebih baik
         bar_width = 50
         bar_height = 6
-        bar_x = self.rect.x + (self.rect.width - bar_width) // 2
-        bar_y = self.rect.y - 12
+        bar_x = draw_x + (self.width - bar_width) // 2
+        bar_y = draw_y - 12
         
         # Background
         pygame.draw.rect(screen, (30, 30, 30), (bar_x - 1, bar_y - 1, bar_width + 2, bar_height + 2))
@@ -153,22 +193,39 @@ class EnemyShip:
         pygame.draw.rect(screen, health_color, (bar_x, bar_y, health_width, bar_height))
 
 class Cannonball:
-    """Kelas untuk cannonball projectile"""
-    def __init__(self, x: float, y: float, angle: float):
-        self.x = x
-        self.y = y
+    """Kelas untuk cannonball projectile (di-pool, lihat ShipScene.cannonball_pool)"""
+    __slots__ = ('x', 'y', 'radius', 'speed', 'angle', 'damage', 'active', 'out_of_bounds', 'rect',
+                 'sweep_rect', 'prev_x', 'prev_y')
+
+    def __init__(self, x: float = 0.0, y: float = 0.0, angle: float = 0.0):
         self.radius = CANNONBALL_SIZE
         self.speed = CANNONBALL_SPEED
-        self.angle = angle  # in radians
         self.damage = CANNONBALL_DAMAGE
+        self.rect = pygame.Rect(0, 0, self.radius * 2, self.radius * 2)
+        # Bounding box lintasan tick ini (untuk broadphase continuous collision)
+        self.sweep_rect = pygame.Rect(self.rect)
+        self.reset(x, y, angle)
+
+    def reset(self, x: float, y: float, angle: float):
+        """Inisialisasi ulang saat diambil dari pool (Rect dipakai ulang)"""
+        self.x = x
+        self.y = y
+        self.angle = angle  # in radians
         self.active = True
-        self.rect = pygame.Rect(x - self.radius, y - self.radius, self.radius * 2, self.radius * 2)
+        self.out_of_bounds = False
+        self.rect.x = int(x - self.radius)
+        self.rect.y = int(y - self.radius)
+        self.sweep_rect.update(self.rect)
+        self.prev_x = x
+        self.prev_y = y
         
     def update(self, dt: float):
         """Update cannonball position"""
         if not self.active:
             return
         
+        self.prev_x = self.x
+        self.prev_y = self.y
         dx = math.cos(self.angle) * self.speed * dt
         dy = math.sin(self.angle) * self.speed * dt
         
@@ -177,34 +234,54 @@ class Cannonball:
         
         self.rect.x = int(self.x - self.radius)
         self.rect.y = int(self.y - self.radius)
+        left = int(min(self.prev_x, self.x)) - self.radius
+        top = int(min(self.prev_y, self.y)) - self.radius
+        self.sweep_rect.update(left, top, int(max(self.prev_x, self.x)) + self.radius + 1 - left,
+                               int(max(self.prev_y, self.y)) + self.radius + 1 - top)
         
-        # Check boundaries
+        # Check boundaries: dinonaktifkan scene setelah narrowphase supaya segmen terakhir tetap dicek
         if (self.x < 0 or self.x > SCREEN_WIDTH or 
             self.y < 0 or self.y > SCREEN_HEIGHT):
-            self.active = False
+            self.out_of_bounds = True
     
-    def render(self, screen: pygame.Surface):
+    def render(self, screen: pygame.Surface, alpha: float = 1.0):
         """Render cannonball"""
         if self.active:
             ShipIconRenderer.draw_cannonball(
                 screen,
-                int(self.x),
-                int(self.y),
-                self.radius
+                int(lerp(self.prev_x, self.x, alpha)),
+                int(lerp(self.prev_y, self.y, alpha)),
+                self.radius,
+                math.degrees(self.angle)
             )
 
+def _is_alive(enemy: EnemyShip) -> bool:
+    return enemy.health > 0
+
+
+def _is_active(cannonball: Cannonball) -> bool:
+    return cannonball.active
+
+
 class ShipScene(Scene):
     """Scene untuk gameplay di kapal merchant"""
     
-    def __init__(self):
+    def __init__(self, armada_size: int = 0):
         super().__init__("ship")
         self.player_ship: Ship = None
-        self.enemies: List[EnemyShip] = []
-        self.cannonballs: List[Cannonball] = []
+        # Entity di-pool: tembakan/spawn memakai ulang objek, remove O(1) lewat ActiveSet
+        self.enemy_pool: ObjectPool[EnemyShip] = ObjectPool(EnemyShip, prealloc=4)
+        self.cannonball_pool: ObjectPool[Cannonball] = ObjectPool(Cannonball, prealloc=32)
+        self.enemies: ActiveSet[EnemyShip] = ActiveSet(self.enemy_pool)
+        self.cannonballs: ActiveSet[Cannonball] = ActiveSet(self.cannonball_pool)
         self.enemy_spawn_timer = 0.0
         self.enemy_spawn_rate = ENEMY_SPAWN_RATE
         self.enemies_defeated = 0
         self.enemies_to_defeat = 5  # Harus mengalahkan 5 enemy untuk menang
+        # Armada mode: enemy disimulasikan sebagai EnemyFleet (NumPy), bukan EnemyShip per objek
+        self.fleet: EnemyFleet = EnemyFleet(armada_size) if armada_size > 0 else None
+        if self.fleet is not None:
+            self.enemies_to_defeat = max(self.enemies_to_defeat, armada_size)
         self.won = False
         self.win_timer = 0.0
         self.win_delay = 2.0  # Delay 2 detik sebelum pindah scene
@@ -217,18 +294,25 @@ class ShipScene(Scene):
         self.mouse_pos = (0, 0)
         self.mouse_clicked = False
         
-        # Fonts
-        self.font = pygame.font.Font(None, 32)
-        self.title_font = pygame.font.Font(None, 72)
-        self.subtitle_font = pygame.font.Font(None, 48)
-        self.small_font = pygame.font.Font(None, 24)
+        # Broadphase collision (diisi ulang setiap tick) dan area air untuk splash
+        self.broadphase = SpatialHash(cell_size=128)
+        self.ai_scheduler = AIScheduler(AI_NEAR_DISTANCE, AI_FAR_DISTANCE)
+        self.water_rect = pygame.Rect(0, SCREEN_HEIGHT // 2, SCREEN_WIDTH, SCREEN_HEIGHT // 2)
+        
+    def prepare(self, game_state: Dict[str, Any]) -> Dict[str, Any]:
+        """Bake ocean renderer (dipakai ulang saat kembali ke scene ini)"""
+        ocean_renderer = self.ocean_renderer
+        if ocean_renderer is None:
+            ocean_renderer = OceanRenderer(SCREEN_WIDTH, SCREEN_HEIGHT)
+        return {'ocean_renderer': ocean_renderer}
         
     def setup(self, game_state: Dict[str, Any]):
         """Setup ship scene"""
         super().setup(game_state)
+        prepared = self.take_prepared(game_state)
         
         # Initialize ocean renderer
-        self.ocean_renderer = OceanRenderer(SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.ocean_renderer = prepared['ocean_renderer']
         self.particle_system = ParticleSystem()
         
         # Start with menu
@@ -244,11 +328,7 @@ class ShipScene(Scene):
         self.player_ship.max_health = game_state.get('max_health', 100)
         
         # Reset enemies dan cannonballs
-        self.enemies.clear()
-        self.cannonballs.clear()
-        self.enemy_spawn_timer = 0.0
-        self.enemies_defeated = 0
-        self.won = False
+        self._reset_battle()
         
     def handle_event(self, event: pygame.event.Event):
         """Handle events"""
@@ -280,7 +360,7 @@ class ShipScene(Scene):
             return
         
         # Calculate angle dari ship center ke mouse
-        mouse_x, mouse_y = pygame.mouse.get_pos()
+        mouse_x, mouse_y = self.input.get_mouse_pos()
         ship_center_x = self.player_ship.rect.centerx
         ship_center_y = self.player_ship.rect.centery
         
@@ -289,8 +369,7 @@ class ShipScene(Scene):
         angle = math.atan2(dy, dx)
         
         # Create cannonball
-        cannonball = Cannonball(ship_center_x, ship_center_y, angle)
-        self.cannonballs.append(cannonball)
+        self.cannonballs.spawn(ship_center_x, ship_center_y, angle)
         
         # Create smoke effect at ship
         if self.particle_system:
@@ -304,11 +383,13 @@ class ShipScene(Scene):
         
         # Update ocean effects
         if self.ocean_renderer:
-            self.ocean_renderer.update(dt)
+            with profiler.section("ocean"):
+                self.ocean_renderer.update(dt)
         
         # Update particle system
         if self.particle_system:
-            self.particle_system.update(dt)
+            with profiler.section("particles"):
+                self.particle_system.update(dt)
         
         if self.game_state != "playing":
             return
@@ -321,11 +402,10 @@ class ShipScene(Scene):
                     # Force update scene
                     self.state['current_scene'] = 'harbor'
                     print("Switching to harbor scene...")
-                    # Force immediate update
-                    return  # State akan diupdate di get_state
+                    return  # Engine mendeteksi perubahan current_scene setelah update
             return
         
-        keys = pygame.key.get_pressed()
+        keys = self.input.get_pressed()
         
         # Update player ship
         if self.player_ship:
@@ -338,82 +418,217 @@ class ShipScene(Scene):
         
         # Spawn enemies
         self.enemy_spawn_timer += dt
-        if self.enemy_spawn_timer >= self.enemy_spawn_rate and len(self.enemies) < 3:
+        if self.fleet is not None:
+            if self.enemy_spawn_timer >= ARMADA_SPAWN_INTERVAL and len(self.fleet) < self.fleet.capacity:
+                self._spawn_enemy()
+                self.enemy_spawn_timer = 0.0
+        elif self.enemy_spawn_timer >= self.enemy_spawn_rate and len(self.enemies) < 3:
             self._spawn_enemy()
             self.enemy_spawn_timer = 0.0
         
         # Update enemies
-        for enemy in self.enemies[:]:
-            enemy.set_target(self.player_ship)
-            enemy.update(dt)
-            
-            # Check collision dengan player
-            if self.player_ship and enemy.rect.colliderect(self.player_ship.rect):
-                # Damage player
-                self.player_ship.health -= 5 * dt
-                if self.player_ship.health <= 0:
-                    self.player_ship.health = 0
-                    # Game over logic bisa ditambahkan di sini
+        with profiler.section("enemies"):
+            self._update_enemies(dt)
         
         # Update cannonballs
-        for cannonball in self.cannonballs[:]:
+        with profiler.section("cannonballs"):
+            self._update_cannonballs(dt)
+        
+        # Collision lewat broadphase: hanya pasangan yang berdekatan yang dicek
+        with profiler.section("collisions"):
+            if self.fleet is not None:
+                self._resolve_fleet_collisions(dt)
+            else:
+                self._rebuild_broadphase()
+                self._resolve_collisions(dt)
+    
+    def _update_enemies(self, dt: float):
+        """Update AI enemy"""
+        focus = self.player_ship.rect.center
+        if self.fleet is not None:
+            self.fleet.update(dt, focus)
+            return
+        # LOD berdasarkan jarak ke player: enemy jauh berpikir tiap 4/16 tick
+        self.ai_scheduler.update(self.enemies, dt, focus)
+    
+    def _update_cannonballs(self, dt: float):
+        """Update posisi cannonball"""
+        for cannonball in self.cannonballs:
             cannonball.update(dt)
-            
-            # Water splash when cannonball hits boundary
-            if not cannonball.active and cannonball.rect.colliderect(pygame.Rect(0, SCREEN_HEIGHT // 2, SCREEN_WIDTH, SCREEN_HEIGHT // 2)):
+    
+    def _expire_cannonballs(self):
+        """Nonaktifkan cannonball yang keluar layar tanpa mengenai enemy (dipanggil setelah narrowphase)"""
+        for cannonball in self.cannonballs:
+            if cannonball.active and cannonball.out_of_bounds:
+                cannonball.active = False
+                
+                # Water splash when cannonball hits boundary
+                if cannonball.rect.colliderect(self.water_rect):
+                    if self.particle_system:
+                        self.particle_system.create_water_splash(cannonball.x, cannonball.y, 8)
+                    if self.ocean_renderer:
+                        self.ocean_renderer.splash(cannonball.x, cannonball.y)
+    
+    def _rebuild_broadphase(self):
+        """Daftarkan player ship, enemy dan cannonball aktif ke spatial hash"""
+        broadphase = self.broadphase
+        broadphase.clear()
+        if self.player_ship:
+            broadphase.insert(self.player_ship, self.player_ship.rect, 'player')
+        for enemy in self.enemies:
+            broadphase.insert(enemy, enemy.rect, 'enemy')
+        for cannonball in self.cannonballs:
+            if cannonball.active:
+                # Seluruh lintasan tick ini, bukan hanya posisi akhir (cepat tidak menembus enemy)
+                broadphase.insert(cannonball, cannonball.sweep_rect, 'cannonball')
+    
+    def _resolve_collisions(self, dt: float):
+        """Proses pasangan enemy-player dan cannonball-enemy dari broadphase"""
+        # Enemy menabrak player
+        for enemy, player_ship in self.broadphase.query_pairs('enemy', 'player'):
+            # Damage player
+            player_ship.health -= 5 * dt
+            if player_ship.health <= 0:
+                player_ship.health = 0
+                # Game over logic bisa ditambahkan di sini
+        
+        # Narrowphase swept circle: waktu tabrakan tiap kandidat sepanjang lintasan cannonball
+        candidates: Dict[Cannonball, List] = {}
+        for cannonball, enemy in self.broadphase.query_pairs('cannonball', 'enemy'):
+            t = swept_circle_rect((cannonball.prev_x, cannonball.prev_y), (cannonball.x, cannonball.y),
+                                  cannonball.radius, enemy.rect)
+            if t is not None:
+                candidates.setdefault(cannonball, []).append((t, enemy))
+        
+        # Cannonball mengenai enemy yang pertama dilewati (tiap cannonball hanya mengenai satu enemy)
+        defeated = False
+        for cannonball, hits in candidates.items():
+            hits.sort(key=itemgetter(0))
+            for _, enemy in hits:
+                if enemy.health <= 0:
+                    continue
+                enemy.health -= cannonball.damage
+                cannonball.active = False
+                
+                # Create impact effect
                 if self.particle_system:
-                    self.particle_system.create_water_splash(cannonball.x, cannonball.y, 8)
-            
-            # Check collision dengan enemies
-            for enemy in self.enemies[:]:
-                if cannonball.active and cannonball.rect.colliderect(enemy.rect):
-                    enemy.health -= cannonball.damage
+                    self.particle_system.create_explosion(enemy.rect.centerx, enemy.rect.centery, (255, 200, 0), 10)
+                
+                if enemy.health <= 0:
+                    defeated = True
+                    self._enemy_destroyed(enemy.rect.centerx, enemy.rect.centery)
+                break
+        
+        # Remove enemy yang kalah dan cannonball yang tidak aktif
+        if defeated:
+            self.enemies.sweep(_is_alive)
+        self._expire_cannonballs()
+        self.cannonballs.sweep(_is_active)
+    
+    def _resolve_fleet_collisions(self, dt: float):
+        """Collision armada: overlap dicek sekaligus untuk semua kapal lewat array"""
+        fleet = self.fleet
+        if len(fleet) == 0:
+            self._expire_cannonballs()
+            self.cannonballs.sweep(_is_active)
+            return
+        
+        # Enemy menabrak player (damage per kapal yang menempel)
+        touching = int(np.count_nonzero(fleet.overlaps(self.player_ship.rect)))
+        if touching:
+            self.player_ship.health = max(0, self.player_ship.health - 5 * dt * touching)
+        
+        # Swept circle semua cannonball x semua kapal; cannonball mengenai kapal hidup yang pertama dilewati
+        active = [cannonball for cannonball in self.cannonballs if cannonball.active]
+        if active:
+            path = np.array([(cannonball.prev_x, cannonball.prev_y, cannonball.x, cannonball.y)
+                             for cannonball in active])
+            times = swept_circle_rects(path[:, :2], path[:, 2:], CANNONBALL_SIZE, fleet.rect_array())
+            for row in np.flatnonzero(np.isfinite(times).any(axis=1)).tolist():
+                cannonball = active[row]
+                hit = np.flatnonzero(np.isfinite(times[row]))
+                for index in hit[np.argsort(times[row, hit], kind='stable')].tolist():
+                    if fleet.health[index] <= 0:
+                        continue
+                    fleet.health[index] -= cannonball.damage
                     cannonball.active = False
-                    
-                    # Create impact effect
+                    center_x, center_y = fleet.center(index)
                     if self.particle_system:
-                        self.particle_system.create_explosion(enemy.rect.centerx, enemy.rect.centery, (255, 200, 0), 10)
-                    
-                    if enemy.health <= 0:
-                        # Create explosion effect
-                        if self.particle_system:
-                            self.particle_system.create_explosion(enemy.rect.centerx, enemy.rect.centery, (255, 100, 0), 25)
-                            self.particle_system.create_smoke(enemy.rect.centerx, enemy.rect.centery, 20)
-                        
-                        self.enemies.remove(enemy)
-                        self.enemies_defeated += 1
-                        
-                        # Check win condition
-                        if self.enemies_defeated >= self.enemies_to_defeat:
-                            if not self.won:
-                                self.won = True
-                                self.win_timer = 0.0
-                                print(f"Kemenangan! Mengalahkan {self.enemies_defeated} enemies")
-                                # Immediately update state to trigger scene change
-                                if self.state:
-                                    self.state['current_scene'] = 'harbor'
-        
-        # Remove inactive cannonballs
-        self.cannonballs = [cb for cb in self.cannonballs if cb.active]
+                        self.particle_system.create_explosion(center_x, center_y, (255, 200, 0), 10)
+                    if fleet.health[index] <= 0:
+                        self._enemy_destroyed(center_x, center_y)
+                    break
+        
+        fleet.remove_dead()
+        self._expire_cannonballs()
+        self.cannonballs.sweep(_is_active)
+    
+    def _enemy_destroyed(self, center_x: int, center_y: int):
+        """Efek ledakan, hitung kill dan cek kondisi menang"""
+        # Create explosion effect
+        if self.particle_system:
+            self.particle_system.create_explosion(center_x, center_y, (255, 100, 0), 25)
+            self.particle_system.create_smoke(center_x, center_y, 20)
+        if self.ocean_renderer:
+            # Kapal tenggelam: ripple besar
+            self.ocean_renderer.splash(center_x, center_y, 150.0)
+        
+        self.enemies_defeated += 1
+        
+        # Check win condition
+        if self.enemies_defeated >= self.enemies_to_defeat:
+            if not self.won:
+                self.won = True
+                self.win_timer = 0.0
+                print(f"Kemenangan! Mengalahkan {self.enemies_defeated} enemies")
+                if self.state:
+                    self.state['current_harbor'] = self._next_harbor()
+                # Siapkan harbor tujuan selama countdown supaya pindah scene tanpa hitch
+                self.preload_request = 'harbor'
+    
+    def _next_harbor(self) -> str:
+        """Harbor tujuan: pulau pertama yang belum dikunjungi, atau pulau setelah harbor terakhir"""
+        visited = self.state.get('visited_islands', [])
+        for island in ISLANDS:
+            if island['name'] not in visited:
+                return island['harbor']
+        harbors = [island['harbor'] for island in ISLANDS]
+        current = self.state.get('current_harbor')
+        index = harbors.index(current) + 1 if current in harbors else 0
+        return harbors[index % len(harbors)]
     
     def _spawn_enemy(self):
         """Spawn enemy ship di edge of screen"""
-        side = random.randint(0, 3)
+        side = _rng.randint(0, 3)
         if side == 0:  # Top
-            x = random.randint(0, SCREEN_WIDTH)
+            x = _rng.randint(0, SCREEN_WIDTH)
             y = -50
         elif side == 1:  # Right
             x = SCREEN_WIDTH + 50
-            y = random.randint(0, SCREEN_HEIGHT)
+            y = _rng.randint(0, SCREEN_HEIGHT)
         elif side == 2:  # Bottom
-            x = random.randint(0, SCREEN_WIDTH)
+            x = _rng.randint(0, SCREEN_WIDTH)
             y = SCREEN_HEIGHT + 50
         else:  # Left
             x = -50
-            y = random.randint(0, SCREEN_HEIGHT)
+            y = _rng.randint(0, SCREEN_HEIGHT)
         
-        enemy = EnemyShip(x, y)
-        self.enemies.append(enemy)
+        if self.fleet is not None:
+            self.fleet.spawn(x, y)
+        else:
+            enemy = self.enemies.spawn(x, y)
+            enemy.set_target(self.player_ship)
+            self.ai_scheduler.register(enemy)
+    
+    def _reset_battle(self):
+        """Kosongkan enemy dan cannonball"""
+        self.enemies.clear()
+        self.cannonballs.clear()
+        self.enemy_spawn_timer = 0.0
+        self.enemies_defeated = 0
+        self.won = False
+        if self.fleet is not None:
+            self.fleet.clear()
     
     def _setup_menu_buttons(self):
         """Setup menu buttons"""
@@ -442,11 +657,11 @@ class ShipScene(Scene):
         self.game_state = "playing"
         self.button_manager.clear()
         # Reset game state
-        self.enemies.clear()
-        self.cannonballs.clear()
-        self.enemy_spawn_timer = 0.0
-        self.enemies_defeated = 0
-        self.won = False
+        self._reset_battle()
+        if self.fleet is not None:
+            # Armada langsung diisi penuh saat game dimulai
+            for _ in range(self.fleet.capacity):
+                self._spawn_enemy()
     
     def _show_tutorial(self):
         """Show tutorial screen"""
@@ -457,22 +672,23 @@ class ShipScene(Scene):
         """Render menu screen"""
         # Render ocean background
         if self.ocean_renderer:
-            self.ocean_renderer.render(screen)
+            with profiler.section("ocean"):
+                self.ocean_renderer.render(screen)
         
         # Title
-        title = self.title_font.render("SPICE TRADER 1400", True, (255, 255, 100))
+        title = text_cache.render("SPICE TRADER 1400", 72, (255, 255, 100))
         title_rect = title.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 150))
         
         # Glow effect
         for offset in [(3, 3), (-3, 3), (3, -3), (-3, -3)]:
-            glow = self.title_font.render("SPICE TRADER 1400", True, (255, 200, 50))
+            glow = text_cache.render("SPICE TRADER 1400", 72, (255, 200, 50))
             glow_rect = glow.get_rect(center=(title_rect.centerx + offset[0], title_rect.centery + offset[1]))
             screen.blit(glow, glow_rect)
         
         screen.blit(title, title_rect)
         
         # Subtitle
-        subtitle = self.subtitle_font.render("Battle at Sea", True, (200, 200, 255))
+        subtitle = text_cache.render("Battle at Sea", 48, (200, 200, 255))
         subtitle_rect = subtitle.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 80))
         screen.blit(subtitle, subtitle_rect)
         
@@ -483,7 +699,8 @@ class ShipScene(Scene):
         """Render tutorial screen"""
         # Render ocean background
         if self.ocean_renderer:
-            self.ocean_renderer.render(screen)
+            with profiler.section("ocean"):
+                self.ocean_renderer.render(screen)
         
         # Tutorial panel
         panel_width = 700
@@ -499,7 +716,7 @@ class ShipScene(Scene):
         pygame.draw.rect(screen, (100, 150, 200), panel_rect, 4)
         
         # Title
-        title = self.subtitle_font.render("Cara Bermain", True, (255, 255, 100))
+        title = text_cache.render("Cara Bermain", 48, (255, 255, 100))
         title_rect = title.get_rect(center=(panel_x + panel_width // 2, panel_y + 40))
         screen.blit(title, title_rect)
         
@@ -528,42 +745,58 @@ class ShipScene(Scene):
         y_offset = 100
         for i, line in enumerate(instructions):
             if line.startswith("🎮") or line.startswith("🎯") or line.startswith("💡"):
-                text = self.font.render(line, True, (255, 255, 100))
+                text = text_cache.render(line, 32, (255, 255, 100))
             elif line == "":
                 continue
             else:
-                text = self.small_font.render(line, True, (255, 255, 255))
+                text = text_cache.render(line, 24, (255, 255, 255))
             screen.blit(text, (panel_x + 30, panel_y + y_offset + i * 25))
     
     def render(self, screen: pygame.Surface):
         """Render scene"""
         if self.game_state == "menu":
-            self._render_menu(screen)
+            with profiler.section("menu"):
+                self._render_menu(screen)
             return
         elif self.game_state == "tutorial":
-            self._render_tutorial(screen)
+            with profiler.section("tutorial"):
+                self._render_tutorial(screen)
             return
         
         # Render ocean dengan efek realistis
         if self.ocean_renderer:
-            self.ocean_renderer.render(screen)
+            with profiler.section("ocean"):
+                self.ocean_renderer.render(screen)
+        
+        alpha = self.render_alpha
         
         # Draw player ship
         if self.player_ship:
-            self.player_ship.render(screen)
+            with profiler.section("player_ship"):
+                self.player_ship.render(screen, alpha)
         
         # Draw enemies
-        for enemy in self.enemies:
-            enemy.render(screen)
+        with profiler.section("enemies"):
+            for enemy in self.enemies:
+                enemy.render(screen, alpha)
+            if self.fleet is not None:
+                self.fleet.render(screen, alpha)
         
         # Draw cannonballs
-        for cannonball in self.cannonballs:
-            cannonball.render(screen)
+        with profiler.section("cannonballs"):
+            for cannonball in self.cannonballs:
+                cannonball.render(screen, alpha)
         
         # Draw particles
         if self.particle_system:
-            self.particle_system.render(screen)
+            with profiler.section("particles"):
+                self.particle_system.render(screen)
         
+        with profiler.section("hud"):
+            self._render_hud(screen)
+    
+    def _render_hud(self, screen: pygame.Surface):
+        """Render HUD panel dan win message"""
         # HUD Panel
         hud_panel = pygame.Rect(10, 10, 350, 120)
         overlay = pygame.Surface((hud_panel.width, hud_panel.height), pygame.SRCALPHA)
@@ -572,16 +805,16 @@ class ShipScene(Scene):
         pygame.draw.rect(screen, (100, 150, 200), hud_panel, 2)
         
         # Instructions
-        instruction_text = self.small_font.render("WASD: Gerak | Z: Tembak", True, (255, 255, 255))
+        instruction_text = text_cache.render("WASD: Gerak | Z: Tembak", 24, (255, 255, 255))
         screen.blit(instruction_text, (20, 20))
         
         # Enemy count
-        enemy_count_text = self.font.render(f"Enemy: {self.enemies_defeated}/{self.enemies_to_defeat}", True, (255, 255, 255))
+        enemy_count_text = text_cache.render(f"Enemy: {self.enemies_defeated}/{self.enemies_to_defeat}", 32, (255, 255, 255))
         screen.blit(enemy_count_text, (20, 50))
         
         # Health info
         if self.player_ship:
-            health_text = self.small_font.render(f"Health: {int(self.player_ship.health)}/{self.player_ship.max_health}", True, (255, 255, 255))
+            health_text = text_cache.render(f"Health: {int(self.player_ship.health)}/{self.player_ship.max_health}", 24, (255, 255, 255))
             screen.blit(health_text, (20, 85))
         
         # Win message dengan animasi
@@ -593,12 +826,12 @@ class ShipScene(Scene):
             screen.blit(overlay, (0, 0))
             
             # Win text dengan glow effect
-            win_text = self.title_font.render("KEMENANGAN!", True, (255, 255, 0))
+            win_text = text_cache.render("KEMENANGAN!", 72, (255, 255, 0))
             text_rect = win_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50))
             
             # Draw glow effect
             for offset in [(3, 3), (-3, 3), (3, -3), (-3, -3)]:
-                glow_text = self.title_font.render("KEMENANGAN!", True, (255, 200, 0))
+                glow_text = text_cache.render("KEMENANGAN!", 72, (255, 200, 0))
                 glow_rect = glow_text.get_rect(center=(text_rect.centerx + offset[0], text_rect.centery + offset[1]))
                 screen.blit(glow_text, glow_rect)
             
@@ -607,7 +840,8 @@ class ShipScene(Scene):
             # Subtitle dengan countdown
             remaining_time = max(0, self.win_delay - self.win_timer)
             if remaining_time > 0:
-                subtitle = self.font.render(f"Menuju ke Harbor... ({int(remaining_time) + 1})", True, (255, 255, 255))
+                harbor = self.state.get('current_harbor', 'Harbor') if self.state else 'Harbor'
+                subtitle = text_cache.render(f"Menuju ke {harbor}... ({int(remaining_time) + 1})", 32, (255, 255, 255))
                 subtitle_rect = subtitle.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 30))
                 screen.blit(subtitle, subtitle_rect)
     
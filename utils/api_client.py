@@ -1,9 +1,20 @@
 """
 API Client untuk komunikasi dengan Flask backend
 """
+import copy
 import requests
 import json
-from typing import Dict, Any, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, Optional, Set
+
+# Batas waktu request (detik) supaya server yang hang tidak menahan thread selamanya
+API_TIMEOUT = 2.0
+
+# Key yang berubah tiap tick: tidak ikut sync periodik, hanya dikirim saat registrasi dan shutdown
+SYNC_EXCLUDED_KEYS = ('ship_position', 'harbor_position')
+
+# Jeda maksimum (detik) antar percobaan setelah request gagal
+SYNC_MAX_BACKOFF = 30.0
 
 class APIClient:
     """Client untuk berkomunikasi dengan Flask API"""
@@ -15,7 +26,7 @@ class APIClient:
     def get_game_state(self) -> Optional[Dict[str, Any]]:
         """Mendapatkan game state dari server"""
         try:
-            response = requests.get(f"{self.base_url}/api/game/state", params={'player_id': self.player_id})
+            response = requests.get(f"{self.base_url}/api/game/state", params={'player_id': self.player_id}, timeout=API_TIMEOUT)
             if response.status_code == 200:
                 return response.json()
         except:
@@ -26,7 +37,19 @@ class APIClient:
         """Menyimpan game state ke server"""
         try:
             state['player_id'] = self.player_id
-            response = requests.post(f"{self.base_url}/api/game/state", json=state)
+            response = requests.post(f"{self.base_url}/api/game/state", json=state, timeout=API_TIMEOUT)
+            return response.status_code == 200
+        except:
+            return False
+    
+    def patch_game_state(self, changes: Dict[str, Any]) -> bool:
+        """Mengirim hanya key state yang berubah ke server"""
+        try:
+            data = {
+                'player_id': self.player_id,
+                'changes': changes
+            }
+            response = requests.patch(f"{self.base_url}/api/game/state", json=data, timeout=API_TIMEOUT)
             return response.status_code == 200
         except:
             return False
@@ -40,7 +63,7 @@ class APIClient:
                 'quantity': quantity,
                 'price': price
             }
-            response = requests.post(f"{self.base_url}/api/game/buy-spice", json=data)
+            response = requests.post(f"{self.base_url}/api/game/buy-spice", json=data, timeout=API_TIMEOUT)
             if response.status_code == 200:
                 return response.json()
         except:
@@ -54,10 +77,83 @@ class APIClient:
                 'player_id': self.player_id,
                 'scene': scene
             }
-            response = requests.post(f"{self.base_url}/api/game/change-scene", json=data)
+            response = requests.post(f"{self.base_url}/api/game/change-scene", json=data, timeout=API_TIMEOUT)
             if response.status_code == 200:
                 return response.json()
         except:
             pass
         return None
 
+
+class APISync:
+    """Sinkronkan game state ke server: hanya key yang berubah yang dikirim (PATCH), dibatasi min_interval"""
+    
+    def __init__(self, client: APIClient, store, min_interval: float = 2.0,
+                 excluded_keys=SYNC_EXCLUDED_KEYS):
+        self.client = client
+        self.store = store
+        self.min_interval = min_interval  # Batas frekuensi request
+        self.excluded_keys = frozenset(excluded_keys)
+        self.pending: Set[str] = set()
+        self._registered = False
+        self._interval = min_interval  # Naik (backoff) setelah request gagal
+        self._since_sync = min_interval
+        # Request jalan di satu worker dengan salinan value, jadi game loop tidak menunggu jaringan
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='api-sync')
+        self._future: Optional[Future] = None
+        self._in_flight: Set[str] = set()
+        store.subscribe(None, self._on_change)
+    
+    def _on_change(self, changed_keys):
+        """Subscriber StateStore"""
+        self.pending.update(key for key in changed_keys if key not in self.excluded_keys)
+    
+    def update(self, dt: float):
+        """Cek hasil request sebelumnya, lalu kirim perubahan jika interval sudah lewat"""
+        self._since_sync += dt
+        self._poll()
+        if self._future is None and self.pending and self._since_sync >= self._interval:
+            self._submit(self.pending)
+    
+    def _submit(self, keys):
+        """Salin value di main thread lalu kirim di worker"""
+        self._since_sync = 0.0
+        self.client.player_id = self.store.get('player_id', 'default')
+        self._in_flight = set(keys)
+        self.pending = set()
+        if not self._registered:
+            # Server hanya menerima PATCH untuk player yang sudah ada: kirim state lengkap sekali
+            self._future = self._executor.submit(self._register, self.store.snapshot())
+        else:
+            changes = {key: copy.deepcopy(self.store[key]) for key in self._in_flight if key in self.store}
+            self._future = self._executor.submit(self.client.patch_game_state, changes)
+    
+    def _register(self, state: Dict[str, Any]) -> bool:
+        """Dijalankan di worker"""
+        self._registered = self.client.save_game_state(state)
+        return self._registered
+    
+    def _poll(self):
+        """Ambil hasil request yang sudah selesai; key dikembalikan ke pending jika gagal"""
+        if self._future is None or not self._future.done():
+            return
+        synced = self._future.result()
+        self._future = None
+        if synced:
+            self._interval = self.min_interval
+        else:
+            self.pending |= self._in_flight
+            self._interval = min(self._interval * 2, SYNC_MAX_BACKOFF)
+        self._in_flight = set()
+    
+    def shutdown(self):
+        """Tunggu request yang berjalan lalu kirim sisa perubahan (termasuk posisi) sekali lagi"""
+        if self._future is not None:
+            self._future.result()
+            self._poll()
+        keys = self.pending | {key for key in self.excluded_keys if key in self.store}
+        if keys:
+            self._submit(keys)
+            self._future.result()
+            self._poll()
+        self._executor.shutdown()
@@ -0,0 +1,117 @@
+"""
+Collision - Continuous collision (swept circle vs AABB) supaya projectile cepat tidak menembus target
+
+Lingkaran radius R yang bergerak dari p0 ke p1 menabrak rect jika segmen p0->p1 masuk ke rounded rect
+(rect diperbesar R dengan sudut membulat) = gabungan 2 box yang diperbesar per sumbu dan 4 lingkaran sudut.
+Hasil berupa waktu tabrakan t di [0, 1] sepanjang segmen (0 jika sudah overlap di awal).
+"""
+import math
+import numpy as np
+import pygame
+from typing import Optional, Tuple
+
+
+def _segment_box(x0: float, y0: float, dx: float, dy: float,
+                 left: float, top: float, right: float, bottom: float) -> Optional[float]:
+    """Waktu masuk segmen ke box (slab test) atau None"""
+    t_min, t_max = 0.0, 1.0
+    for p, d, lo, hi in ((x0, dx, left, right), (y0, dy, top, bottom)):
+        if d == 0:
+            if p < lo or p > hi:
+                return None
+            continue
+        t1 = (lo - p) / d
+        t2 = (hi - p) / d
+        if t1 > t2:
+            t1, t2 = t2, t1
+        t_min = max(t_min, t1)
+        t_max = min(t_max, t2)
+        if t_min > t_max:
+            return None
+    return t_min
+
+
+def _segment_circle(x0: float, y0: float, dx: float, dy: float,
+                    cx: float, cy: float, radius: float) -> Optional[float]:
+    """Waktu masuk segmen ke lingkaran atau None"""
+    fx = x0 - cx
+    fy = y0 - cy
+    c = fx * fx + fy * fy - radius * radius
+    if c <= 0:
+        return 0.0
+    b = fx * dx + fy * dy
+    if b >= 0:
+        return None  # Bergerak menjauh
+    a = dx * dx + dy * dy
+    disc = b * b - a * c
+    if disc < 0:
+        return None
+    t = (-b - math.sqrt(disc)) / a
+    return t if t <= 1 else None
+
+
+def swept_circle_rect(start: Tuple[float, float], end: Tuple[float, float], radius: float,
+                      rect: pygame.Rect) -> Optional[float]:
+    """Waktu tabrakan lingkaran yang bergerak dari start ke end dengan rect, atau None"""
+    x0, y0 = start
+    dx = end[0] - x0
+    dy = end[1] - y0
+    left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
+    hits = [
+        _segment_box(x0, y0, dx, dy, left, top - radius, right, bottom + radius),
+        _segment_box(x0, y0, dx, dy, left - radius, top, right + radius, bottom)
+    ]
+    for cx, cy in ((left, top), (right, top), (left, bottom), (right, bottom)):
+        hits.append(_segment_circle(x0, y0, dx, dy, cx, cy, radius))
+    hits = [t for t in hits if t is not None]
+    return min(hits) if hits else None
+
+
+def _segment_box_many(x0, y0, dx, dy, left, top, right, bottom) -> np.ndarray:
+    t_min = np.zeros(np.broadcast(x0, left).shape)
+    t_max = np.ones_like(t_min)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for p, d, lo, hi in ((x0, dx, left, right), (y0, dy, top, bottom)):
+            t1 = (lo - p) / d
+            t2 = (hi - p) / d
+            # Segmen sejajar sumbu: selalu di dalam slab atau tidak pernah masuk
+            inside = (p >= lo) & (p <= hi)
+            parallel = d == 0
+            enter = np.where(parallel, np.where(inside, -np.inf, np.inf), np.minimum(t1, t2))
+            leave = np.where(parallel, np.where(inside, np.inf, -np.inf), np.maximum(t1, t2))
+            t_min = np.maximum(t_min, enter)
+            t_max = np.minimum(t_max, leave)
+    return np.where(t_min <= t_max, t_min, np.inf)
+
+
+def _segment_circle_many(x0, y0, dx, dy, cx, cy, radius) -> np.ndarray:
+    fx = x0 - cx
+    fy = y0 - cy
+    c = fx * fx + fy * fy - radius * radius
+    b = fx * dx + fy * dy
+    a = dx * dx + dy * dy
+    disc = b * b - a * c
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = (-b - np.sqrt(np.maximum(disc, 0))) / a
+    hit = (b < 0) & (disc >= 0) & (t <= 1)
+    return np.where(c <= 0, 0.0, np.where(hit, t, np.inf))
+
+
+def swept_circle_rects(starts: np.ndarray, ends: np.ndarray, radius: float, rects: np.ndarray) -> np.ndarray:
+    """Versi NumPy: waktu tabrakan (len(starts), len(rects)); np.inf jika tidak menabrak.
+
+    starts/ends: array (C, 2) posisi center, rects: array (N, 4) berisi (x, y, w, h).
+    """
+    x0 = starts[:, 0:1]
+    y0 = starts[:, 1:2]
+    dx = ends[:, 0:1] - x0
+    dy = ends[:, 1:2] - y0
+    left = rects[None, :, 0]
+    top = rects[None, :, 1]
+    right = left + rects[None, :, 2]
+    bottom = top + rects[None, :, 3]
+    t = np.minimum(_segment_box_many(x0, y0, dx, dy, left, top - radius, right, bottom + radius),
+                   _segment_box_many(x0, y0, dx, dy, left - radius, top, right + radius, bottom))
+    for cx, cy in ((left, top), (right, top), (left, bottom), (right, bottom)):
+        t = np.minimum(t, _segment_circle_many(x0, y0, dx, dy, cx, cy, radius))
+    return t
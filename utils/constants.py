@@ -5,6 +5,9 @@ Game Constants
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 
+# Ocean (jumlah wave layer; titik wave dihitung NumPy sehingga layer tambahan murah)
+OCEAN_WAVE_LAYERS = 3
+
 # Colors
 COLOR_OCEAN_BLUE = (30, 60, 90)
 COLOR_SKY_BLUE = (135, 206, 235)
@@ -25,11 +28,32 @@ ENEMY_SPEED = 100
 ENEMY_SPAWN_RATE = 3.0  # seconds
 ENEMY_HEALTH = 50
 
+# AI level-of-detail (lihat game_engine/ai_scheduler.py): tier setiap 1 / 4 / 16 tick
+AI_NEAR_DISTANCE = 300
+AI_FAR_DISTANCE = 700
+
+# Armada mode (enemy fleet NumPy, lihat scenes/ship/enemy_fleet.py)
+ARMADA_DEFAULT_SIZE = 60
+ARMADA_SEPARATION_RADIUS = 70.0
+ARMADA_SEPARATION_WEIGHT = 1.5
+ARMADA_SPAWN_INTERVAL = 0.25  # seconds, mengisi ulang armada sampai ukuran penuh
+# Armada berkumpul rapat di sekitar player, jadi radius tier AI-nya lebih kecil
+ARMADA_AI_NEAR_DISTANCE = 150
+ARMADA_AI_FAR_DISTANCE = 300
+
 # Projectile constants
 CANNONBALL_SPEED = 400
 CANNONBALL_DAMAGE = 25
 CANNONBALL_SIZE = 8
 
+# Harbor world constants
+HARBOR_WORLD_WIDTH = SCREEN_WIDTH * 2
+HARBOR_WORLD_HEIGHT = SCREEN_HEIGHT * 2
+HARBOR_CHUNK_SIZE = 256
+# Streaming NPC/building dari peta harbor: chunk dimuat dalam margin load dari view, dibuang di luar margin evict
+HARBOR_STREAM_LOAD_MARGIN = 256
+HARBOR_STREAM_EVICT_MARGIN = 1024
+
 # Spices
 SPICES = {
     'cengkeh': {'name': 'Cengkeh', 'price': 50, 'description': 'Rempah rempah dari Maluku'},
@@ -6,10 +6,13 @@ import os
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+# Path database default; bisa diganti lewat environment (mis. bench memakai file sementara)
+DB_PATH = os.environ.get('SPICE_TRADER_DB', 'game_data.db')
+
 class GameDatabase:
     """Database untuk menyimpan game state dan inventory"""
     
-    def __init__(self, db_path: str = "game_data.db"):
+    def __init__(self, db_path: str = DB_PATH):
         self.db_path = db_path
         self._init_database()
     
@@ -68,6 +71,20 @@ class GameDatabase:
             )
         ''')
         
+        # Table untuk bitmap eksplorasi (fog of war) per player per peta
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS exploration (
+                player_id TEXT NOT NULL,
+                map_name TEXT NOT NULL,
+                cell_size INTEGER NOT NULL,
+                cols INTEGER NOT NULL,
+                rows INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (player_id, map_name)
+            )
+        ''')
+        
         conn.commit()
         conn.close()
     
@@ -213,6 +230,70 @@ class GameDatabase:
                 'story_progress': result[4]
             }
         return None
+    
+    def save_exploration(self, player_id: str, map_name: str, cell_size: int, cols: int, rows: int, data: bytes):
+        """Save bitmap eksplorasi (bitset ter-kompres) untuk satu peta"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            INSERT OR REPLACE INTO exploration (player_id, map_name, cell_size, cols, rows, data, last_updated)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (player_id, map_name, cell_size, cols, rows, sqlite3.Binary(data), datetime.now()))
+        
+        conn.commit()
+        conn.close()
+    
+    def get_exploration(self, player_id: str, map_name: str) -> Optional[Dict[str, Any]]:
+        """Get bitmap eksplorasi untuk satu peta"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            SELECT cell_size, cols, rows, data FROM exploration
+            WHERE player_id = ? AND map_name = ?
+        ''', (player_id, map_name))
+        
+        result = cursor.fetchone()
+        conn.close()
+        
+        if result:
+            return {
+                'cell_size': result[0],
+                'cols': result[1],
+                'rows': result[2],
+                'data': bytes(result[3])
+            }
+        return None
+
+class StatePersister:
+    """Simpan game state ke database hanya jika key yang dipersist berubah"""
+    
+    PERSISTED_KEYS = ('coins', 'health', 'max_health', 'current_scene', 'story_progress')
+    
+    def __init__(self, database: GameDatabase, store, min_interval: float = 1.0):
+        self.database = database
+        self.store = store
+        self.min_interval = min_interval  # Batas frekuensi tulis (mis. health turun tiap tick)
+        self.dirty = False
+        self._since_save = min_interval
+        store.subscribe(self.PERSISTED_KEYS, self._on_change)
+    
+    def _on_change(self, changed_keys):
+        """Subscriber StateStore"""
+        self.dirty = True
+    
+    def update(self, dt: float):
+        """Tulis ke database jika ada perubahan dan interval minimum sudah lewat"""
+        self._since_save += dt
+        if self.dirty and self._since_save >= self.min_interval:
+            self.save_now()
+    
+    def save_now(self):
+        """Tulis state sekarang ke database"""
+        self.database.save_game_state(self.store.get('player_id', 'default'), self.store)
+        self.dirty = False
+        self._since_save = 0.0
 
 # Global database instance
 db = GameDatabase()
@@ -0,0 +1,80 @@
+"""
+Dialog Panel - Panel dialog retained-mode: bagian statis di-bake sekali, region dinamis di-render ulang
+hanya saat key game state yang ditampilkannya berubah
+
+Panel menyimpan dua surface: base (frame, judul, baris item; tidak pernah berubah) dan surface hasil
+komposisi yang di-blit ke layar. Saat versi key sebuah region berubah, area region di-restore dari base
+lalu painter region menggambar ulang isinya dengan clip di area tersebut. Dialog yang terbuka tanpa
+perubahan state cukup satu blit per frame.
+"""
+import pygame
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from utils.surfaces import optimize_surface
+
+# Painter menggambar ke surface panel; koordinat lokal panel (0, 0 = pojok kiri atas dialog)
+PanelPainter = Callable[[pygame.Surface], None]
+
+
+class _Region:
+    __slots__ = ('rect', 'painter', 'keys', 'versions')
+
+    def __init__(self, rect: pygame.Rect, painter: PanelPainter, keys: Tuple[str, ...]):
+        self.rect = rect
+        self.painter = painter
+        self.keys = keys
+        self.versions: Optional[Tuple[int, ...]] = None
+
+
+class DialogPanel:
+    """Surface dialog ter-cache dengan invalidation per region berdasarkan versi key StateStore"""
+
+    def __init__(self, x: int, y: int, width: int, height: int, paint_base: PanelPainter):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.paint_base = paint_base
+        self.regions: Dict[str, _Region] = {}
+        self.base: Optional[pygame.Surface] = None
+        self.surface: Optional[pygame.Surface] = None
+        self.repaints = 0  # Jumlah region yang di-render ulang (untuk profiling)
+
+    def add_region(self, name: str, rect: Tuple[int, int, int, int], painter: PanelPainter,
+                   keys: Iterable[str]):
+        """Daftarkan region dinamis (rect lokal panel) yang di-render ulang saat salah satu keys berubah"""
+        self.regions[name] = _Region(pygame.Rect(rect), painter, tuple(keys))
+
+    def invalidate(self, region: Optional[str] = None):
+        """Paksa region (atau semua region) di-render ulang pada render berikutnya"""
+        for name, entry in self.regions.items():
+            if region is None or name == region:
+                entry.versions = None
+
+    def _bake_base(self):
+        """Bake bagian statis dan salinannya sebagai surface komposisi"""
+        base = pygame.Surface(self.rect.size)
+        self.paint_base(base)
+        self.base = optimize_surface(base)
+        self.surface = self.base.copy()
+        self.invalidate()
+
+    def _stale_regions(self, state) -> List[_Region]:
+        """Region yang versi key-nya berbeda dari saat terakhir di-render (versi baru disimpan)"""
+        stale = []
+        for entry in self.regions.values():
+            versions = tuple(state.version_of(key) for key in entry.keys) if state is not None else ()
+            if versions != entry.versions:
+                entry.versions = versions
+                stale.append(entry)
+        return stale
+
+    def render(self, screen: pygame.Surface, state=None):
+        """Render ulang region yang berubah lalu blit panel ke screen"""
+        if self.base is None:
+            self._bake_base()
+        surface = self.surface
+        for entry in self._stale_regions(state):
+            surface.blit(self.base, entry.rect, entry.rect)
+            surface.set_clip(entry.rect)
+            entry.painter(surface)
+            surface.set_clip(None)
+            self.repaints += 1
+        screen.blit(surface, self.rect)
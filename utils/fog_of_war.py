@@ -0,0 +1,107 @@
+"""
+Fog of War - Bitmap eksplorasi per sel world (1 bit per sel) untuk minimap dan peta laut
+
+Bit di-pack per baris dengan NumPy (np.packbits) sehingga peta berjuta sel hanya ratusan KB di memori,
+dan disimpan ke database sebagai blob zlib. Reveal di sekitar player hanya membongkar byte di dalam
+radius dan hanya berjalan saat player pindah sel; sel yang baru terbuka dikembalikan supaya mask
+minimap cukup di-update di sel tersebut.
+"""
+import math
+import zlib
+import numpy as np
+from typing import Optional, Tuple
+
+# Ukuran satu sel eksplorasi dalam pixel world
+EXPLORATION_CELL_SIZE = 32
+
+Cells = Tuple[np.ndarray, np.ndarray]
+_NO_CELLS: Cells = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+
+
+class ExplorationMap:
+    """Bitset sel yang sudah dijelajahi untuk satu peta"""
+
+    def __init__(self, world_width: int, world_height: int, cell_size: int = EXPLORATION_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cols = max(1, math.ceil(world_width / cell_size))
+        self.rows = max(1, math.ceil(world_height / cell_size))
+        # Baris di-pack per 8 kolom (bit 7 = kolom pertama byte, urutan np.packbits)
+        self.bits = np.zeros((self.rows, (self.cols + 7) // 8), dtype=np.uint8)
+        self.explored = 0
+        self.dirty = False  # Ada sel baru yang belum disimpan ke database
+        self._last_reveal: Optional[Tuple[int, int, float]] = None
+
+    def __len__(self) -> int:
+        return self.cols * self.rows
+
+    @property
+    def coverage(self) -> float:
+        """Fraksi sel yang sudah dijelajahi (0..1)"""
+        return self.explored / len(self)
+
+    def load(self, data: bytes, cols: int, rows: int, cell_size: int) -> bool:
+        """Muat bitset tersimpan (to_bytes); diabaikan jika ukuran grid berbeda (mis. peta dibuat ulang)"""
+        if (cols, rows, cell_size) != (self.cols, self.rows, self.cell_size):
+            return False
+        bits = np.frombuffer(zlib.decompress(data), dtype=np.uint8)
+        if bits.size != self.bits.size:
+            return False
+        self.bits[...] = bits.reshape(self.bits.shape)
+        self.explored = int(np.unpackbits(self.bits, axis=1, count=self.cols).sum())
+        self.dirty = False
+        self._last_reveal = None
+        return True
+
+    def to_bytes(self) -> bytes:
+        """Bitset ter-kompres untuk disimpan ke database"""
+        return zlib.compress(self.bits.tobytes())
+
+    def is_explored(self, x: float, y: float) -> bool:
+        """Apakah sel di posisi world (x, y) sudah dijelajahi"""
+        col = int(x // self.cell_size)
+        row = int(y // self.cell_size)
+        if not (0 <= col < self.cols and 0 <= row < self.rows):
+            return False
+        return bool(self.bits[row, col >> 3] & (0x80 >> (col & 7)))
+
+    def mask(self) -> np.ndarray:
+        """Bitset sebagai array bool (rows, cols)"""
+        return np.unpackbits(self.bits, axis=1, count=self.cols).astype(bool)
+
+    def reveal(self, x: float, y: float, radius: float) -> Cells:
+        """Buka sel dalam radius (pixel world) dari sel (x, y); return (kolom, baris) sel yang baru terbuka"""
+        size = self.cell_size
+        col = int(x // size)
+        row = int(y // size)
+        # Player masih di sel yang sama: hasilnya pasti sama dengan reveal sebelumnya
+        key = (col, row, radius)
+        if key == self._last_reveal:
+            return _NO_CELLS
+        self._last_reveal = key
+
+        reach = radius / size
+        first_row = max(0, math.ceil(row - reach))
+        last_row = min(self.rows - 1, math.floor(row + reach))
+        first_col = max(0, math.ceil(col - reach))
+        last_col = min(self.cols - 1, math.floor(col + reach))
+        if first_row > last_row or first_col > last_col:
+            return _NO_CELLS
+
+        # Bongkar hanya byte yang tersentuh radius, OR dengan disc, lalu pack kembali
+        first_byte = first_col >> 3
+        last_byte = (last_col >> 3) + 1
+        block = np.unpackbits(self.bits[first_row:last_row + 1, first_byte:last_byte], axis=1)
+        cols = np.arange(first_byte * 8, last_byte * 8)
+        rows = np.arange(first_row, last_row + 1)
+        disc = (cols[None, :] - col) ** 2 + (rows[:, None] - row) ** 2 <= reach * reach
+        disc &= (cols >= first_col)[None, :] & (cols <= last_col)[None, :]
+        new = disc & (block == 0)
+        if not new.any():
+            return _NO_CELLS
+        block |= new
+        self.bits[first_row:last_row + 1, first_byte:last_byte] = np.packbits(block, axis=1)
+
+        new_rows, new_cols = np.nonzero(new)
+        self.explored += len(new_cols)
+        self.dirty = True
+        return new_cols + first_byte * 8, new_rows + first_row
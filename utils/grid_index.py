@@ -0,0 +1,209 @@
+"""
+Grid Index - Spatial index persisten untuk objek titik (NPC, building, interactable)
+
+Berbeda dengan SpatialHash (di-clear dan diisi ulang setiap tick untuk collision), GridIndex menyimpan
+objek antar frame: objek yang bergerak cukup di-move (O(1), pindah bucket hanya saat ganti sel).
+Query radius, k-nearest dan rect hanya memeriksa sel di sekitar titik query.
+"""
+import math
+import pygame
+from typing import Any, Dict, List, Tuple
+
+Cell = Tuple[int, int]
+
+
+class _Entry:
+    __slots__ = ('obj', 'layer', 'cell', 'record', 'slot', 'order')
+
+    def __init__(self, obj: Any, layer: str, cell: Cell, record: list, slot: int, order: int):
+        self.obj = obj
+        self.layer = layer
+        self.cell = cell
+        self.record = record
+        self.slot = slot
+        self.order = order
+
+
+class GridIndex:
+    """Uniform grid per layer; posisi objek disimpan sebagai record [x, y, tag] yang di-update di tempat"""
+
+    def __init__(self, cell_size: int = 128):
+        self.cell_size = cell_size
+        # layer -> cell -> entries
+        self.cells: Dict[str, Dict[Cell, List[_Entry]]] = {}
+        # layer -> record [x, y, tag] semua objek (urutan tidak stabil, swap-remove)
+        self._records: Dict[str, List[list]] = {}
+        self._layer_entries: Dict[str, List[_Entry]] = {}
+        self._entries: Dict[int, _Entry] = {}
+        self._next_order = 0
+        # layer -> versi, naik setiap insert / move / remove (cache turunan seperti marker minimap)
+        self._versions: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, obj: Any) -> bool:
+        return id(obj) in self._entries
+
+    def clear(self):
+        """Hapus semua objek"""
+        self.cells.clear()
+        self._records.clear()
+        self._layer_entries.clear()
+        self._entries.clear()
+        for layer in self._versions:
+            self._versions[layer] += 1
+
+    def version(self, layer: str) -> int:
+        """Versi layer; berubah setiap kali objek pada layer ditambah, dipindah atau dihapus"""
+        return self._versions.get(layer, 0)
+
+    def count(self, layer: str) -> int:
+        """Jumlah objek pada layer"""
+        return len(self._layer_entries.get(layer, ()))
+
+    def _cell(self, x: float, y: float) -> Cell:
+        size = self.cell_size
+        return int(x // size), int(y // size)
+
+    def insert(self, obj: Any, x: float, y: float, layer: str, tag: Any = None):
+        """Daftarkan objek di titik (x, y); tag ikut disimpan di record (mis. tipe NPC untuk minimap)"""
+        cell = self._cell(x, y)
+        record = [x, y, tag]
+        layer_entries = self._layer_entries.setdefault(layer, [])
+        entry = _Entry(obj, layer, cell, record, len(layer_entries), self._next_order)
+        self._next_order += 1
+        layer_entries.append(entry)
+        self._records.setdefault(layer, []).append(record)
+        self._entries[id(obj)] = entry
+        self.cells.setdefault(layer, {}).setdefault(cell, []).append(entry)
+        self._versions[layer] = self._versions.get(layer, 0) + 1
+
+    def move(self, obj: Any, x: float, y: float):
+        """Update posisi objek; bucket hanya diganti jika objek pindah sel"""
+        entry = self._entries[id(obj)]
+        record = entry.record
+        record[0] = x
+        record[1] = y
+        self._versions[entry.layer] += 1
+        cell = self._cell(x, y)
+        if cell != entry.cell:
+            grid = self.cells[entry.layer]
+            self._unlink(grid, entry)
+            entry.cell = cell
+            grid.setdefault(cell, []).append(entry)
+
+    def remove(self, obj: Any):
+        """Hapus objek dari index"""
+        entry = self._entries.pop(id(obj))
+        self._unlink(self.cells[entry.layer], entry)
+        self._versions[entry.layer] += 1
+        # Swap-remove dari daftar layer dan record (slot entry terakhir dipindah ke slot kosong)
+        layer_entries = self._layer_entries[entry.layer]
+        records = self._records[entry.layer]
+        last = layer_entries.pop()
+        records.pop()
+        if last is not entry:
+            layer_entries[entry.slot] = last
+            records[entry.slot] = last.record
+            last.slot = entry.slot
+
+    @staticmethod
+    def _unlink(grid: Dict[Cell, List[_Entry]], entry: _Entry):
+        bucket = grid[entry.cell]
+        bucket.remove(entry)
+        if not bucket:
+            del grid[entry.cell]
+
+    def position(self, obj: Any) -> Tuple[float, float]:
+        """Posisi objek yang tersimpan di index"""
+        record = self._entries[id(obj)].record
+        return record[0], record[1]
+
+    def records(self, layer: str) -> List[list]:
+        """Record [x, y, tag] semua objek pada layer (list yang sama, di-update di tempat oleh move)"""
+        return self._records.setdefault(layer, [])
+
+    def query_radius(self, x: float, y: float, radius: float, layer: str) -> List[Any]:
+        """Objek dalam radius dari (x, y), urut dari yang terdekat"""
+        grid = self.cells.get(layer)
+        if not grid:
+            return []
+        x0, y0 = self._cell(x - radius, y - radius)
+        x1, y1 = self._cell(x + radius, y + radius)
+        limit = radius * radius
+        found = []
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                for entry in grid.get((cx, cy), ()):
+                    dx = entry.record[0] - x
+                    dy = entry.record[1] - y
+                    distance = dx * dx + dy * dy
+                    if distance <= limit:
+                        found.append((distance, entry.order, entry.obj))
+        found.sort(key=lambda item: item[:2])
+        return [obj for _, _, obj in found]
+
+    def nearest(self, x: float, y: float, k: int, layer: str,
+                max_distance: float = math.inf) -> List[Tuple[Any, float]]:
+        """k objek terdekat dari (x, y) beserta jaraknya (cincin sel diperluas sampai hasil pasti)"""
+        grid = self.cells.get(layer)
+        total = self.count(layer)
+        if not grid or k <= 0:
+            return []
+        size = self.cell_size
+        center_x, center_y = self._cell(x, y)
+        found = []
+        scanned = 0
+        ring = 0
+        while True:
+            for cell in self._ring_cells(center_x, center_y, ring):
+                bucket = grid.get(cell)
+                if not bucket:
+                    continue
+                scanned += len(bucket)
+                for entry in bucket:
+                    distance = math.hypot(entry.record[0] - x, entry.record[1] - y)
+                    if distance <= max_distance:
+                        found.append((distance, entry.order, entry.obj))
+            # Sel pada cincin berikutnya berjarak minimal ring * cell_size dari titik query
+            reach = ring * size
+            found.sort(key=lambda item: item[:2])
+            if scanned >= total or reach >= max_distance or (len(found) >= k and found[k - 1][0] <= reach):
+                break
+            ring += 1
+        return [(obj, distance) for distance, _, obj in found[:k]]
+
+    @staticmethod
+    def _ring_cells(center_x: int, center_y: int, ring: int) -> List[Cell]:
+        if ring == 0:
+            return [(center_x, center_y)]
+        cells = []
+        for cx in range(center_x - ring, center_x + ring + 1):
+            cells.append((cx, center_y - ring))
+            cells.append((cx, center_y + ring))
+        for cy in range(center_y - ring + 1, center_y + ring):
+            cells.append((center_x - ring, cy))
+            cells.append((center_x + ring, cy))
+        return cells
+
+    def query_rect(self, rect: pygame.Rect, layer: str) -> List[Any]:
+        """Objek yang titiknya di dalam rect, urut sesuai insert (stabil untuk urutan render)"""
+        grid = self.cells.get(layer)
+        if not grid:
+            return []
+        x0, y0 = self._cell(rect.left, rect.top)
+        x1, y1 = self._cell(rect.right - 1, rect.bottom - 1)
+        found = []
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(grid):
+            # Rect lebih besar dari area terisi: iterasi sel yang ada saja
+            buckets = [bucket for (cx, cy), bucket in grid.items() if x0 <= cx <= x1 and y0 <= cy <= y1]
+        else:
+            buckets = [grid[cell] for cell in ((cx, cy) for cy in range(y0, y1 + 1) for cx in range(x0, x1 + 1))
+                       if cell in grid]
+        for bucket in buckets:
+            for entry in bucket:
+                if rect.collidepoint(entry.record[0], entry.record[1]):
+                    found.append(entry)
+        found.sort(key=lambda entry: entry.order)
+        return [entry.obj for entry in found]
@@ -0,0 +1,326 @@
+"""
+Harbor Map - Format biner peta harbor per pulau (data/harbors/*.map) dengan index chunk
+
+Layout file (little endian):
+    header    : magic 'HMAP', versi, ukuran world, ukuran chunk, posisi spawn, jumlah kolom/baris chunk,
+                jumlah string dan jumlah building
+    strings   : tabel string (nama NPC, tipe NPC/building), u16 panjang + UTF-8
+    index     : per chunk (offset NPC, jumlah NPC, index building pertama, jumlah building), urut baris lalu kolom
+    buildings : semua record building (x, y, w, h, tipe) berurutan per chunk
+    chunks    : record NPC (x, y, nama, tipe) per chunk
+
+File di-mmap: membuka peta hanya membaca header, tabel string dan index, sedangkan record chunk
+di-decode saat chunk tersebut di-stream masuk. Blok building bersebelahan sehingga ringkasan semua
+building (untuk minimap) bisa dibaca tanpa men-decode record NPC. Jalankan `python -m utils.harbor_map` untuk membuat
+ulang peta bawaan dari tabel ISLANDS.
+"""
+import mmap
+import os
+import random
+import re
+import struct
+from typing import Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+from utils.constants import ISLANDS, SCREEN_WIDTH, SCREEN_HEIGHT
+
+MAGIC = b'HMAP'
+VERSION = 2
+HARBOR_MAP_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'harbors')
+
+_HEADER = struct.Struct('<4sHIIHiiHHII')
+_STRING_LENGTH = struct.Struct('<H')
+_INDEX_ENTRY = struct.Struct('<IHIH')
+_NPC_RECORD = struct.Struct('<iiHH')
+_BUILDING_RECORD = struct.Struct('<iiHHH')
+
+ChunkKey = Tuple[int, int]
+
+
+class NPCSpawn(NamedTuple):
+    x: int
+    y: int
+    name: str
+    npc_type: str
+
+
+class BuildingSpawn(NamedTuple):
+    x: int
+    y: int
+    width: int
+    height: int
+    building_type: str
+
+
+class ChunkData(NamedTuple):
+    npcs: List[NPCSpawn]
+    buildings: List[BuildingSpawn]
+
+
+def harbor_slug(harbor: str) -> str:
+    """Nama file peta untuk harbor (mis. 'Banda Neira' -> 'banda_neira')"""
+    return re.sub(r'[^a-z0-9]+', '_', harbor.lower()).strip('_')
+
+
+def harbor_map_path(harbor: str) -> str:
+    """Path file peta harbor di data/harbors"""
+    return os.path.join(HARBOR_MAP_DIR, harbor_slug(harbor) + '.map')
+
+
+class HarborMap:
+    """Peta harbor yang dibuka lewat mmap; record chunk di-decode on demand"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as handle:
+            self._data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        data = self._data
+        (magic, version, self.world_width, self.world_height, self.chunk_size,
+         self.spawn_x, self.spawn_y, self.cols, self.rows, string_count,
+         self.building_count) = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: bukan harbor map versi {VERSION}")
+
+        offset = _HEADER.size
+        self.strings: List[str] = []
+        for _ in range(string_count):
+            (length,) = _STRING_LENGTH.unpack_from(data, offset)
+            offset += _STRING_LENGTH.size
+            self.strings.append(data[offset:offset + length].decode('utf-8'))
+            offset += length
+        self._index_offset = offset
+        self._buildings_offset = offset + _INDEX_ENTRY.size * self.cols * self.rows
+
+    def __enter__(self) -> 'HarborMap':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Tutup mmap"""
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+
+    def chunk_keys(self) -> List[ChunkKey]:
+        """Semua chunk (cx, cy)"""
+        return [(cx, cy) for cy in range(self.rows) for cx in range(self.cols)]
+
+    def chunk_range(self, left: float, top: float, right: float, bottom: float) -> List[ChunkKey]:
+        """Chunk yang overlap dengan area world (dijepit ke batas peta)"""
+        size = self.chunk_size
+        first_cx = max(0, int(left // size))
+        last_cx = min(self.cols - 1, int((right - 1) // size))
+        first_cy = max(0, int(top // size))
+        last_cy = min(self.rows - 1, int((bottom - 1) // size))
+        return [(cx, cy) for cy in range(first_cy, last_cy + 1) for cx in range(first_cx, last_cx + 1)]
+
+    def _decode_buildings(self, first: int, count: int) -> List[BuildingSpawn]:
+        """Decode count record building mulai dari index first di blok building"""
+        start = self._buildings_offset + first * _BUILDING_RECORD.size
+        strings = self.strings
+        return [BuildingSpawn(x, y, width, height, strings[building_type])
+                for x, y, width, height, building_type in _BUILDING_RECORD.iter_unpack(
+                    self._data[start:start + count * _BUILDING_RECORD.size])]
+
+    def buildings(self) -> List[BuildingSpawn]:
+        """Semua building di peta (mis. untuk layer statis minimap) tanpa men-decode record NPC"""
+        return self._decode_buildings(0, self.building_count)
+
+    def load_chunk(self, cx: int, cy: int) -> ChunkData:
+        """Decode record NPC dan building untuk satu chunk"""
+        data = self._data
+        offset, npc_count, first_building, building_count = _INDEX_ENTRY.unpack_from(
+            data, self._index_offset + (cy * self.cols + cx) * _INDEX_ENTRY.size)
+        strings = self.strings
+        npcs = [NPCSpawn(x, y, strings[name], strings[npc_type])
+                for x, y, name, npc_type in _NPC_RECORD.iter_unpack(
+                    data[offset:offset + npc_count * _NPC_RECORD.size])]
+        return ChunkData(npcs, self._decode_buildings(first_building, building_count))
+
+
+def write_harbor_map(path: str, world_width: int, world_height: int, spawn: Tuple[int, int],
+                     npcs: Sequence[NPCSpawn], buildings: Sequence[BuildingSpawn], chunk_size: int = 512):
+    """Tulis peta harbor; tiap entity masuk chunk tempat titik tengahnya berada"""
+    cols = (world_width + chunk_size - 1) // chunk_size
+    rows = (world_height + chunk_size - 1) // chunk_size
+    strings: List[str] = []
+    string_ids: Dict[str, int] = {}
+
+    def string_id(text: str) -> int:
+        if text not in string_ids:
+            string_ids[text] = len(strings)
+            strings.append(text)
+        return string_ids[text]
+
+    def chunk_of(center_x: float, center_y: float) -> int:
+        cx = min(cols - 1, max(0, int(center_x // chunk_size)))
+        cy = min(rows - 1, max(0, int(center_y // chunk_size)))
+        return cy * cols + cx
+
+    chunk_npcs: List[List[bytes]] = [[] for _ in range(cols * rows)]
+    chunk_buildings: List[List[bytes]] = [[] for _ in range(cols * rows)]
+    for npc in npcs:
+        chunk_npcs[chunk_of(npc.x + 16, npc.y + 16)].append(
+            _NPC_RECORD.pack(npc.x, npc.y, string_id(npc.name), string_id(npc.npc_type)))
+    for building in buildings:
+        chunk_buildings[chunk_of(building.x + building.width / 2, building.y + building.height / 2)].append(
+            _BUILDING_RECORD.pack(building.x, building.y, building.width, building.height,
+                                  string_id(building.building_type)))
+
+    string_block = b''.join(_STRING_LENGTH.pack(len(encoded)) + encoded
+                            for encoded in (text.encode('utf-8') for text in strings))
+    building_block = b''.join(record for records in chunk_buildings for record in records)
+    offset = _HEADER.size + len(string_block) + _INDEX_ENTRY.size * cols * rows + len(building_block)
+    index = []
+    bodies = []
+    first_building = 0
+    for npc_records, building_records in zip(chunk_npcs, chunk_buildings):
+        body = b''.join(npc_records)
+        index.append(_INDEX_ENTRY.pack(offset, len(npc_records), first_building, len(building_records)))
+        bodies.append(body)
+        offset += len(body)
+        first_building += len(building_records)
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'wb') as handle:
+        handle.write(_HEADER.pack(MAGIC, VERSION, world_width, world_height, chunk_size,
+                                  spawn[0], spawn[1], cols, rows, len(strings), len(buildings)))
+        handle.write(string_block)
+        handle.write(b''.join(index))
+        handle.write(building_block)
+        handle.write(b''.join(bodies))
+
+
+class ChunkStreamer:
+    """Muat chunk di sekitar player, buang chunk yang jauh (radius evict > radius load supaya tidak bolak-balik)"""
+
+    def __init__(self, harbor_map: HarborMap, load_margin: int, evict_margin: int,
+                 on_load: Callable[[ChunkKey, ChunkData], None], on_evict: Callable[[ChunkKey], None]):
+        self.map = harbor_map
+        self.load_margin = load_margin
+        self.evict_margin = max(evict_margin, load_margin)
+        self.on_load = on_load
+        self.on_evict = on_evict
+        self.loaded: Dict[ChunkKey, bool] = {}
+
+    def update(self, view_left: float, view_top: float, view_right: float, view_bottom: float) -> bool:
+        """Stream chunk untuk view (rect world); return True jika ada chunk yang dimuat/dibuang"""
+        harbor_map = self.map
+        margin = self.evict_margin
+        keep = set(harbor_map.chunk_range(view_left - margin, view_top - margin,
+                                          view_right + margin, view_bottom + margin))
+        evicted = [key for key in self.loaded if key not in keep]
+        for key in evicted:
+            del self.loaded[key]
+            self.on_evict(key)
+
+        margin = self.load_margin
+        loaded = 0
+        for key in harbor_map.chunk_range(view_left - margin, view_top - margin,
+                                          view_right + margin, view_bottom + margin):
+            if key not in self.loaded:
+                self.loaded[key] = True
+                self.on_load(key, harbor_map.load_chunk(*key))
+                loaded += 1
+        return bool(evicted or loaded)
+
+    def clear(self):
+        """Buang semua chunk"""
+        for key in list(self.loaded):
+            del self.loaded[key]
+            self.on_evict(key)
+
+
+# Ukuran world (dalam layar) dan kepadatan peta bawaan per harbor
+_DEFAULT_LAYOUTS = {
+    'Aceh': (2, 2, 0),
+    'Jakarta': (8, 6, 1.0),
+    'Banjarmasin': (4, 3, 0.6),
+    'Makassar': (5, 4, 0.8),
+    'Ambon': (4, 3, 0.7),
+    'Banda Neira': (3, 2, 0.9)
+}
+
+# Layout harbor awal (sebelum peta data-driven) dipertahankan sebagai Aceh
+_CLASSIC_NPCS = [
+    NPCSpawn(200, 200, "Pedagang Rempah", "merchant"),
+    NPCSpawn(500, 300, "Warung Makan", "restaurant"),
+    NPCSpawn(800, 400, "Elderman", "story"),
+    NPCSpawn(300, 600, "Pedagang Rempah 2", "merchant"),
+    NPCSpawn(600, 500, "Restoran Tradisional", "restaurant")
+]
+_CLASSIC_BUILDINGS = [
+    BuildingSpawn(150, 150, 80, 80, "shop"),
+    BuildingSpawn(450, 250, 80, 80, "restaurant"),
+    BuildingSpawn(750, 350, 80, 80, "shop"),
+    BuildingSpawn(250, 550, 80, 80, "restaurant"),
+    BuildingSpawn(550, 450, 80, 80, "shop")
+]
+
+_LOT_WIDTH = 260
+_LOT_HEIGHT = 220
+
+
+def generate_harbor(island: Dict, screens_x: int, screens_y: int, density: float
+                    ) -> Tuple[int, int, List[NPCSpawn], List[BuildingSpawn]]:
+    """Buat layout harbor deterministik (seed dari nama harbor): building di lot grid, NPC di depan building"""
+    harbor = island['harbor']
+    world_width = SCREEN_WIDTH * screens_x
+    world_height = SCREEN_HEIGHT * screens_y
+    npcs = list(_CLASSIC_NPCS)
+    buildings = list(_CLASSIC_BUILDINGS)
+    rng = random.Random(harbor)
+    spices = [spice.replace('_', ' ').title() for spice in island['spices']]
+    counters: Dict[str, int] = {}
+
+    def npc_name(base: str) -> str:
+        counters[base] = counters.get(base, 0) + 1
+        return f"{base} {counters[base]}"
+
+    # Lot di luar area layout awal (kiri atas 1000x700 sudah dipakai)
+    for lot_y in range(100, world_height - _LOT_HEIGHT, _LOT_HEIGHT):
+        for lot_x in range(100, world_width - _LOT_WIDTH, _LOT_WIDTH):
+            if lot_x < 1000 and lot_y < 700:
+                continue
+            if rng.random() > density:
+                continue
+            building_type = rng.choice(("shop", "shop", "restaurant"))
+            width = rng.choice((80, 96, 112))
+            height = rng.choice((80, 96))
+            x = lot_x + rng.randint(0, _LOT_WIDTH - width - 70)
+            y = lot_y + rng.randint(30, _LOT_HEIGHT - height - 50)
+            buildings.append(BuildingSpawn(x, y, width, height, building_type))
+
+            # NPC pemilik di samping pintu, plus warga yang berkeliaran di dekatnya
+            if building_type == "shop":
+                npcs.append(NPCSpawn(x + width + 8, y + height - 32,
+                                     npc_name(f"Pedagang {rng.choice(spices)}"), "merchant"))
+            else:
+                npcs.append(NPCSpawn(x + width + 8, y + height - 32, npc_name("Warung Makan"), "restaurant"))
+            if rng.random() < 0.35:
+                npcs.append(NPCSpawn(x + rng.randint(-40, width), y + height + rng.randint(20, 40),
+                                     npc_name(f"Warga {harbor}"), "story"))
+    return world_width, world_height, npcs, buildings
+
+
+def build_default_maps(directory: str = HARBOR_MAP_DIR) -> List[str]:
+    """Tulis peta bawaan untuk setiap harbor di ISLANDS; return daftar path"""
+    paths = []
+    for island in ISLANDS:
+        screens_x, screens_y, density = _DEFAULT_LAYOUTS.get(island['harbor'], (3, 3, 0.7))
+        world_width, world_height, npcs, buildings = generate_harbor(island, screens_x, screens_y, density)
+        path = os.path.join(directory, harbor_slug(island['harbor']) + '.map')
+        write_harbor_map(path, world_width, world_height, (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2), npcs, buildings)
+        paths.append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    for written in build_default_maps():
+        with HarborMap(written) as harbor_map:
+            npc_total = sum(len(harbor_map.load_chunk(*key).npcs) for key in harbor_map.chunk_keys())
+            print(f"{written}: {harbor_map.world_width}x{harbor_map.world_height}, "
+                  f"{harbor_map.cols}x{harbor_map.rows} chunk, {npc_total} NPC, "
+                  f"{harbor_map.building_count} building, "
+                  f"{os.path.getsize(written)} bytes")
@@ -3,6 +3,7 @@ Icons Module - Simple icon rendering untuk game
 """
 import pygame
 from typing import Tuple
+from utils.text_cache import text_cache
 
 class IconRenderer:
     """Class untuk render icon sederhana"""
@@ -52,8 +53,7 @@ class IconRenderer:
         pygame.draw.circle(surface, (255, 255, 0), center, radius - 2)  # Yellow
         
         # Coin symbol
-        font = pygame.font.Font(None, size - 4)
-        text = font.render("$", True, (139, 69, 19))
+        text = text_cache.render("$", size - 4, (139, 69, 19))
         text_rect = text.get_rect(center=center)
         surface.blit(text, text_rect)
     
@@ -3,6 +3,7 @@ Inventory Display - Keranjang untuk menampilkan pembelian
 """
 import pygame
 from typing import Dict, List, Tuple
+from utils.text_cache import text_cache
 
 class InventoryCart:
     """Keranjang untuk menampilkan item yang dibeli"""
@@ -14,8 +15,6 @@ class InventoryCart:
         self.height = height
         self.visible = False
         self.items: List[Dict[str, any]] = []
-        self.font = pygame.font.Font(None, 20)
-        self.small_font = pygame.font.Font(None, 16)
         
     def add_item(self, item_type: str, item_name: str, quantity: int = 1):
         """Tambahkan item ke keranjang"""
@@ -53,7 +52,7 @@ class InventoryCart:
         pygame.draw.rect(screen, (100, 150, 200), panel_rect, 3)
         
         # Title
-        title = self.font.render("🛒 Keranjang Pembelian", True, (255, 255, 100))
+        title = text_cache.render("🛒 Keranjang Pembelian", 20, (255, 255, 100))
         screen.blit(title, (self.x + 10, self.y + 10))
         
         # Items list
@@ -64,7 +63,7 @@ class InventoryCart:
                 spices = inventory_data['inventory']['spices']
                 for idx, (name, qty) in enumerate(spices.items()):
                     if qty > 0:
-                        item_text = self.small_font.render(f"• {name} x{qty}", True, (255, 255, 255))
+                        item_text = text_cache.render(f"• {name} x{qty}", 16, (255, 255, 255))
                         screen.blit(item_text, (self.x + 15, self.y + y_offset + idx * 20))
             
             # Foods
@@ -72,11 +71,11 @@ class InventoryCart:
                 foods = inventory_data['tried_foods']
                 start_y = y_offset + len([s for s in inventory_data.get('inventory', {}).get('spices', {}).values() if s > 0]) * 20
                 for idx, food_name in enumerate(foods):
-                    item_text = self.small_font.render(f"✓ {food_name}", True, (150, 255, 150))
+                    item_text = text_cache.render(f"✓ {food_name}", 16, (150, 255, 150))
                     screen.blit(item_text, (self.x + 15, self.y + start_y + idx * 20))
         
         # Close hint
         if len(self.items) == 0:
-            hint_text = self.small_font.render("Keranjang kosong", True, (150, 150, 150))
+            hint_text = text_cache.render("Keranjang kosong", 16, (150, 150, 150))
             screen.blit(hint_text, (self.x + 15, self.y + y_offset))
 
@@ -1,71 +1,255 @@
 """
 Minimap - Mini map untuk navigasi di harbor
+
+Layer statis (background, judul, langit, footprint building) di-bake sekali per world. Marker NPC di-plot
+dengan NumPy langsung ke pixel array surface komposisi, dan hanya jika posisi pixel marker berubah;
+player dan indikator kamera digambar langsung tiap frame. Fog of war (ExplorationMap) berupa mask alpha
+seukuran area peta: di-bake sekali dari bitset, lalu hanya pixel sel yang baru terbuka yang dibersihkan.
 """
 import pygame
-from typing import List, Tuple, Optional
+import numpy as np
+from operator import itemgetter
+from typing import Dict, Iterable, Optional, Sequence, Tuple
 from utils.constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from utils.fog_of_war import ExplorationMap
+from utils.surfaces import optimize_surface
+from utils.text_cache import text_cache
+
+# Area peta di dalam minimap (di bawah judul): margin kiri, atas, kanan, bawah
+MINIMAP_MARGIN = (10, 25, 10, 10)
+# Radius marker NPC (pixel)
+MINIMAP_MARKER_RADIUS = 3
+# Warna dan alpha fog di area yang belum dijelajahi
+FOG_COLOR = (10, 10, 25)
+FOG_ALPHA = 215
+
+# Warna marker per tipe NPC (tipe lain memakai warna terakhir)
+MARKER_COLORS: Dict[str, Tuple[int, int, int]] = {
+    'merchant': (255, 200, 100),
+    'restaurant': (255, 100, 100),
+    'story': (150, 150, 255)
+}
+BUILDING_COLORS: Dict[str, Tuple[int, int, int]] = {
+    'shop': (150, 120, 80),
+    'restaurant': (160, 80, 70)
+}
+
+
+class _ColorIndexTable(dict):
+    """Tipe NPC -> index warna marker; tipe yang tidak dikenal memakai warna terakhir"""
+
+    def __missing__(self, npc_type) -> int:
+        return len(MARKER_COLORS) - 1
+
+
+_COLOR_INDEX = _ColorIndexTable((npc_type, index) for index, npc_type in enumerate(MARKER_COLORS))
+
+
+def _disc_offsets(radius: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Offset pixel lingkaran terisi seperti pygame.draw.circle dengan radius tersebut"""
+    size = radius * 2 + 1
+    stamp = pygame.Surface((size, size))
+    pygame.draw.circle(stamp, (255, 255, 255), (radius, radius), radius)
+    dx, dy = np.nonzero(pygame.surfarray.array2d(stamp))
+    return dx - radius, dy - radius
+
+
+def _flat_offsets(radius: int, height: int) -> np.ndarray:
+    """Offset lingkaran sebagai index flat pada pixel array [x, y] setinggi height"""
+    dx, dy = _disc_offsets(radius)
+    return dx * height + dy
+
 
 class Minimap:
     """Mini map untuk menampilkan posisi player dan NPCs"""
-    
+
     def __init__(self, x: int, y: int, width: int = 200, height: int = 150):
         self.x = x
         self.y = y
         self.width = width
         self.height = height
         self.visible = True
-        
-    def render(self, screen: pygame.Surface, 
+        left, top, right, bottom = MINIMAP_MARGIN
+        self.area = pygame.Rect(left, top, width - left - right, height - top - bottom)
+        self.world_width = 0
+        self.world_height = 0
+        self.scale_x = 1.0
+        self.scale_y = 1.0
+        self._buildings: Sequence[Sequence] = ()
+        self._sky_height = 0
+        # Layer statis dan surface komposisi (statis + marker) yang di-blit tiap frame
+        self._static: Optional[pygame.Surface] = None
+        self._static_pixels: Optional[np.ndarray] = None
+        self._canvas: Optional[np.ndarray] = None
+        self._composed: Optional[pygame.Surface] = None
+        self._marker_colors: Optional[np.ndarray] = None
+        self._marker_version = None
+        self._markers: Optional[np.ndarray] = None
+        self._disc = _flat_offsets(MINIMAP_MARKER_RADIUS, height)
+        self.marker_redraws = 0  # Jumlah plot ulang marker (untuk profiling)
+        # Fog of war: mask alpha area peta dan kolom/baris sel pertama per pixel mask
+        self.fog: Optional[ExplorationMap] = None
+        self._fog_mask: Optional[pygame.Surface] = None
+        self._fog_col_starts: Optional[np.ndarray] = None
+        self._fog_row_starts: Optional[np.ndarray] = None
+
+    def set_world(self, world_width: int, world_height: int, buildings: Iterable[Sequence] = (),
+                  sky_height: int = 0):
+        """Set ukuran world, building (x, y, w, h, tipe) dan tinggi langit; layer statis di-bake ulang"""
+        self.world_width = world_width
+        self.world_height = world_height
+        self.scale_x = self.area.width / world_width
+        self.scale_y = self.area.height / world_height
+        self._buildings = list(buildings)
+        self._sky_height = sky_height
+        self._static = None
+        self._fog_mask = None
+
+    def set_fog(self, exploration: Optional[ExplorationMap]):
+        """Pakai bitmap eksplorasi sebagai fog of war (None = tanpa fog); mask di-bake saat render"""
+        self.fog = exploration
+        self._fog_mask = None
+
+    def _fog_starts(self, pixels: int, scale: float, cells: int) -> np.ndarray:
+        """Index sel yang menutupi tepi awal setiap pixel mask (tidak turun, untuk np.maximum.reduceat)"""
+        starts = np.floor(np.arange(pixels) / (scale * self.fog.cell_size)).astype(np.int64)
+        return np.minimum(starts, cells - 1)
+
+    def _bake_fog(self):
+        """Bake mask fog dari bitset: pixel bersih jika ada sel terjelajah yang jatuh di pixel tersebut"""
+        fog = self.fog
+        width, height = self.area.size
+        self._fog_col_starts = self._fog_starts(width, self.scale_x, fog.cols)
+        self._fog_row_starts = self._fog_starts(height, self.scale_y, fog.rows)
+        explored = fog.mask().view(np.uint8)
+        explored = np.maximum.reduceat(explored, self._fog_col_starts, axis=1)
+        explored = np.maximum.reduceat(explored, self._fog_row_starts, axis=0)
+
+        mask = pygame.Surface((width, height), pygame.SRCALPHA)
+        mask.fill(FOG_COLOR + (FOG_ALPHA,))
+        mask = optimize_surface(mask, alpha=True)
+        alpha = pygame.surfarray.pixels_alpha(mask)
+        alpha[explored.T.astype(bool)] = 0
+        del alpha
+        self._fog_mask = mask
+
+    @staticmethod
+    def _pixel_spans(starts: np.ndarray, cells: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Rentang pixel mask [first, last) yang memuat setiap sel (konsisten dengan reduceat saat bake)"""
+        first = np.searchsorted(starts, cells, 'left')
+        last = np.searchsorted(starts, cells, 'right')
+        # Sel lebih kecil dari pixel: ikut pixel sebelumnya (sama seperti reduceat saat bake)
+        merged = first == last
+        first[merged] = np.maximum(first[merged] - 1, 0)
+        last[merged] = first[merged] + 1
+        return first, last
+
+    def reveal_cells(self, cols: np.ndarray, rows: np.ndarray):
+        """Bersihkan fog hanya di pixel sel yang baru terbuka (hasil ExplorationMap.reveal)"""
+        if self._fog_mask is None or not len(cols):
+            return
+        x0, x1 = self._pixel_spans(self._fog_col_starts, cols)
+        y0, y1 = self._pixel_spans(self._fog_row_starts, rows)
+        alpha = pygame.surfarray.pixels_alpha(self._fog_mask)
+        for left, right, top, bottom in zip(x0.tolist(), x1.tolist(), y0.tolist(), y1.tolist()):
+            alpha[left:right, top:bottom] = 0
+        del alpha
+
+    def _bake_static(self):
+        """Bake background, judul, langit dan building ke layer statis"""
+        surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        surface.fill((20, 20, 40, 200))
+        area = self.area
+        if self._sky_height > 0:
+            sky = pygame.Rect(area.x, area.y, area.width, int(self._sky_height * self.scale_y))
+            surface.fill((70, 110, 160, 200), sky.clip(area))
+        for x, y, width, height, building_type in self._buildings:
+            rect = pygame.Rect(area.x + int(x * self.scale_x), area.y + int(y * self.scale_y),
+                               max(2, int(width * self.scale_x)), max(2, int(height * self.scale_y)))
+            surface.fill(BUILDING_COLORS.get(building_type, (130, 130, 130)), rect.clip(area))
+        pygame.draw.rect(surface, (100, 150, 200), surface.get_rect(), 2)
+
+        # Title
+        title = text_cache.render("Peta", 18, (255, 255, 255))
+        surface.blit(title, (5, 5))
+
+        self._static = optimize_surface(surface, alpha=True)
+        self._composed = self._static.copy()
+        # Pixel layer statis (C-contiguous, index [x, y]) dan buffer kerja untuk plot marker
+        self._static_pixels = np.ascontiguousarray(pygame.surfarray.array2d(self._static))
+        self._canvas = np.empty_like(self._static_pixels)
+        colors = list(MARKER_COLORS.values())
+        self._marker_colors = np.array([self._composed.map_rgb(color + (255,)) for color in colors],
+                                       dtype=self._static_pixels.dtype)
+        self._marker_version = None
+        self._markers = None
+
+    def _update_markers(self, npc_positions: Sequence[Sequence], version: Optional[int]):
+        """Plot ulang marker NPC jika versi berubah dan posisi pixel marker benar-benar bergeser"""
+        if version is not None and version == self._marker_version:
+            return
+        self._marker_version = version
+
+        # Posisi pixel + index warna per marker; kolom diambil dengan map/itemgetter (tanpa loop Python)
+        count = len(npc_positions)
+        markers = np.empty((count, 3), dtype=np.int64)
+        xs = np.fromiter(map(itemgetter(0), npc_positions), np.float64, count)
+        ys = np.fromiter(map(itemgetter(1), npc_positions), np.float64, count)
+        markers[:, 0] = xs * self.scale_x + self.area.x
+        markers[:, 1] = ys * self.scale_y + self.area.y
+        markers[:, 2] = np.fromiter(map(_COLOR_INDEX.__getitem__, map(itemgetter(2), npc_positions)),
+                                    np.int64, count)
+        if self._markers is not None and np.array_equal(markers, self._markers):
+            return
+        self._markers = markers
+        self.marker_redraws += 1
+
+        # Stamp lingkaran di setiap marker lewat index flat (pusat dijepit supaya stamp tetap di dalam
+        # surface); urutan tetap sehingga marker belakangan menimpa yang sebelumnya
+        radius = MINIMAP_MARKER_RADIUS
+        center_x = np.clip(markers[:, 0], radius, self.width - 1 - radius)
+        center_y = np.clip(markers[:, 1], radius, self.height - 1 - radius)
+        flat = ((center_x * self.height + center_y)[:, None] + self._disc[None, :]).ravel()
+        canvas = self._canvas
+        canvas[...] = self._static_pixels
+        canvas.reshape(-1)[flat] = np.repeat(self._marker_colors[markers[:, 2]], len(self._disc))
+        pixels = pygame.surfarray.pixels2d(self._composed)
+        pixels[...] = canvas
+        del pixels  # Lepas lock surface sebelum di-blit
+
+    def render(self, screen: pygame.Surface,
                player_pos: Tuple[float, float],
-               npc_positions: List[Tuple[float, float, str]],
+               npc_positions: Sequence[Sequence],
                camera_x: int, camera_y: int,
-               world_width: int, world_height: int):
-        """Render minimap"""
+               world_width: int, world_height: int,
+               markers_version: Optional[int] = None):
+        """Render minimap; markers_version (mis. GridIndex.version) melewati plot marker jika NPC tidak bergerak"""
         if not self.visible:
             return
-        
-        # Minimap background
-        map_rect = pygame.Rect(self.x, self.y, self.width, self.height)
-        overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        overlay.fill((20, 20, 40, 200))
-        screen.blit(overlay, map_rect)
-        pygame.draw.rect(screen, (100, 150, 200), map_rect, 2)
-        
-        # Title
-        font = pygame.font.Font(None, 18)
-        title = font.render("Peta", True, (255, 255, 255))
-        screen.blit(title, (self.x + 5, self.y + 5))
-        
-        # Calculate scale
-        scale_x = self.width / world_width
-        scale_y = self.height / world_height
-        
-        # Draw NPCs
-        for npc_x, npc_y, npc_type in npc_positions:
-            map_x = int(self.x + 10 + npc_x * scale_x)
-            map_y = int(self.y + 25 + npc_y * scale_y)
-            
-            # Color berdasarkan type
-            if npc_type == "merchant":
-                color = (255, 200, 100)
-            elif npc_type == "restaurant":
-                color = (255, 100, 100)
-            else:
-                color = (150, 150, 255)
-            
-            pygame.draw.circle(screen, color, (map_x, map_y), 3)
-        
+        if (world_width, world_height) != (self.world_width, self.world_height):
+            self.set_world(world_width, world_height)
+        if self._static is None:
+            self._bake_static()
+
+        self._update_markers(npc_positions, markers_version)
+        screen.blit(self._composed, (self.x, self.y))
+        if self.fog is not None:
+            if self._fog_mask is None:
+                self._bake_fog()
+            screen.blit(self._fog_mask, (self.x + self.area.x, self.y + self.area.y))
+
         # Draw player
-        player_map_x = int(self.x + 10 + player_pos[0] * scale_x)
-        player_map_y = int(self.y + 25 + player_pos[1] * scale_y)
+        origin_x = self.x + self.area.x
+        origin_y = self.y + self.area.y
+        player_map_x = int(origin_x + player_pos[0] * self.scale_x)
+        player_map_y = int(origin_y + player_pos[1] * self.scale_y)
         pygame.draw.circle(screen, (100, 200, 255), (player_map_x, player_map_y), 4)
         pygame.draw.circle(screen, (255, 255, 255), (player_map_x, player_map_y), 4, 2)
-        
+
         # Camera view indicator
-        view_x = int(self.x + 10 + camera_x * scale_x)
-        view_y = int(self.y + 25 + camera_y * scale_y)
-        view_w = int(SCREEN_WIDTH * scale_x)
-        view_h = int(SCREEN_HEIGHT * scale_y)
+        view_x = int(origin_x + camera_x * self.scale_x)
+        view_y = int(origin_y + camera_y * self.scale_y)
+        view_w = int(SCREEN_WIDTH * self.scale_x)
+        view_h = int(SCREEN_HEIGHT * self.scale_y)
         view_rect = pygame.Rect(view_x, view_y, view_w, view_h)
         pygame.draw.rect(screen, (255, 255, 0), view_rect, 1)
-
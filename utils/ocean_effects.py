@@ -3,37 +3,78 @@ Ocean Effects - Visual effects untuk suasana laut yang realistis
 """
 import pygame
 import math
-import random
-from typing import List, Tuple
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from utils.surfaces import optimize_surface
+from utils.water_surface import WaterSurface
+from utils.constants import OCEAN_WAVE_LAYERS
+from utils.rng import stream
 
-class Wave:
-    """Wave effect untuk ocean"""
-    def __init__(self, x: float, y: float, amplitude: float, frequency: float, speed: float):
-        self.x = x
-        self.y = y
-        self.amplitude = amplitude
-        self.frequency = frequency
-        self.speed = speed
-        self.time = random.uniform(0, math.pi * 2)
+# Stream RNG sendiri supaya bisa direproduksi saat replay
+_rng = stream('ocean')
+# Warna ocean gradient (atas, bawah) untuk background dan tekstur air
+OCEAN_TOP_COLOR = (30, 60, 90)
+OCEAN_BOTTOM_COLOR = (60, 120, 180)
+# Jarak sample (px) polyline wave dan colorkey strip wave
+WAVE_SAMPLE_STEP = 5
+WAVE_COLORKEY = (255, 0, 255)
+
+class WaveLayers:
+    """Semua wave layer sebagai array NumPy; tiap layer di-bake sekali ke strip lalu di-blit sesuai fase
+
+    Wave layer i = y + sin(frequency * x + time) * amplitude. Menambah time sama dengan menggeser kurva
+    sejauh time / frequency px, jadi strip selebar layar + satu periode cukup di-blit dengan offset:
+    biaya per frame satu blit per layer, tanpa perhitungan per titik di Python.
+    """
+    def __init__(self, count: int, base_y: float, spacing: float = 20, color: Tuple[int, int, int] = (70, 130, 180)):
+        index = np.arange(count, dtype=np.float64)
+        # Pola 3 layer pertama diulang untuk layer tambahan supaya tidak makin rapat/tinggi
+        pattern = index % 3
+        self.count = count
+        self.y = base_y + index * spacing
+        self.amplitude = 8 + pattern * 3
+        self.frequency = 0.02 + pattern * 0.01
+        self.speed = 0.5 + pattern * 0.2
+        self.period = 2 * math.pi / self.frequency
+        self.time = np.array([_rng.uniform(0, math.pi * 2) for _ in range(count)])
+        self.color = color
+        self.strips: List[pygame.Surface] = []
+        self._width = -1
         
     def update(self, dt: float):
         """Update wave animation"""
         self.time += self.speed * dt
-        self.x += 30 * dt  # Wave moves
     
-    def get_y_offset(self, x_pos: float) -> float:
-        """Get Y offset untuk wave effect"""
-        return math.sin((x_pos * self.frequency + self.time)) * self.amplitude
+    def points(self, width: int) -> np.ndarray:
+        """Titik polyline semua layer pada fase 0, relatif ke y layer: array (count, sample, 2)"""
+        xs = np.arange(0, width + WAVE_SAMPLE_STEP, WAVE_SAMPLE_STEP, dtype=np.float64)
+        points = np.empty((self.count, len(xs), 2))
+        points[:, :, 0] = xs
+        np.multiply(self.frequency[:, None], xs[None, :], out=points[:, :, 1])
+        np.sin(points[:, :, 1], out=points[:, :, 1])
+        points[:, :, 1] *= self.amplitude[:, None]
+        return points
     
-    def render(self, screen: pygame.Surface, screen_width: int, screen_height: int):
-        """Render wave"""
-        points = []
-        for x in range(0, screen_width + 10, 5):
-            y = self.y + self.get_y_offset(x)
-            points.append((x, y))
-        
-        if len(points) > 1:
-            pygame.draw.lines(screen, (70, 130, 180), False, points, 2)
+    def bake(self, screen_width: int):
+        """Bake strip (lebar layar + satu periode) untuk setiap layer"""
+        width = screen_width + 10 + int(math.ceil(self.period.max()))
+        self.strips = []
+        for points, amplitude in zip(self.points(width).tolist(), self.amplitude.tolist()):
+            half = int(math.ceil(amplitude)) + 2
+            strip = pygame.Surface((width, half * 2))
+            strip.fill(WAVE_COLORKEY)
+            pygame.draw.lines(strip, self.color, False, [(x, y + half) for x, y in points], 2)
+            strip.set_colorkey(WAVE_COLORKEY, pygame.RLEACCEL)
+            self.strips.append(optimize_surface(strip))
+        self._width = screen_width
+    
+    def render(self, screen: pygame.Surface, screen_width: int):
+        """Render semua wave layer (satu blit per layer)"""
+        if screen_width != self._width:
+            self.bake(screen_width)
+        shifts = np.mod(self.time / self.frequency, self.period).round().astype(np.int64).tolist()
+        for strip, shift, y in zip(self.strips, shifts, self.y.tolist()):
+            screen.blit(strip, (-shift, int(y) - strip.get_height() // 2))
 
 class Cloud:
     """Cloud effect untuk sky"""
@@ -41,7 +82,9 @@ class Cloud:
         self.x = x
         self.y = y
         self.speed = speed
-        self.size = random.uniform(40, 80)
+        self.size = _rng.uniform(40, 80)
+        self.sprite: Optional[pygame.Surface] = None
+        self.sprite_offset = (0, 0)
         
     def update(self, dt: float, screen_width: int):
         """Update cloud position"""
@@ -49,13 +92,24 @@ class Cloud:
         if self.x > screen_width + 100:
             self.x = -100
     
+    def bake(self):
+        """Pre-render cloud (beberapa circle) ke sprite"""
+        half_w = int(self.size * 0.8) + 2
+        half_h = int(self.size * 0.6) + 2
+        sprite = pygame.Surface((half_w * 2, half_h * 2), pygame.SRCALPHA)
+        cx, cy = half_w, half_h
+        pygame.draw.circle(sprite, (220, 220, 220), (cx, cy), int(self.size * 0.6))
+        pygame.draw.circle(sprite, (230, 230, 230), (int(cx - self.size * 0.3), cy), int(self.size * 0.5))
+        pygame.draw.circle(sprite, (230, 230, 230), (int(cx + self.size * 0.3), cy), int(self.size * 0.5))
+        pygame.draw.circle(sprite, (240, 240, 240), (cx, int(cy - self.size * 0.2)), int(self.size * 0.4))
+        self.sprite = optimize_surface(sprite, alpha=True)
+        self.sprite_offset = (half_w, half_h)
+    
     def render(self, screen: pygame.Surface):
         """Render cloud"""
-        # Draw cloud as multiple circles
-        pygame.draw.circle(screen, (220, 220, 220), (int(self.x), int(self.y)), int(self.size * 0.6))
-        pygame.draw.circle(screen, (230, 230, 230), (int(self.x - self.size * 0.3), int(self.y)), int(self.size * 0.5))
-        pygame.draw.circle(screen, (230, 230, 230), (int(self.x + self.size * 0.3), int(self.y)), int(self.size * 0.5))
-        pygame.draw.circle(screen, (240, 240, 240), (int(self.x), int(self.y - self.size * 0.2)), int(self.size * 0.4))
+        if self.sprite is None:
+            self.bake()
+        screen.blit(self.sprite, (int(self.x) - self.sprite_offset[0], int(self.y) - self.sprite_offset[1]))
 
 class Sun:
     """Sun effect untuk sky"""
@@ -64,13 +118,17 @@ class Sun:
         self.y = y
         self.radius = 60
         self.time = 0.0
+        self.sprite: Optional[pygame.Surface] = None
         
     def update(self, dt: float):
         """Update sun animation"""
         self.time += dt
+    
+    def bake(self):
+        """Pre-render glow layers dan sun ke satu sprite"""
+        outer = self.radius + 30
+        sprite = pygame.Surface((outer * 2, outer * 2), pygame.SRCALPHA)
         
-    def render(self, screen: pygame.Surface):
-        """Render sun dengan glow effect"""
         # Glow layers
         for i in range(3, 0, -1):
             glow_radius = self.radius + i * 10
@@ -78,61 +136,161 @@ class Sun:
             glow_surface = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
             color = (255, 255, 200, alpha)
             pygame.draw.circle(glow_surface, color, (glow_radius, glow_radius), glow_radius)
-            screen.blit(glow_surface, (self.x - glow_radius, self.y - glow_radius))
+            sprite.blit(glow_surface, (outer - glow_radius, outer - glow_radius))
         
         # Main sun
-        pygame.draw.circle(screen, (255, 255, 100), (self.x, self.y), self.radius)
-        pygame.draw.circle(screen, (255, 255, 200), (self.x, self.y), self.radius - 5)
+        pygame.draw.circle(sprite, (255, 255, 100), (outer, outer), self.radius)
+        pygame.draw.circle(sprite, (255, 255, 200), (outer, outer), self.radius - 5)
+        self.sprite = optimize_surface(sprite, alpha=True)
+        
+    def render(self, screen: pygame.Surface):
+        """Render sun dengan glow effect"""
+        if self.sprite is None:
+            self.bake()
+        outer = self.sprite.get_width() // 2
+        screen.blit(self.sprite, (self.x - outer, self.y - outer))
+
+class OceanLayer:
+    """Satu layer compositor dengan invalidation dan cadence update sendiri"""
+    def __init__(self, name: str, update_interval: float = 0.0):
+        self.name = name
+        self.update_interval = update_interval  # 0 = update tiap frame
+        self.elapsed = 0.0
+        self.dirty = True
+        
+    def invalidate(self):
+        """Tandai layer perlu di-bake ulang"""
+        self.dirty = True
+    
+    def tick(self, dt: float) -> float:
+        """Akumulasi waktu; kembalikan dt yang harus diproses sekarang (0 jika belum waktunya)"""
+        self.elapsed += dt
+        if self.elapsed < self.update_interval:
+            return 0.0
+        step, self.elapsed = self.elapsed, 0.0
+        return step
 
 class OceanRenderer:
-    """Renderer untuk ocean dengan efek realistis"""
+    """Renderer untuk ocean dengan efek realistis (compositor berlapis)"""
     
-    def __init__(self, screen_width: int, screen_height: int):
+    def __init__(self, screen_width: int, screen_height: int, cloud_update_interval: float = 1 / 30,
+                 wave_layers: int = OCEAN_WAVE_LAYERS, water_step_interval: Optional[float] = 1 / 30):
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.waves: List[Wave] = []
+        self.waves = WaveLayers(wave_layers, screen_height * 0.6)
         self.clouds: List[Cloud] = []
         self.sun = Sun(screen_width - 100, 80)
         
-        # Initialize waves
-        for i in range(3):
-            wave = Wave(
-                x=0,
-                y=screen_height * 0.6 + i * 20,
-                amplitude=8 + i * 3,
-                frequency=0.02 + i * 0.01,
-                speed=0.5 + i * 0.2
-            )
-            self.waves.append(wave)
+        # Layers: background gradient di-bake sekali, sun/cloud berupa sprite
+        self.layers: Dict[str, OceanLayer] = {
+            'background': OceanLayer('background'),
+            'sun': OceanLayer('sun'),
+            'clouds': OceanLayer('clouds', cloud_update_interval),
+            'waves': OceanLayer('waves'),
+            # Simulasi ripple berjalan dengan cadence tetap; None = tanpa tekstur air (gradient saja)
+            'water': OceanLayer('water', water_step_interval or 0.0)
+        }
+        self.background: Optional[pygame.Surface] = None
+        self.water: Optional[WaterSurface] = None
+        if water_step_interval is not None:
+            self.water = WaterSurface(self._water_rect(), OCEAN_TOP_COLOR, OCEAN_BOTTOM_COLOR)
         
         # Initialize clouds
         for i in range(5):
             cloud = Cloud(
-                x=random.uniform(0, screen_width),
-                y=random.uniform(50, 200),
-                speed=random.uniform(10, 30)
+                x=_rng.uniform(0, screen_width),
+                y=_rng.uniform(50, 200),
+                speed=_rng.uniform(10, 30)
             )
             self.clouds.append(cloud)
     
+    def invalidate(self, layer: Optional[str] = None):
+        """Invalidate satu layer (atau semua) supaya di-bake ulang saat render berikutnya"""
+        for name, ocean_layer in self.layers.items():
+            if layer is None or name == layer:
+                ocean_layer.invalidate()
+    
+    def resize(self, screen_width: int, screen_height: int):
+        """Ubah ukuran ocean dan bake ulang background"""
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.invalidate('background')
+        if self.water is not None:
+            self.water = WaterSurface(self._water_rect(), OCEAN_TOP_COLOR, OCEAN_BOTTOM_COLOR)
+    
+    def _water_rect(self) -> pygame.Rect:
+        """Area laut (setengah bawah layar)"""
+        horizon = self.screen_height // 2
+        return pygame.Rect(0, horizon, self.screen_width, self.screen_height - horizon)
+    
+    def splash(self, x: float, y: float, strength: float = 60.0):
+        """Ripple di permukaan air (mis. cannonball jatuh ke laut)"""
+        if self.water is not None:
+            self.water.disturb(x, y, strength)
+    
+    def _bake_background(self):
+        """Bake sky dan ocean gradient ke satu surface"""
+        surface = pygame.Surface((self.screen_width, self.screen_height))
+        
+        # Sky gradient (blue to light blue)
+        for y in range(self.screen_height // 2):
+            ratio = y / (self.screen_height // 2)
+            r = int(135 + (70 - 135) * ratio)
+            g = int(206 + (130 - 206) * ratio)
+            b = int(235 + (180 - 235) * ratio)
+            pygame.draw.line(surface, (r, g, b), (0, y), (self.screen_width, y))
+        
+        # Ocean gradient
+        for y in range(self.screen_height // 2, self.screen_height):
+            ratio = (y - self.screen_height // 2) / (self.screen_height // 2)
+            r = int(OCEAN_TOP_COLOR[0] + (OCEAN_BOTTOM_COLOR[0] - OCEAN_TOP_COLOR[0]) * ratio)
+            g = int(OCEAN_TOP_COLOR[1] + (OCEAN_BOTTOM_COLOR[1] - OCEAN_TOP_COLOR[1]) * ratio)
+            b = int(OCEAN_TOP_COLOR[2] + (OCEAN_BOTTOM_COLOR[2] - OCEAN_TOP_COLOR[2]) * ratio)
+            pygame.draw.line(surface, (r, g, b), (0, y), (self.screen_width, y))
+        
+        self.background = optimize_surface(surface)
+    
+    def _bake_layers(self):
+        """Bake ulang layer yang dirty"""
+        layers = self.layers
+        if layers['background'].dirty:
+            self._bake_background()
+            layers['background'].dirty = False
+        if layers['sun'].dirty:
+            self.sun.bake()
+            layers['sun'].dirty = False
+        if layers['clouds'].dirty:
+            for cloud in self.clouds:
+                cloud.bake()
+            layers['clouds'].dirty = False
+    
     def update(self, dt: float):
         """Update all effects"""
-        for wave in self.waves:
-            wave.update(dt)
+        wave_dt = self.layers['waves'].tick(dt)
+        if wave_dt:
+            self.waves.update(wave_dt)
         
-        for cloud in self.clouds:
-            cloud.update(dt, self.screen_width)
+        # Clouds bergerak lambat, cukup di-update dengan cadence lebih rendah
+        cloud_dt = self.layers['clouds'].tick(dt)
+        if cloud_dt:
+            for cloud in self.clouds:
+                cloud.update(cloud_dt, self.screen_width)
+        
+        if self.water is not None and self.layers['water'].tick(dt):
+            self.water.update(self.layers['water'].update_interval)
         
         self.sun.update(dt)
     
     def render(self, screen: pygame.Surface):
         """Render ocean scene"""
-        # Sky gradient (blue to light blue)
-        for y in range(self.screen_height // 2):
-            ratio = y / (self.screen_height // 2)
-            r = int(135 + (70 - 135) * ratio)
-            g = int(206 + (130 - 206) * ratio)
-            b = int(235 + (180 - 235) * ratio)
-            pygame.draw.line(screen, (r, g, b), (0, y), (self.screen_width, y))
+        self._bake_layers()
+        
+        # Background (sky + ocean gradient); laut ditutup tekstur air jika ada
+        if self.water is None:
+            screen.blit(self.background, (0, 0))
+        else:
+            screen.blit(self.background, (0, 0), (0, 0, self.screen_width, self.water.rect.top))
+            self.water.render(screen)
         
         # Sun
         self.sun.render(screen)
@@ -141,18 +299,5 @@ class OceanRenderer:
         for cloud in self.clouds:
             cloud.render(screen)
         
-        # Ocean base
-        ocean_rect = pygame.Rect(0, self.screen_height // 2, self.screen_width, self.screen_height // 2)
-        
-        # Ocean gradient
-        for y in range(self.screen_height // 2, self.screen_height):
-            ratio = (y - self.screen_height // 2) / (self.screen_height // 2)
-            r = int(30 + (60 - 30) * ratio)
-            g = int(60 + (120 - 60) * ratio)
-            b = int(90 + (180 - 90) * ratio)
-            pygame.draw.line(screen, (r, g, b), (0, y), (self.screen_width, y))
-        
         # Waves
-        for wave in self.waves:
-            wave.render(screen, self.screen_width, self.screen_height)
-
+        self.waves.render(screen, self.screen_width)
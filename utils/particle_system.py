@@ -1,93 +1,192 @@
 """
 Particle System - Particle effects untuk cannonball impact dan explosion
+Struct-of-arrays NumPy dengan pool berkapasitas tetap (tanpa objek Python per partikel)
 """
 import pygame
-import math
-import random
-from typing import List, Tuple
-
-class Particle:
-    """Single particle"""
-    def __init__(self, x: float, y: float, vx: float, vy: float, color: Tuple[int, int, int], lifetime: float):
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
-        self.color = color
-        self.lifetime = lifetime
-        self.max_lifetime = lifetime
-        self.size = random.uniform(2, 5)
-        
-    def update(self, dt: float):
-        """Update particle"""
-        self.x += self.vx * dt
-        self.y += self.vy * dt
-        self.vy += 200 * dt  # Gravity
-        self.lifetime -= dt
-        
-    def is_alive(self) -> bool:
-        """Check if particle is still alive"""
-        return self.lifetime > 0
-    
-    def render(self, screen: pygame.Surface):
-        """Render particle"""
-        if self.is_alive():
-            alpha = int(255 * (self.lifetime / self.max_lifetime))
-            color = (*self.color[:3], alpha)
-            size = int(self.size * (self.lifetime / self.max_lifetime))
-            if size > 0:
-                pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), size)
+import numpy as np
+from itertools import repeat
+from typing import Dict, List, Optional, Tuple
+from utils.rng import stream
+from utils.surfaces import optimize_surface
+
+# Stream RNG sendiri supaya bisa direproduksi saat replay
+_rng = stream('particles')
+
+GRAVITY = 200.0
+
+# Kuantisasi stamp: radius 1..MAX_STAMP_RADIUS dan bucket alpha 1..ALPHA_BUCKETS
+MAX_STAMP_RADIUS = 8
+ALPHA_BUCKETS = 8
+
+BLEND_ALPHA = 'alpha'
+BLEND_ADDITIVE = 'additive'
+
 
 class ParticleSystem:
-    """Particle system manager"""
-    
-    def __init__(self):
-        self.particles: List[Particle] = []
-    
-    def create_explosion(self, x: float, y: float, color: Tuple[int, int, int] = (255, 200, 0), count: int = 15):
+    """Particle system dengan array preallocated dan swap-compaction untuk partikel mati"""
+
+    def __init__(self, capacity: int = 65536, blend_mode: str = BLEND_ALPHA):
+        self.capacity = capacity
+        self.blend_mode = blend_mode
+        self.count = 0
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.max_life = np.ones(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.color_index = np.zeros(capacity, dtype=np.uint8)
+
+        # Palette (warna RGBA, additive) dengan index uint8 per partikel
+        self.palette: List[Tuple[Tuple[int, int, int, int], bool]] = []
+        self._palette_lookup: Dict[Tuple[Tuple[int, int, int, int], bool], int] = {}
+        self._palette_flags: List[int] = []
+        # Stamp lingkaran pre-faded, key = (palette, radius, bucket alpha) sebagai int
+        self._stamps: Dict[int, pygame.Surface] = {}
+
+        # Generator NumPy di-seed dari stream 'particles' supaya replay tetap deterministik
+        self.rng = np.random.default_rng(_rng.getrandbits(64))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _color_id(self, color: Tuple[int, ...], blend_mode: Optional[str] = None) -> int:
+        """Index palette untuk warna (alpha warna menjadi alpha awal partikel)"""
+        rgba = (color[0], color[1], color[2], color[3] if len(color) > 3 else 255)
+        additive = (blend_mode or self.blend_mode) == BLEND_ADDITIVE
+        key = (rgba, additive)
+        index = self._palette_lookup.get(key)
+        if index is None:
+            if len(self.palette) >= 256:
+                raise ValueError("Palette partikel penuh (maks 256 warna)")
+            index = self._palette_lookup[key] = len(self.palette)
+            self.palette.append(key)
+            self._palette_flags.append(pygame.BLEND_RGB_ADD if additive else 0)
+        return index
+
+    def _emit(self, x: float, y: float, count: int, color: Tuple[int, ...],
+              angle_range: Tuple[float, float], speed_range: Tuple[float, float],
+              life_range: Tuple[float, float], vy_offset: float = 0.0,
+              blend_mode: Optional[str] = None):
+        """Emit batch partikel sekaligus (partikel di atas kapasitas dibuang)"""
+        count = min(count, self.capacity - self.count)
+        if count <= 0:
+            return
+        start, end = self.count, self.count + count
+        rng = self.rng
+        angle = rng.uniform(angle_range[0], angle_range[1], count)
+        speed = rng.uniform(speed_range[0], speed_range[1], count)
+
+        self.pos[start:end, 0] = x
+        self.pos[start:end, 1] = y
+        self.vel[start:end, 0] = np.cos(angle) * speed
+        self.vel[start:end, 1] = np.sin(angle) * speed + vy_offset
+        life = rng.uniform(life_range[0], life_range[1], count)
+        self.life[start:end] = life
+        self.max_life[start:end] = life
+        self.size[start:end] = rng.uniform(2, 5, count)
+        self.color_index[start:end] = self._color_id(color, blend_mode)
+        self.count = end
+
+    def create_explosion(self, x: float, y: float, color: Tuple[int, int, int] = (255, 200, 0), count: int = 15,
+                         blend_mode: Optional[str] = None):
         """Create explosion effect"""
-        for _ in range(count):
-            angle = random.uniform(0, math.pi * 2)
-            speed = random.uniform(100, 300)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-            lifetime = random.uniform(0.3, 0.8)
-            particle = Particle(x, y, vx, vy, color, lifetime)
-            self.particles.append(particle)
-    
-    def create_smoke(self, x: float, y: float, count: int = 8):
+        self._emit(x, y, count, color, (0, np.pi * 2), (100, 300), (0.3, 0.8), blend_mode=blend_mode)
+
+    def create_smoke(self, x: float, y: float, count: int = 8, blend_mode: Optional[str] = None):
         """Create smoke effect"""
-        for _ in range(count):
-            angle = random.uniform(0, math.pi * 2)
-            speed = random.uniform(20, 80)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed - 50  # Upward
-            lifetime = random.uniform(0.5, 1.2)
-            color = (100, 100, 100, 200)
-            particle = Particle(x, y, vx, vy, color, lifetime)
-            self.particles.append(particle)
-    
-    def create_water_splash(self, x: float, y: float, count: int = 10):
+        self._emit(x, y, count, (100, 100, 100, 200), (0, np.pi * 2), (20, 80), (0.5, 1.2), vy_offset=-50,
+                   blend_mode=blend_mode)
+
+    def create_water_splash(self, x: float, y: float, count: int = 10, blend_mode: Optional[str] = None):
         """Create water splash effect"""
-        for _ in range(count):
-            angle = random.uniform(-math.pi / 2, math.pi / 2)
-            speed = random.uniform(50, 150)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-            lifetime = random.uniform(0.2, 0.6)
-            color = (100, 150, 255)
-            particle = Particle(x, y, vx, vy, color, lifetime)
-            self.particles.append(particle)
-    
+        self._emit(x, y, count, (100, 150, 255), (-np.pi / 2, np.pi / 2), (50, 150), (0.2, 0.6),
+                   blend_mode=blend_mode)
+
     def update(self, dt: float):
         """Update all particles"""
-        for particle in self.particles[:]:
-            particle.update(dt)
-            if not particle.is_alive():
-                self.particles.remove(particle)
-    
+        n = self.count
+        if n == 0:
+            return
+        self.pos[:n] += self.vel[:n] * dt
+        self.vel[:n, 1] += GRAVITY * dt  # Gravity
+        self.life[:n] -= dt
+
+        dead = self.life[:n] <= 0
+        if dead.any():
+            self._compact(dead)
+
+    def _compact(self, dead: np.ndarray):
+        """Swap-compaction: partikel hidup dari ekor mengisi slot partikel mati"""
+        n = self.count
+        alive_count = n - int(np.count_nonzero(dead))
+        holes = np.flatnonzero(dead[:alive_count])
+        movers = alive_count + np.flatnonzero(~dead[alive_count:n])
+        if len(holes):
+            for array in (self.pos, self.vel, self.life, self.max_life, self.size, self.color_index):
+                array[holes] = array[movers]
+        self.count = alive_count
+
+    def clear(self):
+        """Hapus semua partikel"""
+        self.count = 0
+
+    def _build_stamp(self, key: int) -> pygame.Surface:
+        """Render satu stamp lingkaran untuk key (palette, radius, bucket alpha)"""
+        palette_index, rest = divmod(key, (MAX_STAMP_RADIUS + 1) * (ALPHA_BUCKETS + 1))
+        radius, bucket = divmod(rest, ALPHA_BUCKETS + 1)
+        (r, g, b, base_alpha), additive = self.palette[palette_index]
+        alpha = base_alpha * bucket // ALPHA_BUCKETS
+        size = radius * 2
+        if additive:
+            # Additive: warna dikali alpha di atas background hitam, di-blit dengan BLEND_RGB_ADD
+            stamp = pygame.Surface((size, size))
+            stamp.fill((0, 0, 0))
+            pygame.draw.circle(stamp, (r * alpha // 255, g * alpha // 255, b * alpha // 255), (radius, radius), radius)
+            stamp = optimize_surface(stamp)
+        else:
+            stamp = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(stamp, (r, g, b, alpha), (radius, radius), radius)
+            stamp = optimize_surface(stamp, alpha=True)
+        self._stamps[key] = stamp
+        return stamp
+
     def render(self, screen: pygame.Surface):
-        """Render all particles"""
-        for particle in self.particles:
-            particle.render(screen)
+        """Render semua partikel dalam satu Surface.blits"""
+        n = self.count
+        if n == 0:
+            return
+        ratio = self.life[:n] / self.max_life[:n]
+        radius = np.minimum((self.size[:n] * ratio).astype(np.int32), MAX_STAMP_RADIUS)
+        left = self.pos[:n, 0].astype(np.int32) - radius
+        top = self.pos[:n, 1].astype(np.int32) - radius
+
+        # Cull partikel tanpa ukuran dan yang di luar layar
+        width, height = screen.get_size()
+        visible = np.flatnonzero((radius > 0) & (left < width) & (top < height) &
+                                 (left + radius * 2 > 0) & (top + radius * 2 > 0))
+        if len(visible) == 0:
+            return
+
+        buckets = np.clip(np.ceil(ratio[visible] * ALPHA_BUCKETS), 1, ALPHA_BUCKETS).astype(np.int32)
+        palette_index = self.color_index[visible].astype(np.int32)
+        keys = (palette_index * (MAX_STAMP_RADIUS + 1) + radius[visible]) * (ALPHA_BUCKETS + 1) + buckets
+
+        # Urutkan per stamp supaya sequence blits dibangun per grup (surface dan flag konstan)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        unique_keys, starts = np.unique(sorted_keys, return_index=True)
+        positions = list(zip(left[visible][order].tolist(), top[visible][order].tolist()))
+        bounds = starts.tolist() + [len(sorted_keys)]
 
+        stamps = self._stamps
+        divisor = (MAX_STAMP_RADIUS + 1) * (ALPHA_BUCKETS + 1)
+        sequence = []
+        for i, key in enumerate(unique_keys.tolist()):
+            stamp = stamps.get(key) or self._build_stamp(key)
+            group = positions[bounds[i]:bounds[i + 1]]
+            flag = self._palette_flags[key // divisor]
+            if flag:
+                sequence += zip(repeat(stamp), group, repeat(None), repeat(flag))
+            else:
+                sequence += zip(repeat(stamp), group)
+        screen.blits(sequence, doreturn=False)
@@ -0,0 +1,93 @@
+"""
+Object Pool - Pakai ulang entity (cannonball, enemy) supaya tidak ada alokasi per tembakan/spawn
+"""
+from typing import Callable, Dict, Generic, Iterator, List, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class ObjectPool(Generic[T]):
+    """Free-list objek; acquire() memanggil reset(*args) pada objek yang dipakai ulang"""
+
+    def __init__(self, factory: Callable[..., T], prealloc: int = 0, max_free: int = 256):
+        self.factory = factory
+        self.max_free = max_free
+        self.free: List[T] = []
+        self.created = 0
+        for _ in range(prealloc):
+            self.free.append(self._create())
+
+    def _create(self, *args) -> T:
+        self.created += 1
+        return self.factory(*args)
+
+    def acquire(self, *args) -> T:
+        """Ambil objek dari free-list (atau buat baru jika kosong)"""
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+            return obj
+        return self._create(*args)
+
+    def release(self, obj: T):
+        """Kembalikan objek ke pool (dibuang jika free-list sudah penuh)"""
+        if len(self.free) < self.max_free:
+            self.free.append(obj)
+
+
+class ActiveSet(Generic[T]):
+    """Objek aktif dengan add/remove O(1) (swap-remove); urutan iterasi tidak dijamin stabil"""
+
+    def __init__(self, pool: Optional[ObjectPool[T]] = None):
+        self.pool = pool
+        self.items: List[T] = []
+        self._index: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.items)
+
+    def __contains__(self, obj: T) -> bool:
+        return id(obj) in self._index
+
+    def add(self, obj: T) -> T:
+        """Tambahkan objek ke set aktif"""
+        self._index[id(obj)] = len(self.items)
+        self.items.append(obj)
+        return obj
+
+    def spawn(self, *args) -> T:
+        """Acquire dari pool lalu tambahkan ke set aktif"""
+        return self.add(self.pool.acquire(*args))
+
+    def remove(self, obj: T):
+        """Hapus objek: slot diisi elemen terakhir, lalu objek dikembalikan ke pool"""
+        index = self._index.pop(id(obj))
+        last = self.items.pop()
+        if last is not obj:
+            self.items[index] = last
+            self._index[id(last)] = index
+        if self.pool is not None:
+            self.pool.release(obj)
+
+    def sweep(self, keep: Callable[[T], bool]) -> int:
+        """Hapus semua objek yang tidak lolos keep(); return jumlah yang dihapus"""
+        items = self.items
+        removed = 0
+        # Iterasi mundur: elemen terakhir yang dipindah ke slot kosong sudah dicek
+        for i in range(len(items) - 1, -1, -1):
+            obj = items[i]
+            if not keep(obj):
+                self.remove(obj)
+                removed += 1
+        return removed
+
+    def clear(self):
+        """Kosongkan set aktif dan kembalikan semua objek ke pool"""
+        if self.pool is not None:
+            for obj in self.items:
+                self.pool.release(obj)
+        self.items.clear()
+        self._index.clear()
@@ -0,0 +1,48 @@
+"""
+RNG Streams - Random generator terpisah per subsistem supaya run bisa direproduksi (replay)
+"""
+import os
+import random
+import zlib
+from typing import Dict
+
+_streams: Dict[str, random.Random] = {}
+_seeds: Dict[str, int] = {}
+_master_seed = int.from_bytes(os.urandom(4), 'little')
+
+
+def _derive_seed(master_seed: int, name: str) -> int:
+    """Seed stream diturunkan dari master seed dan nama stream"""
+    return (master_seed * 1000003 ^ zlib.crc32(name.encode())) & 0xFFFFFFFF
+
+
+def stream(name: str) -> random.Random:
+    """Ambil stream RNG bernama (dibuat saat pertama kali diminta)"""
+    rng = _streams.get(name)
+    if rng is None:
+        seed = _seeds.setdefault(name, _derive_seed(_master_seed, name))
+        rng = _streams[name] = random.Random(seed)
+    return rng
+
+
+def reseed(master_seed: int):
+    """Seed ulang semua stream dari satu master seed"""
+    global _master_seed
+    _master_seed = master_seed
+    _seeds.clear()
+    for name, rng in _streams.items():
+        _seeds[name] = _derive_seed(master_seed, name)
+        rng.seed(_seeds[name])
+
+
+def get_seeds() -> Dict[str, int]:
+    """Seed semua stream (untuk disimpan di file replay)"""
+    return dict(_seeds)
+
+
+def set_seeds(seeds: Dict[str, int]):
+    """Pakai seed tertentu per stream (mis. dari file replay)"""
+    for name, seed in seeds.items():
+        _seeds[name] = seed
+        if name in _streams:
+            _streams[name].seed(seed)
@@ -1,101 +1,208 @@
 """
 Ship Icons - Icon rendering untuk ship, enemy, dan cannonball
+Sprite di-bake sekali per (jenis, ukuran) dan hasil rotasinya di-cache per heading terkuantisasi
 """
 import pygame
-import math
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
+from utils.surfaces import colorkey_surface
+
+# Heading dikuantisasi ke ROTATION_STEPS arah (360 / 64 = 5.625 derajat)
+ROTATION_STEPS = 64
+# Batas jumlah sprite hasil rotasi yang disimpan (LRU)
+MAX_ROTATED_SPRITES = 256
+# Padding sprite supaya outline polygon tidak terpotong
+SPRITE_PADDING = 2
+# Sprite disimpan dengan colorkey + RLE (art tanpa alpha parsial): blit ~8x lebih cepat dari per-pixel alpha
+SPRITE_COLORKEY = (255, 0, 255)
+
+SpriteKey = Tuple[str, int, int]
+
+
+def _paint_merchant_ship(surface: pygame.Surface, x: int, y: int, width: int, height: int):
+    """Gambar merchant ship dengan detail (menghadap ke kanan)"""
+    # Ship body (hull)
+    ship_points = [
+        (x + width * 0.2, y + height),
+        (x + width * 0.8, y + height),
+        (x + width * 0.9, y + height * 0.7),
+        (x + width * 0.7, y + height * 0.3),
+        (x + width * 0.3, y + height * 0.3),
+        (x + width * 0.1, y + height * 0.7)
+    ]
+    pygame.draw.polygon(surface, (100, 150, 200), ship_points)
+    pygame.draw.polygon(surface, (255, 255, 255), ship_points, 2)
+
+    # Deck
+    deck_rect = pygame.Rect(x + width * 0.2, y + height * 0.3, width * 0.6, height * 0.15)
+    pygame.draw.rect(surface, (139, 69, 19), deck_rect)
+
+    # Mast
+    mast_x = x + width * 0.5
+    mast_y_start = y + height * 0.3
+    mast_y_end = y + height * 0.1
+    pygame.draw.line(surface, (101, 67, 33), (mast_x, mast_y_start), (mast_x, mast_y_end), 3)
+
+    # Sail (ujung layar relatif terhadap y kapal, bukan koordinat layar absolut)
+    sail_points = [
+        (mast_x, mast_y_start),
+        (mast_x, mast_y_end),
+        (mast_x + width * 0.2, y + (mast_y_start - y) * 0.7),
+        (mast_x, mast_y_start)
+    ]
+    pygame.draw.polygon(surface, (240, 240, 240), sail_points)
+    pygame.draw.polygon(surface, (200, 200, 200), sail_points, 2)
+
+    # Flag
+    flag_rect = pygame.Rect(mast_x, mast_y_end, width * 0.15, height * 0.1)
+    pygame.draw.rect(surface, (200, 50, 50), flag_rect)
+    pygame.draw.rect(surface, (255, 255, 255), flag_rect, 1)
+
+
+def _paint_enemy_ship(surface: pygame.Surface, x: int, y: int, width: int, height: int):
+    """Gambar enemy ship (pirate ship, menghadap ke kanan)"""
+    # Ship body - more aggressive shape
+    ship_points = [
+        (x + width * 0.15, y + height),
+        (x + width * 0.85, y + height),
+        (x + width * 0.95, y + height * 0.65),
+        (x + width * 0.75, y + height * 0.25),
+        (x + width * 0.25, y + height * 0.25),
+        (x + width * 0.05, y + height * 0.65)
+    ]
+    pygame.draw.polygon(surface, (150, 50, 50), ship_points)
+    pygame.draw.polygon(surface, (255, 255, 255), ship_points, 2)
+
+    # Skull flag
+    flag_rect = pygame.Rect(x + width * 0.5, y + height * 0.1, width * 0.2, height * 0.15)
+    pygame.draw.rect(surface, (0, 0, 0), flag_rect)
+    pygame.draw.rect(surface, (255, 255, 255), flag_rect, 2)
+
+    # Skull symbol
+    skull_center = (flag_rect.centerx, flag_rect.centery)
+    pygame.draw.circle(surface, (255, 255, 255), skull_center, 5)
+    # Eyes
+    pygame.draw.circle(surface, (0, 0, 0), (skull_center[0] - 2, skull_center[1] - 1), 1)
+    pygame.draw.circle(surface, (0, 0, 0), (skull_center[0] + 2, skull_center[1] - 1), 1)
+
+    # Cannons on side
+    for cannon_x in [x + width * 0.2, x + width * 0.8]:
+        cannon_rect = pygame.Rect(cannon_x, y + height * 0.5, width * 0.15, height * 0.1)
+        pygame.draw.rect(surface, (50, 50, 50), cannon_rect)
+
+
+def _paint_cannonball(surface: pygame.Surface, x: int, y: int, radius: int):
+    """Gambar cannonball dengan center (x, y), trail di belakang (bergerak ke kanan)"""
+    # Main ball
+    pygame.draw.circle(surface, (80, 80, 80), (x, y), radius)
+    pygame.draw.circle(surface, (100, 100, 100), (x, y), radius - 1)
+
+    # Highlight
+    highlight_x = x - radius * 0.3
+    highlight_y = y - radius * 0.3
+    pygame.draw.circle(surface, (150, 150, 150), (int(highlight_x), int(highlight_y)), radius // 3)
+
+    # Shadow
+    shadow_x = x + radius * 0.3
+    shadow_y = y + radius * 0.3
+    pygame.draw.circle(surface, (50, 50, 50), (int(shadow_x), int(shadow_y)), radius // 3)
+
+    # Trail effect (simple)
+    pygame.draw.circle(surface, (120, 120, 120), (x - radius, y), radius // 2)
+
+
+def _keyed(surface: pygame.Surface) -> pygame.Surface:
+    """Salin sprite SRCALPHA ke surface colorkey (RLEACCEL) untuk blit cepat"""
+    return colorkey_surface(surface, SPRITE_COLORKEY)
+
+
+def _bake_ship(painter: Callable) -> Callable[[int, int], pygame.Surface]:
+    def bake(width: int, height: int) -> pygame.Surface:
+        surface = pygame.Surface((width + SPRITE_PADDING * 2, height + SPRITE_PADDING * 2), pygame.SRCALPHA)
+        painter(surface, SPRITE_PADDING, SPRITE_PADDING, width, height)
+        return surface
+    return bake
+
+
+def _bake_cannonball(radius: int, _height: int) -> pygame.Surface:
+    # Sprite simetris di sekitar center supaya rotasi tetap berporos di tengah bola
+    half = radius * 2 + SPRITE_PADDING
+    surface = pygame.Surface((half * 2, half * 2), pygame.SRCALPHA)
+    _paint_cannonball(surface, half, half, radius)
+    return surface
+
 
 class ShipIconRenderer:
-    """Renderer untuk ship icons"""
-    
-    @staticmethod
-    def draw_merchant_ship(surface: pygame.Surface, x: int, y: int, width: int, height: int, angle: float = 0):
-        """Draw merchant ship dengan detail"""
-        # Ship body (hull)
-        ship_points = [
-            (x + width * 0.2, y + height),
-            (x + width * 0.8, y + height),
-            (x + width * 0.9, y + height * 0.7),
-            (x + width * 0.7, y + height * 0.3),
-            (x + width * 0.3, y + height * 0.3),
-            (x + width * 0.1, y + height * 0.7)
-        ]
-        pygame.draw.polygon(surface, (100, 150, 200), ship_points)
-        pygame.draw.polygon(surface, (255, 255, 255), ship_points, 2)
-        
-        # Deck
-        deck_rect = pygame.Rect(x + width * 0.2, y + height * 0.3, width * 0.6, height * 0.15)
-        pygame.draw.rect(surface, (139, 69, 19), deck_rect)
-        
-        # Mast
-        mast_x = x + width * 0.5
-        mast_y_start = y + height * 0.3
-        mast_y_end = y + height * 0.1
-        pygame.draw.line(surface, (101, 67, 33), (mast_x, mast_y_start), (mast_x, mast_y_end), 3)
-        
-        # Sail
-        sail_points = [
-            (mast_x, mast_y_start),
-            (mast_x, mast_y_end),
-            (mast_x + width * 0.2, mast_y_start * 0.7),
-            (mast_x, mast_y_start)
-        ]
-        pygame.draw.polygon(surface, (240, 240, 240), sail_points)
-        pygame.draw.polygon(surface, (200, 200, 200), sail_points, 2)
-        
-        # Flag
-        flag_rect = pygame.Rect(mast_x, mast_y_end, width * 0.15, height * 0.1)
-        pygame.draw.rect(surface, (200, 50, 50), flag_rect)
-        pygame.draw.rect(surface, (255, 255, 255), flag_rect, 1)
-    
-    @staticmethod
-    def draw_enemy_ship(surface: pygame.Surface, x: int, y: int, width: int, height: int, angle: float = 0):
-        """Draw enemy ship (pirate ship)"""
-        # Ship body - more aggressive shape
-        ship_points = [
-            (x + width * 0.15, y + height),
-            (x + width * 0.85, y + height),
-            (x + width * 0.95, y + height * 0.65),
-            (x + width * 0.75, y + height * 0.25),
-            (x + width * 0.25, y + height * 0.25),
-            (x + width * 0.05, y + height * 0.65)
-        ]
-        pygame.draw.polygon(surface, (150, 50, 50), ship_points)
-        pygame.draw.polygon(surface, (255, 255, 255), ship_points, 2)
-        
-        # Skull flag
-        flag_rect = pygame.Rect(x + width * 0.5, y + height * 0.1, width * 0.2, height * 0.15)
-        pygame.draw.rect(surface, (0, 0, 0), flag_rect)
-        pygame.draw.rect(surface, (255, 255, 255), flag_rect, 2)
-        
-        # Skull symbol
-        skull_center = (flag_rect.centerx, flag_rect.centery)
-        pygame.draw.circle(surface, (255, 255, 255), skull_center, 5)
-        # Eyes
-        pygame.draw.circle(surface, (0, 0, 0), (skull_center[0] - 2, skull_center[1] - 1), 1)
-        pygame.draw.circle(surface, (0, 0, 0), (skull_center[0] + 2, skull_center[1] - 1), 1)
-        
-        # Cannons on side
-        for cannon_x in [x + width * 0.2, x + width * 0.8]:
-            cannon_rect = pygame.Rect(cannon_x, y + height * 0.5, width * 0.15, height * 0.1)
-            pygame.draw.rect(surface, (50, 50, 50), cannon_rect)
-    
-    @staticmethod
-    def draw_cannonball(surface: pygame.Surface, x: int, y: int, radius: int):
-        """Draw cannonball dengan detail"""
-        # Main ball
-        pygame.draw.circle(surface, (80, 80, 80), (x, y), radius)
-        pygame.draw.circle(surface, (100, 100, 100), (x, y), radius - 1)
-        
-        # Highlight
-        highlight_x = x - radius * 0.3
-        highlight_y = y - radius * 0.3
-        pygame.draw.circle(surface, (150, 150, 150), (int(highlight_x), int(highlight_y)), radius // 3)
-        
-        # Shadow
-        shadow_x = x + radius * 0.3
-        shadow_y = y + radius * 0.3
-        pygame.draw.circle(surface, (50, 50, 50), (int(shadow_x), int(shadow_y)), radius // 3)
-        
-        # Trail effect (simple)
-        pygame.draw.circle(surface, (120, 120, 120), (x - radius, y), radius // 2)
+    """Renderer untuk ship icons (satu blit per entity dari sprite cache)"""
+
+    _bakers: Dict[str, Callable[[int, int], pygame.Surface]] = {
+        'merchant': _bake_ship(_paint_merchant_ship),
+        'enemy': _bake_ship(_paint_enemy_ship),
+        'cannonball': _bake_cannonball
+    }
+    # Master SRCALPHA per (jenis, ukuran) untuk dirotasi, sprite siap blit, dan hasil rotasi per heading (LRU)
+    _masters: Dict[SpriteKey, pygame.Surface] = {}
+    _sprites: Dict[SpriteKey, pygame.Surface] = {}
+    _rotated: "OrderedDict[Tuple[SpriteKey, int], pygame.Surface]" = OrderedDict()
+
+    @classmethod
+    def get_sprite(cls, kind: str, width: int, height: int, angle: float = 0) -> pygame.Surface:
+        """Sprite menghadap heading angle (derajat, 0 = kanan, searah jarum jam di layar)"""
+        key = (kind, width, height)
+        step = int(round(angle * ROTATION_STEPS / 360.0)) % ROTATION_STEPS
+        if step == 0:
+            sprite = cls._sprites.get(key)
+            if sprite is None:
+                sprite = cls._sprites[key] = _keyed(cls._master(key))
+            return sprite
+        rotated_key = (key, step)
+        sprite = cls._rotated.get(rotated_key)
+        if sprite is not None:
+            cls._rotated.move_to_end(rotated_key)
+            return sprite
+
+        sprite = cls._master(key)
+        heading = step * 360.0 / ROTATION_STEPS
+        if 90.0 < heading < 270.0 and kind != 'cannonball':
+            # Menghadap ke kiri: flip supaya kapal tidak terbalik, lalu miringkan sisanya
+            sprite = pygame.transform.flip(sprite, True, False)
+            heading -= 180.0
+        # rotate berputar berlawanan jarum jam, sedangkan heading di layar searah jarum jam
+        sprite = _keyed(pygame.transform.rotate(sprite, -heading))
+        cls._rotated[rotated_key] = sprite
+        while len(cls._rotated) > MAX_ROTATED_SPRITES:
+            cls._rotated.popitem(last=False)
+        return sprite
+
+    @classmethod
+    def _master(cls, key: SpriteKey) -> pygame.Surface:
+        master = cls._masters.get(key)
+        if master is None:
+            kind, width, height = key
+            master = cls._masters[key] = cls._bakers[kind](width, height)
+        return master
+
+    @classmethod
+    def clear_cache(cls):
+        """Hapus semua sprite (mis. setelah display dibuat ulang)"""
+        cls._masters.clear()
+        cls._sprites.clear()
+        cls._rotated.clear()
+
+    @classmethod
+    def draw_merchant_ship(cls, surface: pygame.Surface, x: int, y: int, width: int, height: int, angle: float = 0):
+        """Draw merchant ship menghadap arah gerak"""
+        sprite = cls.get_sprite('merchant', width, height, angle)
+        surface.blit(sprite, sprite.get_rect(center=(x + width // 2, y + height // 2)))
+
+    @classmethod
+    def draw_enemy_ship(cls, surface: pygame.Surface, x: int, y: int, width: int, height: int, angle: float = 0):
+        """Draw enemy ship (pirate ship) menghadap arah gerak"""
+        sprite = cls.get_sprite('enemy', width, height, angle)
+        surface.blit(sprite, sprite.get_rect(center=(x + width // 2, y + height // 2)))
 
+    @classmethod
+    def draw_cannonball(cls, surface: pygame.Surface, x: int, y: int, radius: int, angle: float = 0):
+        """Draw cannonball dengan trail di belakang arah gerak"""
+        sprite = cls.get_sprite('cannonball', radius, radius, angle)
+        surface.blit(sprite, sprite.get_rect(center=(x, y)))
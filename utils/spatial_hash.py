@@ -0,0 +1,82 @@
+"""
+Spatial Hash - Broadphase uniform grid untuk collision (biaya sebanding jumlah pasangan yang berdekatan)
+"""
+import pygame
+from typing import Any, Dict, List, Tuple
+
+Cell = Tuple[int, int]
+
+
+class SpatialHash:
+    """Grid hash berisi objek per layer; di-clear dan diisi ulang setiap tick"""
+
+    def __init__(self, cell_size: int = 128):
+        self.cell_size = cell_size
+        # layer -> cell -> index entry
+        self.cells: Dict[str, Dict[Cell, List[int]]] = {}
+        # Entry: (obj, rect, layer)
+        self.entries: List[Tuple[Any, pygame.Rect, str]] = []
+
+    def clear(self):
+        """Kosongkan grid (objek di-insert ulang tiap tick)"""
+        self.cells.clear()
+        self.entries.clear()
+
+    def _cell_range(self, rect: pygame.Rect) -> Tuple[int, int, int, int]:
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+    def insert(self, obj: Any, rect: pygame.Rect, layer: str):
+        """Daftarkan objek dengan bounding rect-nya pada layer tertentu"""
+        index = len(self.entries)
+        self.entries.append((obj, rect, layer))
+        grid = self.cells.get(layer)
+        if grid is None:
+            grid = self.cells[layer] = {}
+        x0, y0, x1, y1 = self._cell_range(rect)
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                bucket = grid.get((cx, cy))
+                if bucket is None:
+                    grid[(cx, cy)] = [index]
+                else:
+                    bucket.append(index)
+
+    def query_rect(self, rect: pygame.Rect, layer: str) -> List[Any]:
+        """Objek pada layer yang overlap dengan rect (urut sesuai insert)"""
+        grid = self.cells.get(layer)
+        if not grid:
+            return []
+        found = set()
+        x0, y0, x1, y1 = self._cell_range(rect)
+        for cy in range(y0, y1 + 1):
+            for cx in range(x0, x1 + 1):
+                for index in grid.get((cx, cy), ()):
+                    if index not in found and rect.colliderect(self.entries[index][1]):
+                        found.add(index)
+        return [self.entries[index][0] for index in sorted(found)]
+
+    def query_pairs(self, layer_a: str, layer_b: str) -> List[Tuple[Any, Any]]:
+        """Pasangan (a, b) yang rect-nya overlap, urut sesuai insert a lalu b"""
+        grid_a = self.cells.get(layer_a)
+        grid_b = self.cells.get(layer_b)
+        if not grid_a or not grid_b:
+            return []
+        # Iterasi grid yang lebih kecil, lookup di grid lainnya
+        if len(grid_b) < len(grid_a):
+            cells = [(cell, grid_a.get(cell), bucket_b) for cell, bucket_b in grid_b.items()]
+        else:
+            cells = [(cell, bucket_a, grid_b.get(cell)) for cell, bucket_a in grid_a.items()]
+
+        entries = self.entries
+        pairs = set()
+        for _, bucket_a, bucket_b in cells:
+            if not bucket_a or not bucket_b:
+                continue
+            for index_a in bucket_a:
+                rect_a = entries[index_a][1]
+                for index_b in bucket_b:
+                    if rect_a.colliderect(entries[index_b][1]):
+                        pairs.add((index_a, index_b))
+        return [(entries[index_a][0], entries[index_b][0]) for index_a, index_b in sorted(pairs)]
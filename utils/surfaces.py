@@ -0,0 +1,20 @@
+"""
+Surface Utils - Helper untuk surface yang di-bake sekali lalu sering di-blit
+"""
+import pygame
+
+
+def optimize_surface(surface: pygame.Surface, alpha: bool = False) -> pygame.Surface:
+    """Convert surface ke pixel format display supaya blit cepat (jika display sudah ada)"""
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        return surface.convert_alpha() if alpha else surface.convert()
+    return surface
+
+
+def colorkey_surface(surface: pygame.Surface, colorkey=(255, 0, 255)) -> pygame.Surface:
+    """Salin sprite SRCALPHA tanpa alpha parsial ke surface colorkey + RLE (blit jauh lebih cepat)"""
+    keyed = pygame.Surface(surface.get_size())
+    keyed.fill(colorkey)
+    keyed.blit(surface, (0, 0))
+    keyed.set_colorkey(colorkey, pygame.RLEACCEL)
+    return optimize_surface(keyed)
@@ -0,0 +1,94 @@
+"""
+Text Cache - Font registry bersama dan cache surface teks dengan LRU berbatas memori
+"""
+import pygame
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+Color = Tuple[int, ...]
+
+
+class FontRegistry:
+    """Registry font supaya tiap (nama, ukuran) hanya dibuat sekali"""
+
+    def __init__(self):
+        self._fonts: Dict[Tuple[Optional[str], int], pygame.font.Font] = {}
+
+    def get(self, size: int, name: Optional[str] = None) -> pygame.font.Font:
+        """Ambil font (dibuat saat pertama kali diminta)"""
+        key = (name, size)
+        font = self._fonts.get(key)
+        if font is None:
+            try:
+                font = pygame.font.Font(name, size)
+            except Exception:
+                # Fallback ke system font
+                font = pygame.font.SysFont('arial', size)
+            self._fonts[key] = font
+        return font
+
+    def clear(self):
+        """Hapus semua font (mis. setelah pygame.quit)"""
+        self._fonts.clear()
+
+
+class TextCache:
+    """Cache surface hasil render teks dengan LRU berdasarkan jumlah byte"""
+
+    def __init__(self, font_registry: FontRegistry, max_bytes: int = 8 * 1024 * 1024):
+        self.fonts = font_registry
+        self.max_bytes = max_bytes
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+
+    def _get(self, key: tuple) -> Optional[pygame.Surface]:
+        surface = self._cache.get(key)
+        if surface is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+        return surface
+
+    def _put(self, key: tuple, surface: pygame.Surface):
+        self.misses += 1
+        self._cache[key] = surface
+        self.bytes_used += surface.get_width() * surface.get_height() * surface.get_bytesize()
+        # Evict entry yang paling lama tidak dipakai
+        while self.bytes_used > self.max_bytes and len(self._cache) > 1:
+            _, old = self._cache.popitem(last=False)
+            self.bytes_used -= old.get_width() * old.get_height() * old.get_bytesize()
+
+    def render(self, text: str, size: int, color: Color, antialias: bool = True,
+               font_name: Optional[str] = None) -> pygame.Surface:
+        """Render teks (atau ambil dari cache). Surface hasil jangan dimodifikasi."""
+        key = (text, size, tuple(color), antialias, font_name)
+        surface = self._get(key)
+        if surface is None:
+            surface = self.fonts.get(size, font_name).render(text, antialias, color)
+            self._put(key, surface)
+        return surface
+
+    def render_label(self, text: str, size: int, color: Color, bg_color: Color,
+                     pad_x: int = 4, pad_y: int = 2) -> pygame.Surface:
+        """Render label teks dengan background semi-transparan (mis. nama NPC)"""
+        key = ('label', text, size, tuple(color), tuple(bg_color), pad_x, pad_y)
+        surface = self._get(key)
+        if surface is None:
+            text_surface = self.render(text, size, color)
+            surface = pygame.Surface((text_surface.get_width() + pad_x * 2,
+                                      text_surface.get_height() + pad_y * 2), pygame.SRCALPHA)
+            surface.fill(bg_color)
+            surface.blit(text_surface, (pad_x, pad_y))
+            self._put(key, surface)
+        return surface
+
+    def clear(self):
+        """Kosongkan cache"""
+        self._cache.clear()
+        self.bytes_used = 0
+
+
+# Global instances
+fonts = FontRegistry()
+text_cache = TextCache(fonts)
@@ -3,6 +3,7 @@ UI Button System - Sistem button yang lebih baik dengan hover dan click effects
 """
 import pygame
 from typing import Callable, Optional, Tuple
+from utils.text_cache import text_cache
 
 class Button:
     """Button class dengan hover, click, dan visual feedback"""
@@ -23,7 +24,7 @@ class Button:
         self.text_color = text_color
         self.border_color = border_color
         self.border_width = border_width
-        self.font = pygame.font.Font(None, font_size)
+        self.font_size = font_size
         self.is_hovered = False
         self.is_clicked = False
         self.click_timer = 0.0
@@ -67,7 +68,7 @@ class Button:
         
         # Draw text or icon
         if self.text:
-            text_surface = self.font.render(self.text, True, self.text_color)
+            text_surface = text_cache.render(self.text, self.font_size, self.text_color)
             text_rect = text_surface.get_rect(center=self.rect.center)
             screen.blit(text_surface, text_rect)
         elif self.rect.width == 25 and self.rect.height == 25:
@@ -0,0 +1,119 @@
+"""
+Water Surface - Tekstur air animasi dari simulasi heightfield low-res (ripple) dengan NumPy
+
+Heightfield berukuran rect / cell_size disimulasikan dengan persamaan gelombang diskrit (dua buffer),
+diwarnai dengan gradient laut + shading dari kemiringan permukaan, lalu dikirim ke Surface lewat
+pygame.surfarray dan di-scale ke ukuran layar. Biaya per step tetap, tidak tergantung jumlah ripple.
+"""
+import pygame
+import numpy as np
+from typing import Optional, Tuple
+from utils.rng import stream
+from utils.surfaces import optimize_surface
+
+# Stream RNG sendiri (tetesan ambient) supaya tidak menggeser RNG gameplay
+_rng = stream('water')
+
+# Ukuran satu sel heightfield dalam pixel layar
+WATER_CELL_SIZE = 8
+# Redaman per step (1 = ripple tidak pernah hilang)
+WATER_DAMPING = 0.97
+# Koefisien laplacian (kecepatan gelombang^2); di bawah batas stabil 0.5 supaya tidak muncul pola papan catur
+WATER_WAVE_COEFFICIENT = 0.3
+# Skala kemiringan -> perubahan brightness warna, dan batas perubahannya
+WATER_SHADING = 1.5
+WATER_MAX_LIGHT = 40.0
+# Tetesan ambient per detik supaya permukaan tidak pernah diam total
+WATER_AMBIENT_DROPS = 4.0
+
+
+class WaterSurface:
+    """Permukaan air low-res di area rect (koordinat layar)"""
+
+    def __init__(self, rect: pygame.Rect, top_color: Tuple[int, int, int], bottom_color: Tuple[int, int, int],
+                 cell_size: int = WATER_CELL_SIZE, damping: float = WATER_DAMPING,
+                 ambient_drops: float = WATER_AMBIENT_DROPS):
+        self.rect = pygame.Rect(rect)
+        self.cell_size = cell_size
+        self.damping = damping
+        self.ambient_drops = ambient_drops
+        self.grid_width = max(3, self.rect.width // cell_size)
+        self.grid_height = max(3, self.rect.height // cell_size)
+        size = (self.grid_width, self.grid_height)
+        # Index [x, y] mengikuti surfarray
+        self.height = np.zeros(size, dtype=np.float32)
+        self.previous = np.zeros(size, dtype=np.float32)
+        self._light = np.empty((self.grid_width - 2, self.grid_height - 2), dtype=np.float32)
+        self._rgb = np.empty(size + (3,), dtype=np.float32)
+        self._pixels = np.empty(size + (3,), dtype=np.uint8)
+
+        # Warna dasar per baris: gradient laut yang sama dengan background
+        ratio = np.linspace(0.0, 1.0, self.grid_height, dtype=np.float32)[:, None]
+        top = np.array(top_color, dtype=np.float32)
+        bottom = np.array(bottom_color, dtype=np.float32)
+        self._base = (top + (bottom - top) * ratio)[None, :, :]
+
+        self._small: Optional[pygame.Surface] = None
+        self._scaled: Optional[pygame.Surface] = None
+        self.dirty = True
+
+    def disturb(self, x: float, y: float, strength: float = 60.0, radius: int = 1):
+        """Impulse (mis. splash cannonball) di posisi layar (x, y); di luar rect diabaikan"""
+        if not self.rect.collidepoint(x, y):
+            return
+        # Sel tepi selalu 0 (batas simulasi), impulse dijepit ke sel dalam
+        gx = min(max(int((x - self.rect.x) // self.cell_size), 1), self.grid_width - 2)
+        gy = min(max(int((y - self.rect.y) // self.cell_size), 1), self.grid_height - 2)
+        x0, x1 = max(1, gx - radius), min(self.grid_width - 1, gx + radius + 1)
+        y0, y1 = max(1, gy - radius), min(self.grid_height - 1, gy + radius + 1)
+        # Setengah kekuatan di sekitar, penuh di tengah (impulse lebih halus dari satu blok rata)
+        self.height[x0:x1, y0:y1] -= strength * 0.5
+        self.height[gx, gy] -= strength * 0.5
+
+    def step(self):
+        """Satu step simulasi ripple (persamaan gelombang diskrit, tepi tetap 0)"""
+        height = self.height
+        previous = self.previous
+        center = height[1:-1, 1:-1]
+        laplacian = height[:-2, 1:-1] + height[2:, 1:-1] + height[1:-1, :-2] + height[1:-1, 2:] - 4 * center
+        # h' = 2h - h_prev + c * laplacian; previous dipakai ulang sebagai buffer hasil lalu buffer ditukar
+        inner = previous[1:-1, 1:-1]
+        np.subtract(2 * center, inner, out=inner)
+        inner += WATER_WAVE_COEFFICIENT * laplacian
+        inner *= self.damping
+        self.height, self.previous = previous, height
+        self.dirty = True
+
+    def update(self, dt: float):
+        """Tetesan ambient lalu satu step simulasi (dipanggil dengan cadence tetap oleh OceanRenderer)"""
+        if self.ambient_drops > 0 and _rng.random() < self.ambient_drops * dt:
+            self.disturb(_rng.uniform(self.rect.left, self.rect.right),
+                         _rng.uniform(self.rect.top, self.rect.bottom), _rng.uniform(10.0, 30.0))
+        self.step()
+
+    def _bake(self):
+        """Warnai heightfield (gradient + shading kemiringan) dan scale ke ukuran rect"""
+        height = self.height
+        rgb = self._rgb
+        # Shading dari selisih tinggi diagonal (cahaya dari kiri atas)
+        light = self._light
+        np.subtract(height[:-2, :-2], height[2:, 2:], out=light)
+        light *= WATER_SHADING
+        np.clip(light, -WATER_MAX_LIGHT, WATER_MAX_LIGHT, out=light)
+        rgb[:] = self._base
+        rgb[1:-1, 1:-1] += light[:, :, None]
+        np.clip(rgb, 0, 255, out=rgb)
+        self._pixels[:] = rgb
+
+        if self._small is None:
+            self._small = optimize_surface(pygame.Surface((self.grid_width, self.grid_height)))
+            self._scaled = pygame.Surface(self.rect.size, 0, self._small)
+        pygame.surfarray.blit_array(self._small, self._pixels)
+        pygame.transform.scale(self._small, self.rect.size, self._scaled)
+        self.dirty = False
+
+    def render(self, screen: pygame.Surface):
+        """Blit tekstur air; warna dan scale dihitung ulang hanya setelah step simulasi"""
+        if self.dirty:
+            self._bake()
+        screen.blit(self._scaled, self.rect)
@@ -0,0 +1,141 @@
+"""
+World Chunks - Background world yang di-bake per chunk, hanya chunk yang terlihat di-blit
+"""
+import pygame
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.surfaces import optimize_surface
+
+# Painter menggambar area world (rect, dalam koordinat world) ke surface chunk
+ChunkPainter = Callable[[pygame.Surface, pygame.Rect], None]
+
+# Di atas jumlah chunk ini, baking dilakukan di background thread
+THREADED_CHUNK_THRESHOLD = 64
+
+
+class ChunkedBackground:
+    """Background world statis yang dipecah menjadi tile chunk berukuran tetap"""
+
+    def __init__(self, world_width: int, world_height: int, painter: ChunkPainter,
+                 chunk_size: int = 256, threaded: Optional[bool] = None,
+                 placeholder_color: Tuple[int, int, int] = (120, 100, 75)):
+        self.world_width = world_width
+        self.world_height = world_height
+        self.painter = painter
+        self.chunk_size = chunk_size
+        self.cols = (world_width + chunk_size - 1) // chunk_size
+        self.rows = (world_height + chunk_size - 1) // chunk_size
+        self.placeholder_color = placeholder_color
+
+        if threaded is None:
+            threaded = self.cols * self.rows > THREADED_CHUNK_THRESHOLD
+        self.threaded = threaded
+        self._executor: Optional[ThreadPoolExecutor] = ThreadPoolExecutor(max_workers=1) if threaded else None
+
+        self.chunks: Dict[Tuple[int, int], pygame.Surface] = {}
+        self.pending: Dict[Tuple[int, int], Future] = {}
+        # Chunk yang sudah di-bake tapi belum di-convert ke format display
+        self._raw: Dict[Tuple[int, int], pygame.Surface] = {}
+
+    def chunk_rect(self, cx: int, cy: int) -> pygame.Rect:
+        """Rect world untuk chunk (cx, cy)"""
+        x = cx * self.chunk_size
+        y = cy * self.chunk_size
+        return pygame.Rect(x, y, min(self.chunk_size, self.world_width - x),
+                           min(self.chunk_size, self.world_height - y))
+
+    def _bake(self, cx: int, cy: int) -> pygame.Surface:
+        """Bake satu chunk (aman dipanggil dari worker thread)"""
+        area = self.chunk_rect(cx, cy)
+        surface = pygame.Surface(area.size)
+        self.painter(surface, area)
+        return surface
+
+    def get_chunk(self, cx: int, cy: int) -> Optional[pygame.Surface]:
+        """Ambil chunk; bake secara lazy. Return None jika masih di-bake di background"""
+        key = (cx, cy)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            return chunk
+
+        raw = self._raw.pop(key, None)
+        if raw is not None:
+            chunk = self.chunks[key] = optimize_surface(raw)
+            return chunk
+
+        if not self.threaded:
+            chunk = self.chunks[key] = optimize_surface(self._bake(cx, cy))
+            return chunk
+
+        future = self.pending.get(key)
+        if future is None:
+            self.pending[key] = self._executor.submit(self._bake, cx, cy)
+            return None
+        if not future.done():
+            return None
+
+        # Convert di main thread karena butuh display surface
+        del self.pending[key]
+        chunk = self.chunks[key] = optimize_surface(future.result())
+        return chunk
+
+    def visible_chunks(self, view: pygame.Rect) -> List[Tuple[int, int]]:
+        """Index chunk yang overlap dengan view (rect world)"""
+        size = self.chunk_size
+        first_cx = max(0, view.left // size)
+        last_cx = min(self.cols - 1, (view.right - 1) // size)
+        first_cy = max(0, view.top // size)
+        last_cy = min(self.rows - 1, (view.bottom - 1) // size)
+        return [(cx, cy) for cy in range(first_cy, last_cy + 1) for cx in range(first_cx, last_cx + 1)]
+
+    def prefetch(self, view: pygame.Rect):
+        """Mulai bake chunk di sekitar view sebelum terlihat"""
+        for cx, cy in self.visible_chunks(view):
+            self.get_chunk(cx, cy)
+
+    def prebake(self, view: pygame.Rect):
+        """Bake chunk di sekitar view langsung di thread pemanggil (mis. dari SceneLoader)"""
+        for key in self.visible_chunks(view):
+            if key not in self.chunks and key not in self._raw:
+                self._raw[key] = self._bake(*key)
+
+    def render(self, screen: pygame.Surface, camera_x: int, camera_y: int):
+        """Blit chunk yang overlap dengan viewport kamera"""
+        view = pygame.Rect(camera_x, camera_y, screen.get_width(), screen.get_height())
+        size = self.chunk_size
+        blits = []
+        for cx, cy in self.visible_chunks(view):
+            dest = (cx * size - camera_x, cy * size - camera_y)
+            chunk = self.get_chunk(cx, cy)
+            if chunk is not None:
+                blits.append((chunk, dest))
+            else:
+                # Chunk belum siap: isi warna placeholder
+                screen.fill(self.placeholder_color, pygame.Rect(dest, self.chunk_rect(cx, cy).size))
+        if blits:
+            screen.blits(blits, doreturn=False)
+
+    def evict_outside(self, area: pygame.Rect) -> int:
+        """Buang chunk di luar area (rect world) supaya memori world besar tetap terbatas; return jumlahnya"""
+        keep = set(self.visible_chunks(area))
+        evicted = 0
+        for cache in (self.chunks, self._raw, self.pending):
+            for key in [key for key in cache if key not in keep]:
+                value = cache.pop(key)
+                if isinstance(value, Future):
+                    value.cancel()
+                evicted += 1
+        return evicted
+
+    def invalidate(self):
+        """Buang semua chunk supaya di-bake ulang"""
+        self.chunks.clear()
+        self.pending.clear()
+        self._raw.clear()
+
+    def shutdown(self):
+        """Hentikan worker thread"""
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None